@@ -22,4 +22,4 @@ except IOError as ex:
     __version__ = "unknown (%s)" % ex
 
 # top-level functionality
-from .germanet import load_germanet, Synset, Lemma
+from .germanet import load_germanet, set_default_germanet, Synset, Lemma
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''
+affix.py
+(c) agent  18 October, 2026
+
+Sorted indices for prefix and suffix queries over GermaNet
+orthographic forms.
+'''
+
+from builtins import range
+import bisect
+
+def _scan(keys, payloads, prefix):
+    '''
+    Returns the payloads of all sorted ``keys`` starting with
+    ``prefix``.
+    '''
+    results = []
+    for idx in range(bisect.bisect_left(keys, prefix), len(keys)):
+        if not keys[idx].startswith(prefix):
+            break
+        results.append(payloads[idx])
+    return results
+
+class AffixIndex(object):
+    '''
+    An index of strings supporting lookup of all strings with a given
+    prefix or suffix in time logarithmic in the size of the index
+    (plus the number of results).
+    '''
+
+    def __init__(self, entries):
+        '''
+        Builds the index.
+
+        Arguments:
+        - `entries`: an iterable of (string, payload) tuples
+        '''
+        entries = list(entries)
+        entries.sort(key=lambda entry: entry[0])
+        self._prefix_keys     = [entry[0] for entry in entries]
+        self._prefix_payloads = [entry[1] for entry in entries]
+        entries.sort(key=lambda entry: entry[0][::-1])
+        self._suffix_keys     = [entry[0][::-1] for entry in entries]
+        self._suffix_payloads = [entry[1] for entry in entries]
+
+    def __len__(self):
+        return len(self._prefix_keys)
+
+    def prefix(self, prefix):
+        '''
+        Returns the payloads of all strings starting with ``prefix``,
+        in the order of their strings.
+
+        Arguments:
+        - `prefix`:
+        '''
+        return _scan(self._prefix_keys, self._prefix_payloads, prefix)
+
+    def suffix(self, suffix):
+        '''
+        Returns the payloads of all strings ending with ``suffix``, in
+        the order of their reversed strings.
+
+        Arguments:
+        - `suffix`:
+        '''
+        return _scan(self._suffix_keys, self._suffix_payloads, suffix[::-1])
@@ -0,0 +1,336 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''
+allpairs.py
+(c) agent  18 October, 2026
+
+A command-line tool to precompute semantic similarity between all
+pairs of GermaNet synsets (of one part of speech), keeping only the
+pairs above a threshold, or the top N neighbours of each synset.
+
+The synsets are split into chunks, which are computed by a pool of
+worker processes.  Each chunk is written to its own gzipped,
+tab-separated file in the output directory, and a chunk is only
+renamed into place once it is complete; if the job is killed, running
+it again with the same arguments skips the chunks already written.
+The ``SimilarityStore`` class reads the results.
+'''
+
+from __future__ import absolute_import, division, print_function
+from . import germanet
+from .batch import Progress
+from .similarity import DISTANCE_METRICS, METRICS, SimilaritySearch
+from builtins import dict, range, zip
+from io import open
+import gzip
+import json
+import multiprocessing
+import optparse
+import os
+import sys
+
+MANIFEST_FILENAME = 'manifest.json'
+
+# the parameters which must match when a job is resumed
+MANIFEST_KEYS = ['metric', 'pos', 'threshold', 'top', 'chunk_size',
+                 'num_synsets', 'data_version']
+
+# the GermaNet object and similarity search of a worker process
+_WORKER = {}
+
+def chunk_filename(chunk_num):
+    '''
+    Returns the name of the file holding the results of a chunk.
+
+    Arguments:
+    - `chunk_num`:
+    '''
+    return 'chunk-{0:05d}.tsv.gz'.format(chunk_num)
+
+def init_worker(host, port, database_name):
+    '''
+    Initialises a worker process by connecting to GermaNet and
+    building the in-memory similarity search.
+
+    Arguments:
+    - `host`: the hostname of the MongoDB instance
+    - `port`: the port number of the MongoDB instance
+    - `database_name`: the name of the GermaNet database
+    '''
+    gnet     = germanet.load_germanet(host, port, database_name)
+    taxonomy = gnet._taxonomy()
+    _WORKER['version']    = gnet.data_version
+    _WORKER['taxonomy']   = taxonomy
+    _WORKER['search']     = SimilaritySearch(taxonomy, gnet.max_min_depths)
+    _WORKER['gn_ids']     = dict((synset_dict['_id'], synset_dict['id'])
+                                 for synset_dict in gnet._find(
+                                     'synsets', {}, {'id': 1}))
+
+def category_synsets(taxonomy, category):
+    '''
+    Returns the ObjectIds of all synsets in a category, in a fixed
+    order.
+
+    Arguments:
+    - `taxonomy`: a TaxonomyIndex object
+    - `category`: a long category name, such as 'nomen'
+    '''
+    return sorted(mongo_id for (mongo_id, node_category) in
+                  zip(taxonomy.ids, taxonomy.category)
+                  if node_category == category)
+
+def process_chunk(args):
+    '''
+    Computes the similarity rows of one chunk of synsets in a worker
+    process, and writes them to the output directory.  Returns the
+    chunk number and the number of synsets processed.
+
+    Arguments:
+    - `args`: a tuple (output directory, chunk number, list of
+      synset ObjectIds, metric, category, top, threshold)
+    '''
+    output_dir, chunk_num, mongo_ids, metric, category, top, threshold = args
+    taxonomy = _WORKER['taxonomy']
+    search   = _WORKER['search']
+    gn_ids   = _WORKER['gn_ids']
+    path     = os.path.join(output_dir, chunk_filename(chunk_num))
+    with gzip.open(path + '.tmp', 'wb') as output_file:
+        for mongo_id in mongo_ids:
+            source = gn_ids[mongo_id]
+            for (score, node) in search.search(metric,
+                                               taxonomy.node[mongo_id],
+                                               top, category, threshold):
+                output_file.write(u'{0}\t{1}\t{2!r}\n'.format(
+                    source, gn_ids[taxonomy.ids[node]],
+                    score).encode('utf-8'))
+    # only complete chunks are given their final name
+    os.rename(path + '.tmp', path)
+    return chunk_num, len(mongo_ids)
+
+def write_manifest(output_dir, manifest):
+    '''
+    Writes the job manifest to the output directory, or checks that
+    an existing manifest describes the same job.
+
+    Arguments:
+    - `output_dir`:
+    - `manifest`: a dictionary of job parameters
+    '''
+    path = os.path.join(output_dir, MANIFEST_FILENAME)
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as input_file:
+            existing = json.load(input_file)
+        for key in MANIFEST_KEYS:
+            if existing.get(key) != manifest[key]:
+                raise ValueError('{0} already holds a job with a different '
+                                 '{1} ({2!r})'.format(output_dir, key,
+                                                      existing.get(key)))
+        return
+    with open(path + '.tmp', 'w', encoding='utf-8') as output_file:
+        output_file.write(json.dumps(manifest, ensure_ascii=False))
+    os.rename(path + '.tmp', path)
+
+def run_allpairs(output_dir, metric='lin', pos='n', top=None,
+                 threshold=None, chunk_size=1000, host=None, port=None,
+                 database_name='germanet', processes=None, progress=None):
+    '''
+    Runs (or resumes) an all-pairs similarity job.  Returns the number
+    of chunks computed by this call.
+
+    Arguments:
+    - `output_dir`: the directory to write results to; it is created if
+      it does not exist
+    - `metric`: one of 'lch', 'res', 'jcn' or 'lin'
+    - `pos`: the part of speech of the synsets to compare
+    - `top`: if given, keep only this many neighbours for each synset
+    - `threshold`: if given, keep only pairs with at least this score
+      (for 'jcn', at most this distance)
+    - `chunk_size`: the number of synsets in each chunk
+    - `host`: the hostname of the MongoDB instance
+    - `port`: the port number of the MongoDB instance
+    - `database_name`: the name of the GermaNet database
+    - `processes`: the number of worker processes; defaults to the
+      number of CPUs; if 1, all work is done in this process
+    - `progress`: an optional Progress object to update
+    '''
+    if metric not in METRICS:
+        raise ValueError('unknown metric {0!r}'.format(metric))
+    if pos not in germanet.SHORT_POS_TO_LONG:
+        raise ValueError('unknown part of speech {0!r}'.format(pos))
+    if top is None and threshold is None:
+        raise ValueError('one of top and threshold must be given')
+    category  = germanet.SHORT_POS_TO_LONG[pos]
+    initargs  = (host, port, database_name)
+    init_worker(*initargs)
+    mongo_ids = category_synsets(_WORKER['taxonomy'], category)
+    chunks    = [mongo_ids[start:start + chunk_size]
+                 for start in range(0, len(mongo_ids), chunk_size)]
+    if not os.path.isdir(output_dir):
+        os.makedirs(output_dir)
+    write_manifest(output_dir, {'metric':       metric,
+                                'pos':          pos,
+                                'threshold':    threshold,
+                                'top':          top,
+                                'chunk_size':   chunk_size,
+                                'num_synsets':  len(mongo_ids),
+                                'data_version': _WORKER['version'],
+                                'num_chunks':   len(chunks)})
+    todo = [(output_dir, chunk_num, chunk, metric, category, top, threshold)
+            for (chunk_num, chunk) in enumerate(chunks)
+            if not os.path.exists(os.path.join(output_dir,
+                                               chunk_filename(chunk_num)))]
+    if progress is not None:
+        progress.update(sum(len(chunk) for chunk in chunks) -
+                        sum(len(args[2]) for args in todo))
+    if processes == 1:
+        results = (process_chunk(args) for args in todo)
+    else:
+        pool    = multiprocessing.Pool(processes, init_worker, initargs)
+        results = pool.imap_unordered(process_chunk, todo)
+    try:
+        for (_chunk_num, num_synsets) in results:
+            if progress is not None:
+                progress.update(num_synsets)
+    finally:
+        if processes != 1:
+            pool.terminate()
+    return len(todo)
+
+def pair_key(synset1, synset2):
+    '''
+    Returns the key of an unordered pair of GermaNet synset ids.
+
+    Arguments:
+    - `synset1`: a GermaNet synset id
+    - `synset2`: a GermaNet synset id
+    '''
+    if synset2 < synset1:
+        return (synset2, synset1)
+    return (synset1, synset2)
+
+class SimilarityStore(object):
+    '''
+    Serves lookups from the output of an all-pairs similarity job.
+    '''
+
+    def __init__(self, directory):
+        '''
+        Loads the results of an all-pairs job into memory.
+
+        Arguments:
+        - `directory`: the output directory of the job
+        '''
+        with open(os.path.join(directory, MANIFEST_FILENAME), 'r',
+                  encoding='utf-8') as input_file:
+            self.manifest = json.load(input_file)
+        self.distance    = self.manifest['metric'] in DISTANCE_METRICS
+        self._neighbours = dict()
+        # scores by unordered pair of synset ids; every metric is
+        # symmetric, so a pair kept for either synset answers both
+        # orders
+        self._scores     = dict()
+        num_loaded       = 0
+        for chunk_num in range(self.manifest['num_chunks']):
+            path = os.path.join(directory, chunk_filename(chunk_num))
+            if not os.path.exists(path):
+                continue
+            num_loaded += 1
+            with gzip.open(path, 'rb') as input_file:
+                for line in input_file:
+                    source, target, score = line.decode(
+                        'utf-8').rstrip(u'\n').split(u'\t')
+                    score = float(score)
+                    self._neighbours.setdefault(source, []).append(
+                        (target, score))
+                    self._scores[pair_key(source, target)] = score
+        self.complete = num_loaded == self.manifest['num_chunks']
+
+    def __len__(self):
+        return sum(len(neighbours) for neighbours in
+                   self._neighbours.values())
+
+    def neighbours(self, synset):
+        '''
+        Returns the stored (synset id, score) tuples for a synset,
+        most similar first.
+
+        Arguments:
+        - `synset`: a GermaNet synset id (such as 's12345'), or a
+          Synset object
+        '''
+        if isinstance(synset, germanet.Synset):
+            synset = synset.id
+        return list(self._neighbours.get(synset, []))
+
+    def score(self, synset1, synset2):
+        '''
+        Returns the stored score of a pair of synsets, in either
+        order, or None if the pair was not stored for either synset.
+
+        Arguments:
+        - `synset1`: a GermaNet synset id, or a Synset object
+        - `synset2`: a GermaNet synset id, or a Synset object
+        '''
+        if isinstance(synset1, germanet.Synset):
+            synset1 = synset1.id
+        if isinstance(synset2, germanet.Synset):
+            synset2 = synset2.id
+        return self._scores.get(pair_key(synset1, synset2))
+
+def main():
+    '''Main function.'''
+    usage = ('\n\n  %prog [options] OUTPUT_DIR\n\nArguments:\n\n  '
+             'OUTPUT_DIR            the directory to write the results to; '
+             'an\n                        interrupted job in this directory '
+             'is resumed')
+
+    parser = optparse.OptionParser(usage=usage)
+    parser.add_option('--host', default=None,
+                      help='hostname or IP address of the MongoDB instance '
+                      '(default: %default)')
+    parser.add_option('--port', type='int', default=None,
+                      help='port number of the MongoDB instance '
+                      '(default: %default)')
+    parser.add_option('--database', dest='database_name', default='germanet',
+                      help='the name of the GermaNet database on the MongoDB '
+                      'instance (default: %default)')
+    parser.add_option('--metric', default='lin', choices=METRICS,
+                      help='similarity metric: {0} (default: %default)'.format(
+                          ', '.join(METRICS)))
+    parser.add_option('--pos', default='n', choices=['n', 'v', 'j'],
+                      help='part of speech of the synsets to compare '
+                      '(default: %default)')
+    parser.add_option('--top', type='int', default=None,
+                      help='keep the N most similar synsets of each synset')
+    parser.add_option('--threshold', type='float', default=None,
+                      help='keep pairs with at least this score (for jcn, at '
+                      'most this distance)')
+    parser.add_option('--chunk-size', dest='chunk_size', type='int',
+                      default=1000,
+                      help='number of synsets in each chunk '
+                      '(default: %default)')
+    parser.add_option('--processes', type='int', default=None,
+                      help='number of worker processes (default: number of '
+                      'CPUs)')
+    parser.add_option('--progress', type='float', default=10.,
+                      help='seconds between progress reports on standard '
+                      'error; 0 to disable (default: %default)')
+    (options, args) = parser.parse_args()
+
+    if len(args) != 1:
+        parser.error("incorrect arguments")
+        sys.exit(1)
+    if options.top is None and options.threshold is None:
+        parser.error("one of --top and --threshold must be given")
+        sys.exit(1)
+
+    progress = Progress(options.progress)
+    run_allpairs(args[0], options.metric, options.pos, options.top,
+                 options.threshold, options.chunk_size, options.host,
+                 options.port, options.database_name, options.processes,
+                 progress)
+    progress.report()
+
+if __name__ == '__main__' and sys.argv != ['']:
+    main()
@@ -0,0 +1,422 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''
+batch.py
+(c) agent  18 October, 2026
+
+A command-line tool to run GermaNet lookups and similarity
+computations over large input files.
+
+Input records are read from a file or standard input, either as
+tab-separated lines (one or two words per line) or as JSON lines
+(objects with a ``word`` key, and a ``word2`` key for the similarity
+operations).  Records are distributed over a pool of worker processes,
+each with its own GermaNet connection and cache, and the results are
+written to standard output in input order.
+'''
+
+from __future__ import absolute_import, division, print_function
+from . import germanet
+from .simcache import SimilarityMemo
+from builtins import dict, str, zip
+from io import open
+import codecs
+import collections
+import itertools
+import json
+import multiprocessing
+import optparse
+import sys
+import time
+
+SIMILARITY_OPERATIONS = {
+    'lch': ('sim_lch',  max),
+    'res': ('sim_res',  max),
+    'jcn': ('dist_jcn', min),
+    'lin': ('sim_lin',  max),
+    }
+
+OPERATIONS = ['lemmas', 'lemmatise', 'synsets'] + sorted(SIMILARITY_OPERATIONS)
+
+# the number of words whose synsets each worker remembers
+WORKER_WORD_CACHE_SIZE = 100000
+
+# the number of chunks of input queued for each worker process
+MAX_PENDING_CHUNKS_PER_PROCESS = 4
+
+# the GermaNet object and word cache of a worker process
+_WORKER = {}
+
+def init_worker(host, port, database_name, cache_size, memo_path=None):
+    '''
+    Initialises a worker process by connecting to GermaNet.
+
+    Arguments:
+    - `host`: the hostname of the MongoDB instance
+    - `port`: the port number of the MongoDB instance
+    - `database_name`: the name of the GermaNet database
+    - `cache_size`: the size of the GermaNet object caches
+    - `memo_path`: if given, the filename of a similarity memo shared
+      by all workers
+    '''
+    gnet            = germanet.load_germanet(host, port, database_name)
+    gnet.cache_size = cache_size
+    if memo_path is not None:
+        gnet.set_similarity_memo(SimilarityMemo(memo_path))
+    _WORKER['germanet'] = gnet
+    _WORKER['synsets']  = dict()
+
+def worker_synsets(word, pos):
+    '''
+    Looks up the synsets of a word, remembering the answer in the
+    worker's word cache.
+
+    Arguments:
+    - `word`:
+    - `pos`:
+    '''
+    cache = _WORKER['synsets']
+    key   = (word, pos)
+    if key not in cache:
+        if WORKER_WORD_CACHE_SIZE <= len(cache):
+            cache.clear()
+        cache[key] = _WORKER['germanet'].synsets(word, pos)
+    return cache[key]
+
+def synset_name(synset):
+    '''
+    Returns the name of a synset, as used by ``GermaNet.synset``.
+
+    Arguments:
+    - `synset`: a Synset object
+    '''
+    first = synset.lemmas[0]
+    return u'{0}.{1}.{2}'.format(first.orthForm, synset.pos, first.sense)
+
+def process_record(operation, record):
+    '''
+    Runs one operation on one input record in a worker process, and
+    returns the result.
+
+    Arguments:
+    - `operation`: one of OPERATIONS
+    - `record`: a dictionary with the key ``word``, and optionally
+      ``word2`` and ``pos``; records with an ``error`` key (see
+      ``parse_record``) are skipped
+    '''
+    if 'error' in record:
+        return None
+    gnet = _WORKER['germanet']
+    word = record['word']
+    pos  = record.get('pos')
+    if operation == 'lemmatise':
+        return gnet.lemmatise(word)
+    elif operation == 'lemmas':
+        return [u'{0}.{1}'.format(synset_name(lemma.synset), lemma.orthForm)
+                for lemma in gnet.lemmas(word, pos) or []]
+    elif operation == 'synsets':
+        return [synset_name(synset) for synset in worker_synsets(word, pos)]
+    method, comb_func = SIMILARITY_OPERATIONS[operation]
+    synsets1 = worker_synsets(word, pos)
+    synsets2 = worker_synsets(record.get('word2', ''), pos)
+    if not synsets1 or not synsets2:
+        return None
+    return comb_func([getattr(ss1, method)(ss2)
+                      for ss1 in synsets1 for ss2 in synsets2])
+
+def process_chunk(args):
+    '''
+    Runs one operation on a list of input records in a worker
+    process, and returns the list of results.
+
+    Arguments:
+    - `args`: a tuple (operation, list of records)
+    '''
+    operation, records = args
+    results = [process_record(operation, record) for record in records]
+    memo    = _WORKER['germanet'].similarity_memo
+    if memo is not None:
+        memo.flush()
+    return results
+
+
+# ------------------------------------------------------------
+#  Input and output
+# ------------------------------------------------------------
+
+def record_error(record):
+    '''
+    Checks an input record, returning a description of the problem if
+    it is invalid, or None.
+
+    Arguments:
+    - `record`: a record dictionary
+    '''
+    if not isinstance(record.get('word'), str):
+        return 'record has no word'
+    if 'word2' in record and not isinstance(record['word2'], str):
+        return 'word2 is not a string'
+    if record.get('pos') is not None and (
+            record['pos'] not in germanet.SHORT_POS_TO_LONG):
+        return 'unknown part of speech {0!r}'.format(record['pos'])
+    return None
+
+def parse_record(line, input_format):
+    '''
+    Parses an input line into a record dictionary, or returns None for
+    blank lines.  Invalid records are returned with an ``error`` key
+    describing the problem; lines which are not JSON objects become
+    records with the keys ``input`` and ``error``.  The workers skip
+    invalid records, so they get an empty result.
+
+    Arguments:
+    - `line`: a unicode string
+    - `input_format`: 'tsv' or 'jsonl'
+    '''
+    line = line.rstrip(u'\r\n')
+    if not line.strip():
+        return None
+    if input_format == 'jsonl':
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return {'input': line, 'error': 'invalid JSON'}
+        if not isinstance(record, dict):
+            return {'input': line, 'error': 'record is not a JSON object'}
+    else:
+        fields = line.split(u'\t')
+        record = {'word': fields[0]}
+        if 1 < len(fields):
+            record['word2'] = fields[1]
+    error = record_error(record)
+    if error is not None:
+        record = dict(record, error=error)
+    return record
+
+def format_result(record, result, output_format):
+    '''
+    Formats an input record and its result as an output line.
+
+    Arguments:
+    - `record`: the input record dictionary
+    - `result`: the result of the operation
+    - `output_format`: 'tsv' or 'jsonl'
+    '''
+    if output_format == 'jsonl':
+        record = dict(record)
+        record['result'] = result
+        return json.dumps(record, ensure_ascii=False)
+    fields = [str(record.get('word', record.get('input', u'')))]
+    if 'word2' in record:
+        fields.append(str(record['word2']))
+    if result is None:
+        fields.append(u'')
+    elif isinstance(result, list):
+        fields.append(u'|'.join(result))
+    else:
+        fields.append(str(result))
+    return u'\t'.join(fields)
+
+def chunked(iterable, size):
+    '''
+    Splits an iterable into lists of at most ``size`` items.
+
+    Arguments:
+    - `iterable`:
+    - `size`:
+    '''
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+class Progress(object):
+    '''Reports progress and throughput on standard error.'''
+
+    def __init__(self, interval):
+        '''
+        Creates a new Progress reporter.
+
+        Arguments:
+        - `interval`: the number of seconds between reports; if 0,
+          only the final summary is reported
+        '''
+        self.interval  = interval
+        self.start     = time.time()
+        self.last      = self.start
+        self.num_items = 0
+
+    def update(self, num_items):
+        '''
+        Records that more items have been processed.
+
+        Arguments:
+        - `num_items`: the number of newly processed items
+        '''
+        self.num_items += num_items
+        now = time.time()
+        if self.interval and self.interval <= now - self.last:
+            self.last = now
+            self.report(now)
+
+    def report(self, now=None):
+        '''Writes a progress line to standard error.'''
+        if now is None:
+            now = time.time()
+        elapsed = now - self.start
+        rate    = self.num_items / elapsed if elapsed else 0.
+        print('{0} records in {1:.1f}s ({2:.1f} records/s)'.format(
+            self.num_items, elapsed, rate), file=sys.stderr)
+
+def run_batch(operation, records, host=None, port=None,
+              database_name='germanet', processes=None, chunk_size=100,
+              cache_size=10000, progress=None, memo_path=None):
+    '''
+    A generator which runs an operation on a stream of records using a
+    pool of worker processes, and yields (record, result) tuples in
+    input order.
+
+    Arguments:
+    - `operation`: one of OPERATIONS
+    - `records`: an iterable of record dictionaries
+    - `host`: the hostname of the MongoDB instance
+    - `port`: the port number of the MongoDB instance
+    - `database_name`: the name of the GermaNet database
+    - `processes`: the number of worker processes; defaults to the
+      number of CPUs; if 1, all work is done in this process
+    - `chunk_size`: the number of records sent to a worker at a time
+    - `cache_size`: the size of each worker's GermaNet object caches
+    - `progress`: an optional Progress object to update
+    - `memo_path`: if given, the filename of a similarity memo to
+      consult and update
+    '''
+    if operation not in OPERATIONS:
+        raise ValueError('unknown operation {0!r}'.format(operation))
+    initargs = (host, port, database_name, cache_size, memo_path)
+    chunks   = chunked(records, chunk_size)
+    if processes == 1:
+        init_worker(*initargs)
+        for chunk in chunks:
+            chunk_results = process_chunk((operation, chunk))
+            if progress is not None:
+                progress.update(len(chunk))
+            for (record, result) in zip(chunk, chunk_results):
+                yield record, result
+        return
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    pool = multiprocessing.Pool(processes, init_worker, initargs)
+    try:
+        # keep a bounded number of chunks in flight, so that memory use
+        # does not grow with the size of the input
+        max_pending = MAX_PENDING_CHUNKS_PER_PROCESS * processes
+        pending     = collections.deque()
+        chunks      = itertools.chain(chunks, [None])
+        for chunk in chunks:
+            if chunk is not None:
+                pending.append((chunk, pool.apply_async(
+                    process_chunk, ((operation, chunk),))))
+            while pending and (chunk is None or max_pending <= len(pending) or
+                               pending[0][1].ready()):
+                done, async_result = pending.popleft()
+                chunk_results      = async_result.get()
+                if progress is not None:
+                    progress.update(len(done))
+                for (record, result) in zip(done, chunk_results):
+                    yield record, result
+        pool.close()
+    finally:
+        pool.terminate()
+
+def main():
+    '''Main function.'''
+    usage = ('\n\n  %prog [options] OPERATION [INPUT_FILE]\n\nArguments:\n\n  '
+             'OPERATION             one of: {0}\n  '
+             'INPUT_FILE            the file to read records from '
+             '(default: standard input)').format(', '.join(OPERATIONS))
+
+    parser = optparse.OptionParser(usage=usage)
+    parser.add_option('--host', default=None,
+                      help='hostname or IP address of the MongoDB instance '
+                      '(default: %default)')
+    parser.add_option('--port', type='int', default=None,
+                      help='port number of the MongoDB instance '
+                      '(default: %default)')
+    parser.add_option('--database', dest='database_name', default='germanet',
+                      help='the name of the GermaNet database on the MongoDB '
+                      'instance (default: %default)')
+    parser.add_option('--format', dest='input_format', default='tsv',
+                      choices=['tsv', 'jsonl'],
+                      help='input format, tsv or jsonl (default: %default)')
+    parser.add_option('--output-format', dest='output_format', default=None,
+                      choices=['tsv', 'jsonl'],
+                      help='output format (default: same as the input)')
+    parser.add_option('--pos', default=None, choices=['n', 'v', 'j'],
+                      help='restrict lookups to this part of speech')
+    parser.add_option('--processes', type='int', default=None,
+                      help='number of worker processes (default: number of '
+                      'CPUs)')
+    parser.add_option('--chunk-size', dest='chunk_size', type='int',
+                      default=100,
+                      help='number of records sent to a worker at a time '
+                      '(default: %default)')
+    parser.add_option('--cache-size', dest='cache_size', type='int',
+                      default=10000,
+                      help='size of the synset and lemma caches in each '
+                      'worker (default: %default)')
+    parser.add_option('--memo', dest='memo_path', default=None,
+                      help='SQLite file in which to memoise similarity '
+                      'scores across runs')
+    parser.add_option('--progress', type='float', default=10.,
+                      help='seconds between progress reports on standard '
+                      'error; 0 to disable (default: %default)')
+    (options, args) = parser.parse_args()
+
+    if len(args) not in (1, 2) or args[0] not in OPERATIONS:
+        parser.error("incorrect arguments")
+        sys.exit(1)
+    operation = args[0]
+    if options.output_format is None:
+        options.output_format = options.input_format
+
+    if len(args) == 2:
+        input_file = open(args[1], 'r', encoding='utf-8')
+    elif sys.version_info.major < 3:
+        input_file = codecs.getreader('utf-8')(sys.stdin)
+    else:
+        input_file = sys.stdin
+    if sys.version_info.major < 3:
+        output_file = codecs.getwriter('utf-8')(sys.stdout)
+    else:
+        output_file = sys.stdout
+
+    records = (parse_record(line, options.input_format)
+               for line in input_file)
+    records = (record for record in records if record is not None)
+    if options.pos is not None:
+        records = (dict(record, pos=options.pos) for record in records)
+
+    progress = Progress(options.progress)
+    for (record, result) in run_batch(operation, records,
+                                      options.host, options.port,
+                                      options.database_name,
+                                      options.processes, options.chunk_size,
+                                      options.cache_size, progress,
+                                      options.memo_path):
+        if 'error' in record:
+            print(u'invalid record ({0}): {1}'.format(
+                record['error'], record.get('input') or json.dumps(
+                    dict((key, value) for (key, value) in record.items()
+                         if key != 'error'), ensure_ascii=False)),
+                  file=sys.stderr)
+        output_file.write(format_result(record, result,
+                                        options.output_format) + u'\n')
+    output_file.flush()
+    progress.report()
+    input_file.close()
+
+if __name__ == '__main__' and sys.argv != ['']:
+    main()
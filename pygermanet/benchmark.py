@@ -0,0 +1,474 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''
+benchmark.py
+(c) agent  18 October, 2026
+
+A benchmark suite for pygermanet.
+
+Measures the stages of ``mongo_import``, lookup latencies, hypernym
+traversal and semantic similarity throughput, and writes the results
+as JSON so that different versions can be compared.
+'''
+
+from __future__ import absolute_import, division, print_function
+from . import __version__, germanet, mongo_import
+from builtins import dict, int, range, str, zip
+from collections import defaultdict
+from io import open
+import importlib
+import json
+import optparse
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+try:
+    import resource
+except ImportError:
+    pass
+
+PERCENTILES = [50, 90, 99]
+
+# modules which ``import pygermanet`` must not import; they are loaded
+# when first needed
+LAZY_MODULES = ['bson', 'numpy', 'pymongo', 'repoze.lru', 'scipy']
+
+# the largest acceptable median cold start time, in milliseconds
+DEFAULT_MAX_COLD_START_MS = 200.
+
+# run in a fresh interpreter to measure the cold start; prints the
+# import time, the eagerly imported modules, and the load_germanet time
+COLD_START_SCRIPT = '''
+import sys, time
+start = time.time()
+import pygermanet
+print(time.time() - start)
+print(' '.join(name for name in {0!r} if name in sys.modules))
+start = time.time()
+pygermanet.load_germanet(lazy=True)
+print(time.time() - start)
+'''
+
+SIMILARITY_METRICS = [
+    ('lch', 'sim_lch',  max),
+    ('res', 'sim_res',  max),
+    ('jcn', 'dist_jcn', min),
+    ('lin', 'sim_lin',  max),
+    ]
+
+
+# ------------------------------------------------------------
+#  Measurement helpers
+# ------------------------------------------------------------
+
+def percentiles(samples, points=None):
+    '''
+    Summarises a list of timings (in seconds) as a dictionary giving
+    the number of samples, the mean, and the given percentiles, all in
+    milliseconds.
+
+    Arguments:
+    - `samples`: a list of durations in seconds
+    - `points`: a list of percentiles to compute; defaults to
+      PERCENTILES
+    '''
+    if points is None:
+        points = PERCENTILES
+    if not samples:
+        return {'n': 0}
+    ordered = sorted(samples)
+    summary = {'n':       len(ordered),
+               'mean_ms': 1000. * sum(ordered) / len(ordered),
+               'max_ms':  1000. * ordered[-1]}
+    for point in points:
+        idx = min(len(ordered) - 1,
+                  int(round(point / 100. * (len(ordered) - 1))))
+        summary['p{0}_ms'.format(point)] = 1000. * ordered[idx]
+    return summary
+
+def peak_rss_kb():
+    '''
+    Returns the peak resident set size of this process in kilobytes,
+    or None if it cannot be determined on this platform.
+    '''
+    try:
+        usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except NameError:
+        return None
+    # Mac OS X reports bytes, Linux reports kilobytes
+    if sys.platform == 'darwin':
+        usage //= 1024
+    return usage
+
+def timed(func, *args):
+    '''
+    Calls ``func`` with the given arguments, and returns a tuple
+    (elapsed seconds, return value).
+    '''
+    start  = time.time()
+    retval = func(*args)
+    return time.time() - start, retval
+
+
+# ------------------------------------------------------------
+#  Workloads
+# ------------------------------------------------------------
+
+def sample_words(gnet, num_words, rng, pos=None):
+    '''
+    Draws a sample of orthographic forms from the lexicon.
+
+    Arguments:
+    - `gnet`: a GermaNet object
+    - `num_words`: the number of words to draw
+    - `rng`: a random.Random object
+    - `pos`: if given, only sample lemmas with this part of speech
+      ('n', 'v' or 'j')
+    '''
+    query = {}
+    if pos is not None:
+        query['category'] = germanet.SHORT_POS_TO_LONG[pos]
+    forms = sorted(set(doc['orthForm'] for doc in
+                       gnet._mongo_db.lexunits.find(query, {'orthForm': 1})
+                       if 'orthForm' in doc))
+    if len(forms) <= num_words:
+        return forms
+    return rng.sample(forms, num_words)
+
+def read_word_pairs(filename):
+    '''
+    Reads word pairs from a gur65-style file: semicolon-separated
+    fields, a header line, and the two words in the first two
+    columns.
+
+    Arguments:
+    - `filename`: the path of the file to read
+    '''
+    pairs = []
+    with open(filename, 'r', encoding='latin-1') as input_file:
+        for idx, line in enumerate(input_file):
+            fields = line.strip().split(';')
+            if idx == 0 or len(fields) < 2:
+                continue
+            pairs.append((fields[0], fields[1]))
+    return pairs
+
+
+# ------------------------------------------------------------
+#  Benchmarks
+# ------------------------------------------------------------
+
+IMPORT_STAGES = [
+    ('lexical',       'insert_lexical_information',    'lex_files'),
+    ('relations',     'insert_relation_information',   'gn_rels_file'),
+    ('paraphrases',   'insert_paraphrase_information', 'wiktionary_files'),
+    ('ili',           'insert_ili_information',        'ili_files'),
+    ('glosses',       'insert_gloss_index',            None),
+    ('lemmatisation', 'insert_lemmatisation_data',     None),
+    ('infocontent',   'insert_infocontent_data',       None),
+    ('max_min_depth', 'compute_max_min_depth',         None),
+    ('data_version',  'record_data_version',           None),
+    ]
+
+def bench_import(germanet_db, xml_path):
+    '''
+    Runs the stages of ``mongo_import`` against the given database,
+    timing each one.  The database is overwritten.
+
+    Arguments:
+    - `germanet_db`: a pymongo.database.Database object
+    - `xml_path`: the directory containing the GermaNet XML files
+    '''
+    results = dict()
+    elapsed, found = timed(mongo_import.find_germanet_xml_files, xml_path)
+    results['find_files'] = {'seconds': elapsed}
+    files = dict(zip(['lex_files', 'gn_rels_file', 'wiktionary_files',
+                      'ili_files'], found))
+    for (stage, func_name, arg_name) in IMPORT_STAGES:
+        args = [germanet_db]
+        if arg_name is not None:
+            args.append(files[arg_name])
+        try:
+            elapsed, _ = timed(getattr(mongo_import, func_name), *args)
+        except IOError as ex:
+            # e.g. the lemmatisation data is not installed
+            results[stage] = {'skipped': str(ex)}
+            continue
+        results[stage] = {'seconds': elapsed}
+    results['total_seconds'] = sum(stage.get('seconds', 0.)
+                                   for stage in results.values())
+    return results
+
+def bench_cold_start(repeat=10):
+    '''
+    Measures the time taken to import pygermanet and to create a
+    GermaNet object with ``load_germanet(lazy=True)`` in fresh Python
+    interpreters, and lists any of LAZY_MODULES which the import
+    loaded.
+
+    Arguments:
+    - `repeat`: the number of interpreters to start
+    '''
+    package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env         = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [package_dir] + [path for path in [env.get('PYTHONPATH')] if path])
+    script      = COLD_START_SCRIPT.format(tuple(LAZY_MODULES))
+    import_samples = []
+    load_samples   = []
+    eager          = set()
+    for _idx in range(repeat):
+        output = subprocess.check_output([sys.executable, '-c', script],
+                                         env=env).decode('utf-8')
+        lines  = output.split('\n')
+        import_samples.append(float(lines[0]))
+        eager.update(lines[1].split())
+        load_samples.append(float(lines[2]))
+    return {'import':        percentiles(import_samples),
+            'load_germanet': percentiles(load_samples),
+            'eager_modules': sorted(eager)}
+
+def check_cold_start(results, max_ms=DEFAULT_MAX_COLD_START_MS):
+    '''
+    Checks the results of ``bench_cold_start`` and returns a list of
+    problems: modules which should have been imported lazily, and a
+    median cold start (import plus load_germanet) slower than
+    ``max_ms``.
+
+    Arguments:
+    - `results`: a dictionary returned by ``bench_cold_start``
+    - `max_ms`: the largest acceptable median cold start time in
+      milliseconds, or None to skip the timing check
+    '''
+    problems = ['{0} is imported eagerly'.format(name)
+                for name in results['eager_modules']]
+    if max_ms is not None:
+        median_ms = (results['import']['p50_ms'] +
+                     results['load_germanet']['p50_ms'])
+        if max_ms < median_ms:
+            problems.append('median cold start of {0:.1f} ms exceeds '
+                            '{1:.1f} ms'.format(median_ms, max_ms))
+    return problems
+
+def bench_lookups(gnet, words, repeat=1):
+    '''
+    Measures the latency of single-word lookups.
+
+    Arguments:
+    - `gnet`: a GermaNet object
+    - `words`: a list of words to look up
+    - `repeat`: the number of times to look up each word
+    '''
+    results = dict()
+    for method in ['lemmas', 'synsets', 'lemmatise']:
+        func    = getattr(gnet, method)
+        samples = []
+        for _idx in range(repeat):
+            for word in words:
+                elapsed, _ = timed(func, word)
+                samples.append(elapsed)
+        results[method] = percentiles(samples)
+    return results
+
+def bench_traversal(gnet, synsets, rng, num_pairs):
+    '''
+    Measures the cost of hypernym traversal, grouped by the depth of
+    the synsets involved.
+
+    Arguments:
+    - `gnet`: a GermaNet object
+    - `synsets`: a list of Synset objects
+    - `rng`: a random.Random object
+    - `num_pairs`: the number of synset pairs to use for the
+      shortest path measurement
+    '''
+    by_depth = defaultdict(list)
+    depths   = dict()
+    for synset in synsets:
+        elapsed, paths = timed(lambda: synset.hypernym_paths)
+        depth          = min(len(path) for path in paths)
+        depths[synset] = depth
+        by_depth[depth].append(elapsed)
+    path_results = dict((str(depth), percentiles(samples))
+                        for (depth, samples) in sorted(by_depth.items()))
+
+    by_depth = defaultdict(list)
+    for _idx in range(num_pairs):
+        if len(synsets) < 2:
+            break
+        ss1, ss2   = rng.sample(synsets, 2)
+        elapsed, _ = timed(ss1.shortest_path_length, ss2)
+        by_depth[max(depths[ss1], depths[ss2])].append(elapsed)
+    spl_results = dict((str(depth), percentiles(samples))
+                       for (depth, samples) in sorted(by_depth.items()))
+    return {'hypernym_paths':       path_results,
+            'shortest_path_length': spl_results}
+
+def bench_similarity(gnet, word_pairs):
+    '''
+    Measures the throughput of the semantic similarity metrics on a
+    list of word pairs, combining the scores of all synset pairs as
+    in the gur65 replication in the README.
+
+    Arguments:
+    - `gnet`: a GermaNet object
+    - `word_pairs`: a list of (word1, word2) tuples
+    '''
+    pairs   = [(gnet.synsets(word1), gnet.synsets(word2))
+               for (word1, word2) in word_pairs]
+    pairs   = [(ss1, ss2) for (ss1, ss2) in pairs if ss1 and ss2]
+    results = dict()
+    for (sim_name, method, comb_func) in SIMILARITY_METRICS:
+        num_synset_pairs = 0
+        start = time.time()
+        for (synsets1, synsets2) in pairs:
+            comb_func([getattr(ss1, method)(ss2)
+                       for ss1 in synsets1 for ss2 in synsets2])
+            num_synset_pairs += len(synsets1) * len(synsets2)
+        elapsed = time.time() - start
+        results[sim_name] = {
+            'word_pairs':         len(pairs),
+            'synset_pairs':       num_synset_pairs,
+            'seconds':            elapsed,
+            'word_pairs_per_sec': len(pairs) / elapsed if elapsed else None,
+            'synset_pairs_per_sec': (num_synset_pairs / elapsed
+                                     if elapsed else None),
+            }
+    return results
+
+
+# ------------------------------------------------------------
+#  Main function
+# ------------------------------------------------------------
+
+def load_backend(spec, host, port, database_name):
+    '''
+    Creates the GermaNet object to benchmark.
+
+    Arguments:
+    - `spec`: None to use ``load_germanet``, or a string
+      ``module:function`` naming a callable which takes no arguments
+      and returns a GermaNet-like object
+    - `host`: the hostname of the MongoDB instance
+    - `port`: the port number of the MongoDB instance
+    - `database_name`: the name of the GermaNet database
+    '''
+    if spec is None:
+        return germanet.load_germanet(host, port, database_name)
+    module_name, func_name = spec.split(':', 1)
+    return getattr(importlib.import_module(module_name), func_name)()
+
+def main():
+    '''Main function.'''
+    usage = ('\n\n  %prog [options]\n\n'
+             'Runs the benchmark suite against a GermaNet database and '
+             'writes the\nresults as JSON.')
+
+    parser = optparse.OptionParser(usage=usage)
+    parser.add_option('--host', default=None,
+                      help='hostname or IP address of the MongoDB instance '
+                      '(default: %default)')
+    parser.add_option('--port', type='int', default=None,
+                      help='port number of the MongoDB instance '
+                      '(default: %default)')
+    parser.add_option('--database', dest='database_name', default='germanet',
+                      help='the name of the GermaNet database on the MongoDB '
+                      'instance (default: %default)')
+    parser.add_option('--backend', default=None,
+                      help='a module:function returning the GermaNet object '
+                      'to benchmark, instead of connecting to MongoDB')
+    parser.add_option('--import', dest='xml_path', default=None,
+                      help='time the import of the GermaNet XML files in '
+                      'this directory; THIS OVERWRITES THE DATABASE')
+    parser.add_option('--words', type='int', default=1000,
+                      help='number of words to sample for lookups '
+                      '(default: %default)')
+    parser.add_option('--pairs', default=None,
+                      help='gur65-style file of word pairs for the '
+                      'similarity benchmark (default: random noun pairs)')
+    parser.add_option('--num-pairs', dest='num_pairs', type='int',
+                      default=65,
+                      help='number of random noun pairs to use when '
+                      '--pairs is not given (default: %default)')
+    parser.add_option('--skip', action='append', default=[],
+                      help='skip a benchmark section (cold_start, import, '
+                      'lookups, traversal, similarity); may be repeated')
+    parser.add_option('--max-cold-start-ms', dest='max_cold_start_ms',
+                      type='float', default=DEFAULT_MAX_COLD_START_MS,
+                      help='fail if the median time to import pygermanet '
+                      'and create a lazy GermaNet object exceeds this '
+                      '(default: %default)')
+    parser.add_option('--seed', type='int', default=0,
+                      help='random seed (default: %default)')
+    parser.add_option('--output', default=None,
+                      help='write the JSON results to this file instead '
+                      'of standard output')
+    (options, args) = parser.parse_args()
+
+    if args:
+        parser.error("incorrect number of arguments")
+        sys.exit(1)
+
+    rng     = random.Random(options.seed)
+    report  = {'pygermanet': __version__,
+               'python':     platform.python_version(),
+               'platform':   platform.platform(),
+               'timestamp':  time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+               'options':    dict(vars(options)),
+               'results':    dict()}
+    results = report['results']
+
+    problems = []
+    if 'cold_start' not in options.skip:
+        results['cold_start'] = bench_cold_start()
+        problems = check_cold_start(results['cold_start'],
+                                    options.max_cold_start_ms)
+
+    if options.xml_path is not None and 'import' not in options.skip:
+        from pymongo import MongoClient
+        client = MongoClient(options.host, options.port)
+        results['import'] = bench_import(client[options.database_name],
+                                         options.xml_path)
+        client.close()
+
+    gnet = load_backend(options.backend, options.host, options.port,
+                        options.database_name)
+
+    words = sample_words(gnet, options.words, rng)
+    if 'lookups' not in options.skip:
+        results['lookups'] = bench_lookups(gnet, words)
+
+    if 'traversal' not in options.skip:
+        synsets = sorted(set(synset for word in words[:200]
+                             for synset in gnet.synsets(word)))
+        results['traversal'] = bench_traversal(gnet, synsets, rng,
+                                               options.num_pairs * 4)
+
+    if 'similarity' not in options.skip:
+        if options.pairs is not None:
+            word_pairs = read_word_pairs(options.pairs)
+        else:
+            nouns      = sample_words(gnet, 2 * options.num_pairs, rng, 'n')
+            word_pairs = list(zip(nouns[::2], nouns[1::2]))
+        results['similarity'] = bench_similarity(gnet, word_pairs)
+
+    report['peak_rss_kb'] = peak_rss_kb()
+
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if options.output is not None:
+        with open(options.output, 'w', encoding='utf-8') as output_file:
+            output_file.write(str(output))
+    else:
+        print(output)
+
+    if problems:
+        for problem in problems:
+            print('cold start check failed:', problem, file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == '__main__' and sys.argv != ['']:
+    main()
@@ -0,0 +1,285 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''
+export.py
+(c) agent  18 October, 2026
+
+Export of the GermaNet graph to NetworkX, igraph, GraphML and edge
+list files.
+
+The synsets and lexunits collections are each read once, with
+projections, and relations are taken from the stored ``rels`` pairs
+without any further lookups.  Nodes are identified by the hex strings
+of their MongoDB ObjectIds, so the file writers can stream the graph
+without holding it in memory.
+
+NetworkX and python-igraph are optional dependencies; they are only
+needed to build graph objects.
+'''
+
+from __future__ import absolute_import, print_function
+from . import germanet
+from builtins import dict, str
+from io import open
+from xml.sax.saxutils import quoteattr
+import codecs
+import optparse
+import sys
+try:
+    import networkx
+except ImportError:
+    pass
+try:
+    import igraph
+except ImportError:
+    pass
+
+# node attributes and their GraphML types
+NODE_ATTRIBUTES = [
+    ('type',     'string'),
+    ('gn_id',    'string'),
+    ('category', 'string'),
+    ('gn_class', 'string'),
+    ('infocont', 'double'),
+    ('orthForm', 'string'),
+    ('sense',    'int'),
+    ]
+
+# the relation linking each lexunit to its synset
+LEXUNIT_SYNSET_REL = 'in_synset'
+
+FORMATS = ['graphml', 'edgelist']
+
+def iter_graph(gnet, relations=None, lexunits=True):
+    '''
+    A generator over the nodes and edges of the GermaNet graph,
+    yielding ('node', node id, attribute dictionary) and ('edge',
+    source id, target id, relation name) tuples.  Each node is
+    yielded before its outgoing edges, but edges may point to nodes
+    which have not been yielded yet.
+
+    Arguments:
+    - `gnet`: a GermaNet object
+    - `relations`: a list of relation names to export; defaults to
+      all relations
+    - `lexunits`: if True, also export lexunits, with an ``in_synset``
+      edge from each lexunit to its synset
+    '''
+    wanted = None if relations is None else set(relations)
+    for synset_dict in gnet._find('synsets', {},
+                                  {'id': 1, 'category': 1, 'gn_class': 1,
+                                   'infocont': 1, 'rels': 1}):
+        node_id = str(synset_dict['_id'])
+        yield ('node', node_id, _attributes(
+            type='synset', gn_id=synset_dict.get('id'),
+            category=synset_dict.get('category'),
+            gn_class=synset_dict.get('gn_class'),
+            infocont=synset_dict.get('infocont')))
+        for (name, mongo_id) in synset_dict.get('rels', []):
+            if wanted is None or name in wanted:
+                yield ('edge', node_id, str(mongo_id), name)
+    if not lexunits:
+        return
+    for lemma_dict in gnet._find('lexunits', {},
+                                 {'id': 1, 'category': 1, 'orthForm': 1,
+                                  'sense': 1, 'synset': 1, 'rels': 1}):
+        node_id = str(lemma_dict['_id'])
+        yield ('node', node_id, _attributes(
+            type='lexunit', gn_id=lemma_dict.get('id'),
+            category=lemma_dict.get('category'),
+            orthForm=lemma_dict.get('orthForm'),
+            sense=lemma_dict.get('sense')))
+        if 'synset' in lemma_dict and (wanted is None or
+                                       LEXUNIT_SYNSET_REL in wanted):
+            yield ('edge', node_id, str(lemma_dict['synset']),
+                   LEXUNIT_SYNSET_REL)
+        for (name, mongo_id) in lemma_dict.get('rels', []):
+            if wanted is None or name in wanted:
+                yield ('edge', node_id, str(mongo_id), name)
+
+def _attributes(**kwargs):
+    '''Returns the given keyword arguments, without the None values.'''
+    return dict((key, value) for (key, value) in kwargs.items()
+                if value is not None)
+
+def write_edgelist(gnet, output_file, relations=None, lexunits=True):
+    '''
+    Writes the GermaNet graph as a tab-separated edge list, with one
+    ``source<TAB>target<TAB>relation`` line per edge.  Returns the
+    number of edges written.
+
+    Arguments:
+    - `gnet`: a GermaNet object
+    - `output_file`: a file object opened for writing unicode text
+    - `relations`: a list of relation names to export
+    - `lexunits`: if True, also export lexunits
+    '''
+    num_edges = 0
+    for item in iter_graph(gnet, relations, lexunits):
+        if item[0] == 'edge':
+            output_file.write(u'\t'.join(item[1:]) + u'\n')
+            num_edges += 1
+    return num_edges
+
+def write_graphml(gnet, output_file, relations=None, lexunits=True):
+    '''
+    Writes the GermaNet graph as a directed GraphML document, with
+    the node attributes in NODE_ATTRIBUTES and a ``relation``
+    attribute on every edge.  Returns the number of nodes and edges
+    written.
+
+    Arguments:
+    - `gnet`: a GermaNet object
+    - `output_file`: a file object opened for writing unicode text
+    - `relations`: a list of relation names to export
+    - `lexunits`: if True, also export lexunits
+    '''
+    output_file.write(u'<?xml version="1.0" encoding="UTF-8"?>\n'
+                      u'<graphml xmlns="http://graphml.graphdrawing.org/'
+                      u'xmlns">\n')
+    for (name, attr_type) in NODE_ATTRIBUTES:
+        output_file.write(u'  <key id="{0}" for="node" attr.name="{0}" '
+                          u'attr.type="{1}"/>\n'.format(name, attr_type))
+    output_file.write(u'  <key id="relation" for="edge" '
+                      u'attr.name="relation" attr.type="string"/>\n'
+                      u'  <graph edgedefault="directed">\n')
+    num_nodes = num_edges = 0
+    for item in iter_graph(gnet, relations, lexunits):
+        if item[0] == 'node':
+            output_file.write(u'    <node id="{0}">'.format(item[1]))
+            for (name, _attr_type) in NODE_ATTRIBUTES:
+                if name in item[2]:
+                    output_file.write(u'<data key="{0}">{1}</data>'.format(
+                        name, _escape(str(item[2][name]))))
+            output_file.write(u'</node>\n')
+            num_nodes += 1
+        else:
+            output_file.write(
+                u'    <edge source="{0}" target="{1}"><data key="relation">'
+                u'{2}</data></edge>\n'.format(item[1], item[2],
+                                              _escape(item[3])))
+            num_edges += 1
+    output_file.write(u'  </graph>\n</graphml>\n')
+    return num_nodes, num_edges
+
+def _escape(text):
+    '''Escapes text for use as XML character data.'''
+    return quoteattr(text)[1:-1]
+
+def to_networkx(gnet, relations=None, lexunits=True):
+    '''
+    Builds a networkx.MultiDiGraph of GermaNet, with node attributes
+    as in NODE_ATTRIBUTES and a ``relation`` attribute on every edge.
+    Requires NetworkX.
+
+    Arguments:
+    - `gnet`: a GermaNet object
+    - `relations`: a list of relation names to export
+    - `lexunits`: if True, also export lexunits
+    '''
+    try:
+        graph = networkx.MultiDiGraph()
+    except NameError:
+        raise ImportError('to_networkx requires networkx')
+    for item in iter_graph(gnet, relations, lexunits):
+        if item[0] == 'node':
+            graph.add_node(item[1], **item[2])
+        else:
+            graph.add_edge(item[1], item[2], relation=item[3])
+    return graph
+
+def to_igraph(gnet, relations=None, lexunits=True):
+    '''
+    Builds a directed igraph.Graph of GermaNet.  The ObjectId hex
+    string of each vertex is stored in its ``name`` attribute, and
+    the other node attributes are as in NODE_ATTRIBUTES; every edge
+    has a ``relation`` attribute.  Requires python-igraph.
+
+    Arguments:
+    - `gnet`: a GermaNet object
+    - `relations`: a list of relation names to export
+    - `lexunits`: if True, also export lexunits
+    '''
+    try:
+        graph = igraph.Graph(directed=True)
+    except NameError:
+        raise ImportError('to_igraph requires python-igraph')
+    names      = []
+    vertices   = dict()
+    attributes = dict((name, []) for (name, _attr_type) in NODE_ATTRIBUTES)
+    edges      = []
+    edge_rels  = []
+    for item in iter_graph(gnet, relations, lexunits):
+        if item[0] == 'node':
+            vertices[item[1]] = len(names)
+            names.append(item[1])
+            for (name, values) in attributes.items():
+                values.append(item[2].get(name))
+        else:
+            edges.append((item[1], item[2]))
+            edge_rels.append(item[3])
+    graph.add_vertices(len(names))
+    graph.vs['name'] = names
+    for (name, values) in attributes.items():
+        graph.vs[name] = values
+    # drop edges to nodes which were not exported
+    keep = [idx for (idx, (source, target)) in enumerate(edges)
+            if source in vertices and target in vertices]
+    graph.add_edges([(vertices[edges[idx][0]], vertices[edges[idx][1]])
+                     for idx in keep])
+    graph.es['relation'] = [edge_rels[idx] for idx in keep]
+    return graph
+
+def main():
+    '''Main function.'''
+    usage = ('\n\n  %prog [options] OUTPUT_FILE\n\nArguments:\n\n  '
+             'OUTPUT_FILE           the file to write the graph to, or - '
+             'for\n                        standard output')
+
+    parser = optparse.OptionParser(usage=usage)
+    parser.add_option('--host', default=None,
+                      help='hostname or IP address of the MongoDB instance '
+                      '(default: %default)')
+    parser.add_option('--port', type='int', default=None,
+                      help='port number of the MongoDB instance '
+                      '(default: %default)')
+    parser.add_option('--database', dest='database_name', default='germanet',
+                      help='the name of the GermaNet database on the MongoDB '
+                      'instance (default: %default)')
+    parser.add_option('--format', dest='output_format', default='graphml',
+                      choices=FORMATS,
+                      help='output format, graphml or edgelist '
+                      '(default: %default)')
+    parser.add_option('--relation', dest='relations', action='append',
+                      default=None,
+                      help='export only this relation (may be given more '
+                      'than once)')
+    parser.add_option('--no-lexunits', dest='lexunits', action='store_false',
+                      default=True,
+                      help='export only synsets and their relations')
+    (options, args) = parser.parse_args()
+
+    if len(args) != 1:
+        parser.error("incorrect arguments")
+        sys.exit(1)
+
+    gnet = germanet.load_germanet(options.host, options.port,
+                                  options.database_name)
+    if args[0] != '-':
+        output_file = open(args[0], 'w', encoding='utf-8')
+    elif sys.version_info.major < 3:
+        output_file = codecs.getwriter('utf-8')(sys.stdout)
+    else:
+        output_file = sys.stdout
+    if options.output_format == 'graphml':
+        write_graphml(gnet, output_file, options.relations, options.lexunits)
+    else:
+        write_edgelist(gnet, output_file, options.relations,
+                       options.lexunits)
+    output_file.flush()
+    if args[0] != '-':
+        output_file.close()
+
+if __name__ == '__main__' and sys.argv != ['']:
+    main()
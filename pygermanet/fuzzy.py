@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''
+fuzzy.py
+(c) agent  18 October, 2026
+
+Approximate string matching for GermaNet lemma lookup.
+
+Implements the symmetric delete algorithm (SymSpell): every indexed
+term is stored under all the strings obtained by deleting up to
+``max_distance`` characters from its prefix, and a query only needs
+to generate the deletes of its own prefix to find every term within
+``max_distance`` edits.
+'''
+
+from __future__ import division
+from array import array
+from builtins import range
+import bisect
+
+DEFAULT_MAX_DISTANCE = 2
+DEFAULT_PREFIX_LENGTH = 7
+
+# deletes are stored as 31-bit hashes; a hash collision only adds a
+# candidate, which is then rejected by the distance check
+HASH_MASK = 0x7fffffff
+
+def edit_distance(str1, str2, max_distance):
+    '''
+    Computes the optimal string alignment distance (Levenshtein
+    distance plus transpositions of adjacent characters) between two
+    strings.  Returns ``max_distance + 1`` as soon as the distance is
+    known to exceed ``max_distance``.
+
+    Arguments:
+    - `str1`:
+    - `str2`:
+    - `max_distance`: the largest distance of interest
+    '''
+    if abs(len(str1) - len(str2)) > max_distance:
+        return max_distance + 1
+    prev_prev = None
+    prev      = list(range(len(str2) + 1))
+    for idx1 in range(1, len(str1) + 1):
+        curr    = [idx1] + [0] * len(str2)
+        row_min = idx1
+        char1   = str1[idx1 - 1]
+        for idx2 in range(1, len(str2) + 1):
+            char2 = str2[idx2 - 1]
+            cost  = 0 if char1 == char2 else 1
+            dist  = min(prev[idx2] + 1, curr[idx2 - 1] + 1,
+                        prev[idx2 - 1] + cost)
+            if (1 < idx1 and 1 < idx2 and char1 == str2[idx2 - 2] and
+                    str1[idx1 - 2] == char2):
+                dist = min(dist, prev_prev[idx2 - 2] + 1)
+            curr[idx2] = dist
+            if dist < row_min:
+                row_min = dist
+        if row_min > max_distance:
+            return max_distance + 1
+        prev_prev, prev = prev, curr
+    return min(prev[-1], max_distance + 1)
+
+def deletes(term, max_distance):
+    '''
+    Returns the set of strings obtained by deleting up to
+    ``max_distance`` characters from ``term``, including ``term``
+    itself.
+
+    Arguments:
+    - `term`:
+    - `max_distance`:
+    '''
+    results  = set([term])
+    frontier = [term]
+    for _dist in range(max_distance):
+        next_frontier = []
+        for word in frontier:
+            for idx in range(len(word)):
+                shorter = word[:idx] + word[idx + 1:]
+                if shorter not in results:
+                    results.add(shorter)
+                    next_frontier.append(shorter)
+        frontier = next_frontier
+    return results
+
+class SymSpellIndex(object):
+    '''
+    An index of terms supporting lookup of all terms within a given
+    edit distance of a query string.
+    '''
+
+    def __init__(self, terms, max_distance=DEFAULT_MAX_DISTANCE,
+                 prefix_length=DEFAULT_PREFIX_LENGTH, entries=None):
+        '''
+        Builds the index.
+
+        Arguments:
+        - `terms`: a list of distinct strings
+        - `max_distance`: the largest edit distance which can be
+          queried
+        - `prefix_length`: only the first ``prefix_length`` characters
+          of each term are used to generate deletes; this bounds the
+          size of the index without losing any matches
+        - `entries`: an optional list aligned with ``terms``, holding
+          the data stored for each term; look it up with the term
+          numbers returned by ``lookup``
+        '''
+        self.terms         = terms
+        self.entries       = entries
+        self.max_distance  = max_distance
+        self.prefix_length = prefix_length
+        # (hash << 32 | term number), sorted, split into two arrays
+        keys = sorted((hash(delete) & HASH_MASK) << 32 | term_num
+                      for (term_num, term) in enumerate(terms)
+                      for delete in deletes(term[:prefix_length],
+                                            max_distance))
+        self._hashes = array('l', (key >> 32 for key in keys))
+        self._terms  = array('l', (key & 0xffffffff for key in keys))
+
+    def lookup(self, word, max_distance=None):
+        '''
+        Returns a list of (distance, term number) tuples for the
+        indexed terms within ``max_distance`` edits of ``word``,
+        sorted by distance.
+
+        Arguments:
+        - `word`: the query string
+        - `max_distance`: the largest edit distance to report;
+          defaults to the ``max_distance`` of the index
+        '''
+        if max_distance is None:
+            max_distance = self.max_distance
+        if max_distance > self.max_distance:
+            raise ValueError('index only supports edit distances up to '
+                             '{0}'.format(self.max_distance))
+        candidates = set()
+        for delete in deletes(word[:self.prefix_length], max_distance):
+            key   = hash(delete) & HASH_MASK
+            start = bisect.bisect_left(self._hashes, key)
+            end   = bisect.bisect_right(self._hashes, key, start)
+            candidates.update(self._terms[start:end])
+        results = []
+        for term_num in candidates:
+            dist = edit_distance(word, self.terms[term_num], max_distance)
+            if dist <= max_distance:
+                results.append((dist, term_num))
+        results.sort()
+        return results
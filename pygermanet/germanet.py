@@ -9,16 +9,22 @@ GermaNet interface.
 '''
 
 from __future__ import division
-from builtins import dict, int
+from .affix import AffixIndex
+from .fuzzy import DEFAULT_MAX_DISTANCE, SymSpellIndex
+from .glosses import rank, tokenise
+from .graph import RelationGraph
+from .instrumentation import Instrumentation, Profile
+from .scan import DEFAULT_BATCH_SIZE, CollectionScan
+from .similarity import DISTANCE_METRICS, METRICS, SimilaritySearch
+from .taxonomy import HYPERNYM_REL, TaxonomyIndex
+from builtins import dict, int, range, zip
 from functools import reduce
-from pymongo import MongoClient
+import contextlib
 import functools
 import math
 import sys
-try:
-    import repoze.lru
-except ImportError:
-    pass
+import time
+import weakref
 
 LONG_POS_TO_SHORT = {
     'verben': 'v',
@@ -30,8 +36,126 @@ SHORT_POS_TO_LONG  = dict((v, k) for (k, v) in LONG_POS_TO_SHORT.items())
 
 DEFAULT_CACHE_SIZE = 100
 
+# the number of ObjectIds sent to the database in one ``$in`` query
+ID_QUERY_BATCH_SIZE = 1000
+
+# the names of the relations stored on synsets and on lexunits
+SYNSET_RELATIONS = [
+    'causes',
+    'entails',
+    'has_component_holonym',
+    'has_component_meronym',
+    'has_hypernym',
+    'has_hyponym',
+    'has_member_holonym',
+    'has_member_meronym',
+    'has_portion_holonym',
+    'has_portion_meronym',
+    'has_substance_holonym',
+    'has_substance_meronym',
+    'is_entailed_by',
+    'is_related_to',
+    ]
+LEMMA_RELATIONS = ['has_antonym', 'has_participle', 'has_pertainym']
+
+TRAVERSAL_DIRECTIONS = ['out', 'in', 'both']
+
+# the lexunit fields holding orthographic forms; the importer stores
+# all of them in the indexed list field ``orthForms``
+ORTH_FORM_KEYS = ['orthForm', 'orthVar', 'oldOrthForm', 'oldOrthVar']
+
+# spellings folded together by normalise_orth
+NORMALISE_REWRITES = [
+    (u'ä', u'ae'),
+    (u'ö', u'oe'),
+    (u'ü', u'ue'),
+    (u'ß', u'ss'),
+    ]
+
+def normalise_orth(form):
+    '''
+    Returns the normalised key of an orthographic form: lower case,
+    with umlauts written as ae/oe/ue and sharp s written as ss.  The
+    importer stores this key for every orthographic form of a lexunit
+    in the indexed list field ``normForms``.
+
+    >>> normalise_orth(u'Großmäuligkeit')
+    u'grossmaeuligkeit'
+    '''
+    form = form.lower()
+    for (char, rewrite) in NORMALISE_REWRITES:
+        form = form.replace(char, rewrite)
+    return form
+
+# lookup modes for GermaNet.lemmas; each maps an orthographic form
+# to the key which must match
+NORMALISE_MODES = {
+    'case': lambda form: form.lower(),
+    'full': normalise_orth,
+    }
+
 GERMANET_METAINFO_IGNORE_KEYS = set(['_id'])
 
+# GermaNet attributes read from the metainfo collection, and their
+# values when the database has no metainfo
+GERMANET_METAINFO_DEFAULTS = {
+    'data_version':   None,
+    'gloss_index':    None,
+    'max_min_depths': {},
+    }
+
+def _lru_cache(size):
+    '''
+    Returns a new repoze.lru.LRUCache of the given size, or None if
+    repoze.lru is not installed.  repoze.lru is only imported the
+    first time a cache is needed.
+    '''
+    try:
+        import repoze.lru
+    except ImportError:
+        return None
+    return repoze.lru.LRUCache(size)
+
+# the GermaNet instance which unpickled Synset and Lemma objects are
+# bound to; see set_default_germanet
+_DEFAULT_GERMANET = None
+
+def set_default_germanet(gnet):
+    '''
+    Sets the GermaNet object which unpickled Synset and Lemma objects
+    are bound to.  ``load_germanet`` sets the first GermaNet it loads
+    as the default, so a worker process which loads GermaNet can
+    receive pickled synsets and lemmas without further setup; call
+    this function to choose a different default.
+
+    Arguments:
+    - `gnet`: a GermaNet object
+    '''
+    global _DEFAULT_GERMANET
+    _DEFAULT_GERMANET = gnet
+
+def _unpickle_object(collection, gn_id):
+    '''
+    Rebuilds a pickled Synset or Lemma from its GermaNet id, using
+    the default GermaNet object.
+    '''
+    if _DEFAULT_GERMANET is None:
+        raise ValueError('cannot unpickle GermaNet objects without a '
+                         'default GermaNet; call load_germanet or '
+                         'set_default_germanet first')
+    obj = _DEFAULT_GERMANET._object_by_gn_id(collection, gn_id)
+    if obj is None:
+        raise ValueError('{0} not found in the default GermaNet'.format(gn_id))
+    return obj
+
+def _unpickle_synset(gn_id):
+    '''Unpickles a Synset; see Synset.__reduce__.'''
+    return _unpickle_object('synsets', gn_id)
+
+def _unpickle_lemma(gn_id):
+    '''Unpickles a Lemma; see Lemma.__reduce__.'''
+    return _unpickle_object('lexunits', gn_id)
+
 class GermaNet(object):
     '''A class representing the GermaNet database.'''
 
@@ -43,23 +167,64 @@ class GermaNet(object):
         - `mongo_db`: a pymongo.database.Database object containing
           the GermaNet lexicon
         '''
-        self._mongo_db      = mongo_db
-        self._lemma_cache   = None
-        self._synset_cache  = None
-        self.max_min_depths = {}
+        self._mongo_db       = mongo_db
+        self._lemma_cache    = None
+        self._synset_cache   = None
+        # identity maps, so that each synset and lemma is only
+        # materialised once while it is in use
+        self._lemma_objects  = weakref.WeakValueDictionary()
+        self._synset_objects = weakref.WeakValueDictionary()
+        # the same objects, by GermaNet id, for unpickling
+        self._lemma_gn_ids   = weakref.WeakValueDictionary()
+        self._synset_gn_ids  = weakref.WeakValueDictionary()
+        self._fuzzy_index    = None
+        self._affix_index    = None
+        self._taxonomy_index = None
+        self._relation_graph = None
+        self._similarity     = None
+        self.instrumentation = Instrumentation()
+        self.similarity_memo = None
+        # the metainfo collection is read on first use; see
+        # __getattr__
+        self._metainfo_read  = False
+        self._lemma_cache    = _lru_cache(cache_size)
+        self._synset_cache   = _lru_cache(cache_size)
+
+    def __getattr__(self, name):
+        '''
+        Reads the metainfo collection the first time one of its
+        attributes (such as ``max_min_depths`` or ``data_version``) is
+        needed, so that creating a GermaNet object does not touch the
+        database.  Other missing attributes raise AttributeError
+        straight away.
+        '''
+        if (name not in GERMANET_METAINFO_DEFAULTS or
+                self.__dict__.get('_metainfo_read', True)):
+            raise AttributeError('{0!r} object has no attribute {1!r}'.format(
+                type(self).__name__, name))
+        self._read_metainfo()
+        return getattr(self, name)
+
+    def _read_metainfo(self):
+        '''
+        Sets the attributes stored in the metainfo collection, without
+        overwriting attributes which have already been set.
+        '''
+        self._metainfo_read = True
+        metainfo            = dict((k, v.copy() if isinstance(v, dict) else v)
+                                   for (k, v) in
+                                   GERMANET_METAINFO_DEFAULTS.items())
         try:
-            self.__dict__.update((k, v) for (k, v)
-                                 in self._mongo_db.metainfo.find_one().items()
-                                 if k not in GERMANET_METAINFO_IGNORE_KEYS)
+            metainfo.update((k, v) for (k, v)
+                            in self._find_one('metainfo', {}).items()
+                            if k not in GERMANET_METAINFO_IGNORE_KEYS)
         except AttributeError:
             # ignore error generated if metainfo is not included in
             # the mongo DB
             pass
-        try:
-            self._lemma_cache  = repoze.lru.LRUCache(cache_size)
-            self._synset_cache = repoze.lru.LRUCache(cache_size)
-        except NameError:
-            pass
+        for (k, v) in metainfo.items():
+            if k not in self.__dict__:
+                self.__dict__[k] = v
 
     @property
     def cache_size(self):
@@ -79,51 +244,222 @@ class GermaNet(object):
         '''
         if type(new_value) == int and 0 < new_value:
             if self._lemma_cache is not None:
-                self._lemma_cache  = repoze.lru.LRUCache(new_value)
-                self._synset_cache = repoze.lru.LRUCache(new_value)
+                self._lemma_cache  = _lru_cache(new_value)
+                self._synset_cache = _lru_cache(new_value)
+
+    def set_similarity_memo(self, memo):
+        '''
+        Sets a persistent memo of similarity scores, which the
+        ``Synset`` similarity methods consult before computing a
+        score, and update afterwards.  Pass None to stop using a memo.
+
+        Arguments:
+        - `memo`: a pygermanet.simcache.SimilarityMemo object, or None
+        '''
+        if memo is not None and self.data_version is None:
+            raise ValueError('the GermaNet database has no data version; '
+                             're-import it to use a similarity memo')
+        self.similarity_memo = memo
+
+    def _find_one(self, collection, query):
+        '''
+        Runs ``find_one`` on the given collection, recording the call
+        with the instrumentation.
+
+        Arguments:
+        - `collection`: the name of the MongoDB collection
+        - `query`: the query document
+        '''
+        start  = time.time()
+        retval = self._mongo_db[collection].find_one(query)
+        self.instrumentation.record_call(collection, 'find_one',
+                                         time.time() - start,
+                                         int(retval is not None))
+        return retval
+
+    def _find(self, collection, *args, **kwargs):
+        '''
+        A generator over the results of ``find`` on the given
+        collection.  The time spent fetching results is recorded with
+        the instrumentation when the generator is exhausted or closed.
 
-    def all_lemmas(self):
+        Arguments:
+        - `collection`: the name of the MongoDB collection
+        - `*args`, `**kwargs`: the arguments to ``find``
         '''
-        A generator over all the lemmas in the GermaNet database.
+        elapsed   = 0.
+        documents = 0
+        start     = time.time()
+        cursor    = self._mongo_db[collection].find(*args, **kwargs)
+        try:
+            while True:
+                try:
+                    doc = next(cursor)
+                except StopIteration:
+                    break
+                finally:
+                    elapsed += time.time() - start
+                documents += 1
+                yield doc
+                start = time.time()
+        finally:
+            self.instrumentation.record_call(collection, 'find', elapsed,
+                                             documents)
+
+    @contextlib.contextmanager
+    def profile(self):
         '''
-        for lemma_dict in self._mongo_db.lexunits.find():
-            yield Lemma(self, lemma_dict)
+        A context manager which reports the database calls and cache
+        lookups made inside its block.
 
-    def lemmas(self, lemma, pos = None):
+        >>> with gn.profile() as prof:
+        ...     gn.synset(u'Husky.n.1').hypernym_paths
+        >>> prof.total_calls
+        42
+        '''
+        prof = Profile()
+        self.instrumentation.add_listener(prof)
+        try:
+            yield prof
+        finally:
+            self.instrumentation.remove_listener(prof)
+
+    def all_lemmas(self, pos = None, fields = None,
+                   batch_size = DEFAULT_BATCH_SIZE, position = None,
+                   output = 'objects'):
+        '''
+        An iterator over all the lemmas in the GermaNet database, in
+        batches.  The ``position`` attribute of the iterator can be
+        passed to a later call to resume the scan after the last
+        lemma produced.
+
+        Arguments:
+        - `pos`: if given, only return lemmas with this part of speech
+        - `fields`: a list of fields to read, for the 'records' and
+          'columns' outputs
+        - `batch_size`: the number of lemmas read per query
+        - `position`: the ``position`` of an earlier iterator to
+          resume from
+        - `output`: 'objects' for Lemma objects, 'records' for the raw
+          MongoDB records, or 'columns' for one dictionary mapping
+          field names to lists of values per batch
+
+        >>> lemmas = gn.all_lemmas(pos='v', fields=['orthForm'],
+        ...                        output='records')
+        >>> next(lemmas)['orthForm']
+        u'abarbeiten'
+        >>> next(gn.all_lemmas(pos='v', position=lemmas.position))
+        Lemma(abarbeiten.v.2.abarbeiten)
+        '''
+        query = {}
+        if pos is not None:
+            if pos not in SHORT_POS_TO_LONG:
+                return None
+            query['category'] = SHORT_POS_TO_LONG[pos]
+        return CollectionScan(self, 'lexunits', query, fields, batch_size,
+                              position, output)
+
+    def lemmas(self, lemma, pos = None, variants = False, normalise = None):
         '''
         Looks up lemmas in the GermaNet database.
 
         Arguments:
         - `lemma`:
         - `pos`:
+        - `variants`: if True, also find lemmas which have ``lemma`` as
+          an orthographic variant (orthVar, oldOrthForm or oldOrthVar)
+        - `normalise`: None for an exact match; 'case' to ignore
+          upper and lower case; 'full' (or True) to also treat umlauts
+          as equal to ae/oe/ue and sharp s as equal to ss
+
+        >>> gn.lemmas(u'Delphin', variants=True)
+        [Lemma(Delfin.n.1.Delfin)]
+        >>> gn.lemmas(u'MAENNERCHOR', normalise='full')
+        [Lemma(Männerchor.n.1.Männerchor)]
         '''
+        if normalise:
+            if normalise is True:
+                normalise = 'full'
+            if normalise not in NORMALISE_MODES:
+                raise ValueError('unknown normalisation mode {0!r}'.format(
+                    normalise))
+            orth_key = 'normForms'
+            query    = normalise_orth(lemma)
+        else:
+            orth_key = 'orthForms' if variants else 'orthForm'
+            query    = lemma
         if pos is not None:
             if pos not in SHORT_POS_TO_LONG:
                 return None
             pos         = SHORT_POS_TO_LONG[pos]
-            lemma_dicts = self._mongo_db.lexunits.find({'orthForm': lemma,
-                                                        'category': pos})
+            lemma_dicts = self._find('lexunits', {orth_key:   query,
+                                                  'category': pos})
         else:
-            lemma_dicts = self._mongo_db.lexunits.find({'orthForm': lemma})
-        return sorted([Lemma(self, lemma_dict) for lemma_dict in lemma_dicts])
-
-    def all_synsets(self):
+            lemma_dicts = self._find('lexunits', {orth_key: query})
+        if normalise:
+            # the index holds fully normalised variants; keep only the
+            # lexunits which match under the requested mode
+            norm_func   = NORMALISE_MODES[normalise]
+            key         = norm_func(lemma)
+            lemma_dicts = [lemma_dict for lemma_dict in lemma_dicts
+                           if any(norm_func(form) == key for form in
+                                  (lemma_dict.get('orthForms', [])
+                                   if variants else
+                                   [lemma_dict.get('orthForm', u'')]))]
+        return sorted([self._make_lemma(lemma_dict)
+                       for lemma_dict in lemma_dicts])
+
+    def all_synsets(self, pos = None, gn_class = None, fields = None,
+                    batch_size = DEFAULT_BATCH_SIZE, position = None,
+                    output = 'objects'):
         '''
-        A generator over all the synsets in the GermaNet database.
+        An iterator over all the synsets in the GermaNet database, in
+        batches.  The ``position`` attribute of the iterator can be
+        passed to a later call to resume the scan after the last
+        synset produced.
+
+        Arguments:
+        - `pos`: if given, only return synsets with this part of speech
+        - `gn_class`: if given, only return synsets in this semantic
+          class (such as 'Tier')
+        - `fields`: a list of fields to read, for the 'records' and
+          'columns' outputs
+        - `batch_size`: the number of synsets read per query
+        - `position`: the ``position`` of an earlier iterator to
+          resume from
+        - `output`: 'objects' for Synset objects, 'records' for the
+          raw MongoDB records, or 'columns' for one dictionary mapping
+          field names to lists of values per batch
+
+        >>> batch = next(gn.all_synsets(pos='n', fields=['id', 'infocont'],
+        ...                             output='columns'))
+        >>> sorted(batch)
+        ['_id', 'id', 'infocont']
         '''
-        for synset_dict in self._mongo_db.synsets.find():
-            yield Synset(self, synset_dict)
+        query = {}
+        if pos is not None:
+            if pos not in SHORT_POS_TO_LONG:
+                return None
+            query['category'] = SHORT_POS_TO_LONG[pos]
+        if gn_class is not None:
+            query['gn_class'] = gn_class
+        return CollectionScan(self, 'synsets', query, fields, batch_size,
+                              position, output)
 
-    def synsets(self, lemma, pos = None):
+    def synsets(self, lemma, pos = None, variants = False, normalise = None):
         '''
         Looks up synsets in the GermaNet database.
 
         Arguments:
         - `lemma`:
         - `pos`:
+        - `variants`: if True, also find synsets containing lemmas
+          which have ``lemma`` as an orthographic variant
+        - `normalise`: the normalisation mode, as for ``lemmas``
         '''
         return sorted(set(lemma_obj.synset
-                          for lemma_obj in self.lemmas(lemma, pos)))
+                          for lemma_obj in self.lemmas(lemma, pos, variants,
+                                                       normalise)))
 
     def synset(self, synset_repr):
         '''
@@ -144,11 +480,11 @@ class GermaNet(object):
             return None
         sensenum   = int(sensenum, 10)
         pos        = SHORT_POS_TO_LONG[pos]
-        lemma_dict = self._mongo_db.lexunits.find_one({'orthForm': lemma,
-                                                       'category': pos,
-                                                       'sense':    sensenum})
+        lemma_dict = self._find_one('lexunits', {'orthForm': lemma,
+                                                 'category': pos,
+                                                 'sense':    sensenum})
         if lemma_dict:
-            return Lemma(self, lemma_dict).synset
+            return self._make_lemma(lemma_dict).synset
 
     def get_synset_by_id(self, mongo_id):
         '''
@@ -158,17 +494,12 @@ class GermaNet(object):
         Arguments:
         - `mongo_id`: a bson.objectid.ObjectId object
         '''
-        cache_hit = None
-        if self._synset_cache is not None:
-            cache_hit = self._synset_cache.get(mongo_id)
+        cache_hit = self._cached_object('synsets', mongo_id)
         if cache_hit is not None:
             return cache_hit
-        synset_dict = self._mongo_db.synsets.find_one({'_id': mongo_id})
+        synset_dict = self._find_one('synsets', {'_id': mongo_id})
         if synset_dict is not None:
-            synset = Synset(self, synset_dict)
-            if self._synset_cache is not None:
-                self._synset_cache.put(mongo_id, synset)
-            return synset
+            return self._make_synset(synset_dict)
 
     def get_lemma_by_id(self, mongo_id):
         '''
@@ -178,17 +509,807 @@ class GermaNet(object):
         Arguments:
         - `mongo_id`: a bson.objectid.ObjectId object
         '''
-        cache_hit = None
-        if self._lemma_cache is not None:
-            cache_hit = self._lemma_cache.get(mongo_id)
+        cache_hit = self._cached_object('lexunits', mongo_id)
         if cache_hit is not None:
             return cache_hit
-        lemma_dict = self._mongo_db.lexunits.find_one({'_id': mongo_id})
+        lemma_dict = self._find_one('lexunits', {'_id': mongo_id})
         if lemma_dict is not None:
-            lemma = Lemma(self, lemma_dict)
-            if self._lemma_cache is not None:
-                self._lemma_cache.put(mongo_id, lemma)
-            return lemma
+            return self._make_lemma(lemma_dict)
+
+    def _object_by_gn_id(self, collection, gn_id):
+        '''
+        Builds a Synset or Lemma object from the database entry with
+        the given GermaNet id, using the index on ``id``.  If an
+        object for the entry is still alive, it is returned without
+        querying the database.
+
+        Arguments:
+        - `collection`: 'synsets' or 'lexunits'
+        - `gn_id`: a GermaNet id, such as 's12345' or 'l12345'
+        '''
+        if collection == 'synsets':
+            obj = self._synset_gn_ids.get(gn_id)
+        else:
+            obj = self._lemma_gn_ids.get(gn_id)
+        self.instrumentation.record_cache(collection, obj is not None)
+        if obj is not None:
+            return obj
+        db_dict = self._find_one(collection, {'id': gn_id})
+        if db_dict is not None:
+            return self._make_object(collection, db_dict)
+
+    def _objects_by_ids(self, collection, mongo_ids):
+        '''
+        Builds Synset or Lemma objects for the given ObjectIds, taking
+        them from the cache where possible and fetching the rest with
+        batched queries.  Returns a list in the order of
+        ``mongo_ids``.
+
+        Arguments:
+        - `collection`: 'synsets' or 'lexunits'
+        - `mongo_ids`: a list of bson.objectid.ObjectId objects
+        '''
+        objects = dict()
+        missing = []
+        for mongo_id in mongo_ids:
+            cache_hit = self._cached_object(collection, mongo_id)
+            if cache_hit is not None:
+                objects[mongo_id] = cache_hit
+            else:
+                missing.append(mongo_id)
+        for start in range(0, len(missing), ID_QUERY_BATCH_SIZE):
+            query = {'_id': {'$in': missing[start:start + ID_QUERY_BATCH_SIZE]}}
+            for db_dict in self._find(collection, query):
+                obj = self._make_object(collection, db_dict)
+                objects[obj._id] = obj
+        return [objects[mongo_id] for mongo_id in mongo_ids
+                if mongo_id in objects]
+
+    def _cached_object(self, collection, mongo_id):
+        '''
+        Returns the Synset or Lemma with the given ObjectId if it is
+        in the cache or still alive in the identity map, or None.
+
+        Arguments:
+        - `collection`: 'synsets' or 'lexunits'
+        - `mongo_id`: a bson.objectid.ObjectId object
+        '''
+        if collection == 'synsets':
+            cache, objects = self._synset_cache, self._synset_objects
+        else:
+            cache, objects = self._lemma_cache, self._lemma_objects
+        cache_hit = None
+        if cache is not None:
+            cache_hit = cache.get(mongo_id)
+        if cache_hit is None:
+            cache_hit = objects.get(mongo_id)
+            if cache_hit is not None and cache is not None:
+                cache.put(mongo_id, cache_hit)
+        self.instrumentation.record_cache(collection, cache_hit is not None)
+        return cache_hit
+
+    def _make_object(self, collection, db_dict, cache = True):
+        '''
+        Returns the Synset or Lemma object for a database entry.  If
+        an object for the entry is still alive, it is returned
+        instead of building a new one, so that there is at most one
+        object per synset or lemma.
+
+        Arguments:
+        - `collection`: 'synsets' or 'lexunits'
+        - `db_dict`: a BSON dictionary retrieved from MongoDB
+        - `cache`: if True, also store the object in the LRU cache
+        '''
+        if collection == 'synsets':
+            cls, objects = Synset, self._synset_objects
+            gn_ids, lru  = self._synset_gn_ids, self._synset_cache
+        else:
+            cls, objects = Lemma, self._lemma_objects
+            gn_ids, lru  = self._lemma_gn_ids, self._lemma_cache
+        obj = objects.get(db_dict['_id'])
+        if obj is None:
+            obj = cls(self, db_dict)
+            objects[obj._id] = obj
+            if 'id' in db_dict:
+                gn_ids[db_dict['id']] = obj
+        if cache and lru is not None:
+            lru.put(obj._id, obj)
+        return obj
+
+    def _make_synset(self, db_dict, cache = True):
+        '''
+        Returns the Synset object for a database entry; see
+        ``_make_object``.
+        '''
+        return self._make_object('synsets', db_dict, cache)
+
+    def _make_lemma(self, db_dict, cache = True):
+        '''
+        Returns the Lemma object for a database entry; see
+        ``_make_object``.
+        '''
+        return self._make_object('lexunits', db_dict, cache)
+
+    def _synsets_by_ids(self, mongo_ids):
+        '''
+        Builds Synset objects for the given ObjectIds, using the cache
+        and batched queries.  Returns a list in the order of
+        ``mongo_ids``.
+
+        Arguments:
+        - `mongo_ids`: a list of bson.objectid.ObjectId objects
+        '''
+        return self._objects_by_ids('synsets', mongo_ids)
+
+    def _referring_objects(self, collection, mongo_ids, relations):
+        '''
+        Fetches the Synsets or Lemmas which have one of the given
+        relations pointing to one of the given ObjectIds, using
+        batched queries on the indexed ``rels`` field.
+
+        Arguments:
+        - `collection`: 'synsets' or 'lexunits'
+        - `mongo_ids`: a list of bson.objectid.ObjectId objects
+        - `relations`: a list of relation names
+        '''
+        batch_size = max(1, ID_QUERY_BATCH_SIZE // len(relations))
+        results    = []
+        for start in range(0, len(mongo_ids), batch_size):
+            pairs = [[name, mongo_id] for name in relations
+                     for mongo_id in mongo_ids[start:start + batch_size]]
+            for db_dict in self._find(collection, {'rels': {'$in': pairs}}):
+                results.append(self._make_object(collection, db_dict))
+        return results
+
+    def traverse(self, start, relations = None, max_depth = None,
+                 direction = 'out', server_side = False):
+        '''
+        Traverses GermaNet breadth-first from one or more Synsets (or
+        Lemmas) along the given relations.  Returns an iterator over
+        (Synset, distance) tuples (or (Lemma, distance) tuples), one
+        for every node reachable from ``start``, in order of
+        distance.  The start nodes themselves are not included.
+
+        Each level of the traversal is fetched with a single batched
+        query, and every node is visited only once, so cycles (such as
+        those formed by ``is_related_to``) are harmless.
+
+        Arguments:
+        - `start`: a Synset or Lemma, or a list of Synsets or of
+          Lemmas
+        - `relations`: a relation name or a list of relation names;
+          defaults to all relations
+        - `max_depth`: if given, only return nodes at most this many
+          links away from ``start``
+        - `direction`: 'out' follows relations as they are stored on
+          each node, 'in' follows them backwards (finding the nodes
+          with a relation pointing to each node), and 'both' does both
+        - `server_side`: if True, run the traversal on the MongoDB
+          server using ``$graphLookup``; this needs a single relation,
+          a direction of 'out' or 'in', and a database imported with
+          this version of pygermanet
+
+        >>> [(synset, dist) for (synset, dist) in
+        ...  gn.traverse(gn.synset(u'Hund.n.2'), 'has_hypernym')][:2]
+        [(Synset(Haustier.n.1), 1), (Synset(hundeartiges Landraubtier.n.1), 1)]
+        '''
+        if isinstance(start, (Synset, Lemma)):
+            start = [start]
+        start = list(start)
+        if not start:
+            return iter([])
+        if isinstance(start[0], Synset):
+            collection, all_relations = 'synsets', SYNSET_RELATIONS
+        else:
+            collection, all_relations = 'lexunits', LEMMA_RELATIONS
+        if not all(isinstance(node, start[0].__class__) for node in start):
+            raise ValueError('start nodes must all be Synsets or all Lemmas')
+        if direction not in TRAVERSAL_DIRECTIONS:
+            raise ValueError('unknown direction {0!r}'.format(direction))
+        if relations is not None and not isinstance(relations, (list,
+                                                                tuple, set)):
+            relations = [relations]
+        if server_side:
+            if relations is None or len(relations) != 1 or direction == 'both':
+                raise ValueError('server-side traversal needs a single '
+                                 'relation and a direction of out or in')
+            return iter(self._traverse_server(collection, start,
+                                              list(relations)[0],
+                                              max_depth, direction))
+        return self._traverse_client(collection, start, relations,
+                                     relations or all_relations,
+                                     max_depth, direction)
+
+    def _traverse_client(self, collection, start, relations, in_relations,
+                         max_depth, direction):
+        '''Helper method for traverse.'''
+        visited  = set(node._id for node in start)
+        frontier = start
+        distance = 0
+        while frontier and (max_depth is None or distance < max_depth):
+            distance += 1
+            next_ids = []
+            if direction != 'in':
+                for node in frontier:
+                    for (name, mongo_id) in node._rels:
+                        if ((relations is None or name in relations) and
+                                mongo_id not in visited):
+                            visited.add(mongo_id)
+                            next_ids.append(mongo_id)
+            next_frontier = self._objects_by_ids(collection, next_ids)
+            if direction != 'out':
+                for node in self._referring_objects(
+                        collection, [node._id for node in frontier],
+                        in_relations):
+                    if node._id not in visited:
+                        visited.add(node._id)
+                        next_frontier.append(node)
+            for node in next_frontier:
+                yield node, distance
+            frontier = next_frontier
+
+    def _traverse_server(self, collection, start, relation, max_depth,
+                         direction):
+        '''Helper method for traverse.'''
+        field  = 'relids.' + relation
+        lookup = {'from':             collection,
+                  'startWith':        '$' + (field if direction == 'out'
+                                             else '_id'),
+                  'connectFromField': field if direction == 'out' else '_id',
+                  'connectToField':   '_id' if direction == 'out' else field,
+                  'as':               'reached',
+                  'depthField':       'depth'}
+        if max_depth is not None:
+            if max_depth < 1:
+                return []
+            lookup['maxDepth'] = max_depth - 1
+        start_ids = set(node._id for node in start)
+        pipeline  = [{'$match': {'_id': {'$in': list(start_ids)}}},
+                     {'$project': {field: 1}},
+                     {'$graphLookup': lookup},
+                     {'$unwind': '$reached'},
+                     {'$replaceRoot': {'newRoot': '$reached'}}]
+        start_time = time.time()
+        db_dicts   = list(self._mongo_db[collection].aggregate(
+            pipeline, allowDiskUse=True))
+        self.instrumentation.record_call(collection, 'aggregate',
+                                         time.time() - start_time,
+                                         len(db_dicts))
+        # keep the shortest distance to each node reached from any of
+        # the start nodes
+        distances = dict()
+        for db_dict in db_dicts:
+            depth = db_dict.pop('depth')
+            if db_dict['_id'] not in start_ids and (
+                    db_dict['_id'] not in distances or
+                    depth < distances[db_dict['_id']][0]):
+                distances[db_dict['_id']] = (depth, db_dict)
+        return [(self._make_object(collection, db_dict), depth + 1)
+                for (depth, db_dict) in sorted(
+                    distances.values(), key=lambda pair: (pair[0],
+                                                          pair[1]['_id']))]
+
+    def _taxonomy(self):
+        '''
+        Returns the in-memory index of the hypernym hierarchy, building
+        it from a single pass over the synsets on the first call.
+        '''
+        if self._taxonomy_index is None:
+            self._taxonomy_index = TaxonomyIndex(
+                (synset_dict['_id'], synset_dict.get('category'),
+                 synset_dict.get('infocont', 0.),
+                 [mongo_id for (name, mongo_id) in synset_dict.get('rels', [])
+                  if name == HYPERNYM_REL])
+                for synset_dict in self._find(
+                        'synsets', {},
+                        {'rels': 1, 'category': 1, 'infocont': 1}))
+        return self._taxonomy_index
+
+    def _relations(self):
+        '''
+        Returns the in-memory graph of all synset relations and lifted
+        lexical relations, building it from one pass over the synsets
+        and one over the lexunits on the first call.
+        '''
+        if self._relation_graph is None:
+            self._relation_graph = RelationGraph(
+                ((synset_dict['_id'], synset_dict.get('rels', []))
+                 for synset_dict in self._find('synsets', {}, {'rels': 1})),
+                ((lemma_dict['_id'], lemma_dict.get('synset'),
+                  lemma_dict.get('rels', []))
+                 for lemma_dict in self._find('lexunits', {},
+                                              {'rels': 1, 'synset': 1})))
+        return self._relation_graph
+
+    def shortest_path(self, source, target, relations = None,
+                      max_length = None):
+        '''
+        Finds a shortest path from one synset to another along any
+        mix of synset relations and lexical relations (a lexical
+        relation between two lemmas links their synsets).  Returns a
+        tuple (path, length), where ``path`` is a list of
+        (relation name, Synset) tuples starting with (None, source),
+        or None if there is no such path.
+
+        The search is a bidirectional breadth-first search over an
+        in-memory graph of all relations, which is built on the first
+        call.  Relations are followed in the direction in which they
+        are stored; most relations are stored together with their
+        inverse (e.g., has_hypernym and has_hyponym).
+
+        Arguments:
+        - `source`: a Synset object
+        - `target`: a Synset object
+        - `relations`: a relation name or a list of relation names;
+          defaults to all relations
+        - `max_length`: if given, only return paths with at most this
+          many links
+
+        >>> gn.shortest_path(gn.synset(u'Rad.n.1'),
+        ...                  gn.synset(u'Fahrrad.n.1'),
+        ...                  ['has_component_holonym'])
+        ([(None, Synset(Rad.n.1)),
+          ('has_component_holonym', Synset(Fahrrad.n.1))], 1)
+        '''
+        if not isinstance(source, Synset) or not isinstance(target, Synset):
+            return None
+        if relations is not None and not isinstance(relations, (list,
+                                                                tuple, set)):
+            relations = [relations]
+        graph = self._relations()
+        if source._id not in graph.node or target._id not in graph.node:
+            return None
+        path = graph.shortest_path(graph.node[source._id],
+                                   graph.node[target._id],
+                                   graph.relation_numbers(relations),
+                                   max_length)
+        if path is None:
+            return None
+        synsets = self._synsets_by_ids([graph.ids[node]
+                                        for (_rel_num, node) in path])
+        names   = [None] + [graph.relations[rel_num]
+                            for (rel_num, _node) in path[1:]]
+        return list(zip(names, synsets)), len(path) - 1
+
+    def most_similar(self, synset, metric = 'lin', k = 10, pos = None,
+                     threshold = None, exhaustive = False):
+        '''
+        Finds the synsets most similar to ``synset``.  Returns a list
+        of up to ``k`` (Synset, score) tuples, most similar first, with
+        ties broken by ObjectId.  For 'jcn', the score is the
+        Jiang-Conrath distance, and the closest synsets come first.
+        Synsets with a score of 0 (or, for 'jcn', without information
+        content) are not returned.
+
+        The search runs on the in-memory index of the hypernym
+        hierarchy, and only scores the synsets below those hypernyms
+        of ``synset`` which could still beat the current k-th score.
+
+        Arguments:
+        - `synset`: a Synset object
+        - `metric`: one of 'lch', 'res', 'jcn' or 'lin'
+        - `k`: the maximum number of synsets to return, or None for no
+          limit (``threshold`` must then be given)
+        - `pos`: if given, only return synsets with this part of speech
+        - `threshold`: if given, only return synsets with a score at
+          least this large (for 'jcn', a distance at most this large)
+        - `exhaustive`: if True, compute the score of every synset in
+          the database with the Synset methods (slow; for
+          verification)
+
+        >>> gn.most_similar(gn.synset(u'Hund.n.2'), 'lin', 2)
+        [(Synset(Katze.n.1), 0.8410338102519616),
+         (Synset(Wolf.n.1), 0.8022316939811683)]
+        '''
+        if metric not in METRICS:
+            raise ValueError('unknown metric {0!r}'.format(metric))
+        if k is None and threshold is None:
+            raise ValueError('one of k and threshold must be given')
+        category = None
+        if pos is not None:
+            if pos not in SHORT_POS_TO_LONG:
+                return None
+            category = SHORT_POS_TO_LONG[pos]
+        if exhaustive:
+            return self._most_similar_exhaustive(synset, metric, k,
+                                                 category, threshold)
+        taxonomy = self._taxonomy()
+        if synset._id not in taxonomy.node:
+            return []
+        if self._similarity is None:
+            self._similarity = SimilaritySearch(taxonomy, self.max_min_depths)
+        results = self._similarity.search(metric, taxonomy.node[synset._id],
+                                          k, category, threshold)
+        synsets = self._synsets_by_ids([taxonomy.ids[node]
+                                        for (_score, node) in results])
+        return list(zip(synsets, [score for (score, _node) in results]))
+
+    def _most_similar_exhaustive(self, synset, metric, k, category,
+                                 threshold):
+        '''Helper method for most_similar.'''
+        method   = {'lch': 'sim_lch', 'res': 'sim_res',
+                    'jcn': 'dist_jcn', 'lin': 'sim_lin'}[metric]
+        distance = metric in DISTANCE_METRICS
+        query    = {} if category is None else {'category': category}
+        results  = []
+        for other in (self._make_synset(synset_dict, cache=False)
+                      for synset_dict in self._find('synsets', query)):
+            if other == synset:
+                continue
+            if distance:
+                if synset.infocont == 0 or other.infocont == 0:
+                    continue
+            score = getattr(synset, method)(other)
+            if not distance and score == 0:
+                continue
+            if threshold is not None and (score > threshold if distance
+                                          else score < threshold):
+                continue
+            results.append((score, other))
+        results.sort(key=lambda pair: ((pair[0] if distance else -pair[0]),
+                                       pair[1]._id))
+        if k is not None:
+            results = results[:k]
+        return [(other, score) for (score, other) in results]
+
+    def to_sparse(self, relations = None, pos = None):
+        '''
+        Exports the synset graph as SciPy sparse matrices, one for
+        each relation, together with NumPy arrays of synset ids,
+        categories, probabilities (``infocont``) and minimum depths
+        aligned with the rows of the matrices.  The graph is read with
+        a single query.  Requires NumPy and SciPy.
+
+        Returns a pygermanet.sparse.SparseGraph object.
+
+        Arguments:
+        - `relations`: a relation name or a list of relation names;
+          defaults to all synset relations
+        - `pos`: if given, only export synsets with this part of
+          speech (relations to other synsets are dropped)
+
+        >>> graph = gn.to_sparse(['has_hypernym'], 'n')
+        >>> graph.matrices['has_hypernym'].shape
+        (69594, 69594)
+        '''
+        query = {}
+        if pos is not None:
+            if pos not in SHORT_POS_TO_LONG:
+                return None
+            query['category'] = SHORT_POS_TO_LONG[pos]
+        if relations is not None and not isinstance(relations, (list,
+                                                                tuple, set)):
+            relations = [relations]
+        from .sparse import HAVE_SCIPY, SparseGraph
+        if not HAVE_SCIPY:
+            raise ImportError('to_sparse requires numpy and scipy')
+        return SparseGraph(self._find('synsets', query,
+                                      {'id': 1, 'category': 1,
+                                       'infocont': 1, 'rels': 1}),
+                           relations)
+
+    def _orth_form_entries(self):
+        '''
+        A generator over (form, category, ObjectId) tuples for every
+        orthographic form (including variants) of every lexunit in the
+        database, read in a single pass.
+        '''
+        projection = dict((key, 1) for key in ORTH_FORM_KEYS)
+        projection['category'] = 1
+        for lemma_dict in self._find('lexunits', {}, projection):
+            for key in ORTH_FORM_KEYS:
+                if key in lemma_dict:
+                    yield (lemma_dict[key], lemma_dict['category'],
+                           lemma_dict['_id'])
+
+    def lemmas_fuzzy(self, word, max_distance = DEFAULT_MAX_DISTANCE,
+                     pos = None, limit = 10):
+        '''
+        Finds the lemmas whose orthographic form (or one of its
+        variants) is within ``max_distance`` edits (insertions,
+        deletions, substitutions or transpositions of adjacent
+        characters) of ``word``.  Returns a list of (Lemma, distance)
+        tuples, closest first.
+
+        The search uses an in-memory index over all orthographic forms
+        in the database, which is built on the first call.
+
+        Arguments:
+        - `word`:
+        - `max_distance`: the largest edit distance to accept
+        - `pos`: if given, only return lemmas with this part of speech
+        - `limit`: the maximum number of lemmas to return
+
+        >>> gn.lemmas_fuzzy(u'Hunf', 1)
+        [(Lemma(Hund.n.1.Hund), 1), (Lemma(Hund.n.2.Hund), 1)]
+        '''
+        category = None
+        if pos is not None:
+            if pos not in SHORT_POS_TO_LONG:
+                return None
+            category = SHORT_POS_TO_LONG[pos]
+        if (self._fuzzy_index is None or
+                self._fuzzy_index.max_distance < max_distance):
+            forms = dict()
+            for (form, form_category, mongo_id) in self._orth_form_entries():
+                forms.setdefault(form, []).append((form_category, mongo_id))
+            terms = sorted(forms)
+            self._fuzzy_index = SymSpellIndex(
+                terms, max(max_distance, DEFAULT_MAX_DISTANCE),
+                entries=[forms[term] for term in terms])
+        # terms are sorted, so matches come out ordered by distance
+        # and then alphabetically
+        distances = dict()
+        matches   = []
+        for (dist, term_num) in self._fuzzy_index.lookup(word, max_distance):
+            for (form_category, mongo_id) in \
+                    self._fuzzy_index.entries[term_num]:
+                if category is not None and form_category != category:
+                    continue
+                if mongo_id not in distances:
+                    distances[mongo_id] = dist
+                    matches.append(mongo_id)
+            if limit <= len(matches):
+                break
+        return sorted(((lemma, distances[lemma._id]) for lemma in
+                       self._lemmas_by_ids(matches[:limit])),
+                      key=lambda pair: (pair[1], pair[0]))
+
+    def _lemmas_by_ids(self, mongo_ids):
+        '''
+        Fetches the lemmas with the given ObjectIds, using the cache
+        and batched queries, and returns them as a sorted list of
+        Lemma objects.
+
+        Arguments:
+        - `mongo_ids`: a list of bson.objectid.ObjectId objects
+        '''
+        return sorted(self._objects_by_ids('lexunits', mongo_ids))
+
+    def _affix_lemmas(self, affix, pos, limit, suffix):
+        '''Helper method for lemmas_prefix and lemmas_suffix.'''
+        category = None
+        if pos is not None:
+            if pos not in SHORT_POS_TO_LONG:
+                return None
+            category = SHORT_POS_TO_LONG[pos]
+        if self._affix_index is None:
+            self._affix_index = AffixIndex(
+                (form.lower(), (form_category, mongo_id))
+                for (form, form_category, mongo_id) in
+                self._orth_form_entries())
+        if suffix:
+            matches = self._affix_index.suffix(affix.lower())
+        else:
+            matches = self._affix_index.prefix(affix.lower())
+        mongo_ids = []
+        seen      = set()
+        for (form_category, mongo_id) in matches:
+            if category is not None and form_category != category:
+                continue
+            if mongo_id not in seen:
+                seen.add(mongo_id)
+                mongo_ids.append(mongo_id)
+                if limit is not None and limit <= len(mongo_ids):
+                    break
+        return self._lemmas_by_ids(mongo_ids)
+
+    def lemmas_prefix(self, prefix, pos = None, limit = None):
+        '''
+        Finds the lemmas with an orthographic form (or variant)
+        starting with ``prefix``, ignoring case.  The search uses an
+        in-memory sorted index which is built on the first call.
+
+        Arguments:
+        - `prefix`:
+        - `pos`: if given, only return lemmas with this part of speech
+        - `limit`: if given, the maximum number of lemmas to return
+
+        >>> gn.lemmas_prefix(u'Hundeh')
+        [Lemma(Hundehalsband.n.1.Hundehalsband),
+         Lemma(Hundehalter.n.1.Hundehalter),
+         Lemma(Hundehütte.n.1.Hundehütte)]
+        '''
+        return self._affix_lemmas(prefix, pos, limit, False)
+
+    def lemmas_suffix(self, suffix, pos = None, limit = None):
+        '''
+        Finds the lemmas with an orthographic form (or variant) ending
+        with ``suffix``, ignoring case.  The search uses an in-memory
+        sorted index which is built on the first call.
+
+        Arguments:
+        - `suffix`:
+        - `pos`: if given, only return lemmas with this part of speech
+        - `limit`: if given, the maximum number of lemmas to return
+
+        >>> gn.lemmas_suffix(u'hütte', limit=2)
+        [Lemma(Almhütte.n.1.Almhütte), Lemma(Berghütte.n.1.Berghütte)]
+        '''
+        return self._affix_lemmas(suffix, pos, limit, True)
+
+    def _compound_lemmas(self, field, text, pos):
+        '''Helper method for lemmas_by_compound_head/modifier.'''
+        query = {field: text}
+        if pos is not None:
+            if pos not in SHORT_POS_TO_LONG:
+                return None
+            query['category'] = SHORT_POS_TO_LONG[pos]
+        return sorted(self._make_lemma(lemma_dict) for lemma_dict in
+                      self._find('lexunits', query))
+
+    def lemmas_by_compound_head(self, head, pos = None):
+        '''
+        Finds the compound lemmas whose head (as analysed by GermaNet)
+        is ``head``.
+
+        Arguments:
+        - `head`:
+        - `pos`:
+
+        >>> gn.lemmas_by_compound_head(u'Hütte')[:2]
+        [Lemma(Almhütte.n.1.Almhütte), Lemma(Berghütte.n.1.Berghütte)]
+        '''
+        return self._compound_lemmas('compound.head.text', head, pos)
+
+    def lemmas_by_compound_modifier(self, modifier, pos = None):
+        '''
+        Finds the compound lemmas which have ``modifier`` as one of
+        their modifiers (as analysed by GermaNet).
+
+        Arguments:
+        - `modifier`:
+        - `pos`:
+        '''
+        return self._compound_lemmas('compound.modifier.text', modifier, pos)
+
+    def synsets_by_class(self, gn_class, pos = None):
+        '''
+        Finds the synsets in the given semantic class (the ``class``
+        attribute in the GermaNet XML, such as 'Tier' or
+        'Kommunikation'), using the index on ``gn_class``.  The
+        synsets are ordered by part of speech and then by database
+        id, so that ordering them needs no further queries.
+
+        Arguments:
+        - `gn_class`:
+        - `pos`:
+
+        >>> len(gn.synsets_by_class(u'Tier', 'n'))
+        8029
+        '''
+        query = {'gn_class': gn_class}
+        if pos is not None:
+            if pos not in SHORT_POS_TO_LONG:
+                return None
+            query['category'] = SHORT_POS_TO_LONG[pos]
+        return [self._make_synset(synset_dict, cache=False)
+                for synset_dict in sorted(
+                    self._find('synsets', query),
+                    key=lambda synset_dict: (synset_dict['category'],
+                                             synset_dict['_id']))]
+
+    def lemmas_by_frame(self, frame):
+        '''
+        Finds the verb lemmas which have the given subcategorisation
+        frame (such as 'NN.AN'), using the index on ``frames``.
+
+        Arguments:
+        - `frame`:
+
+        >>> gn.lemmas_by_frame(u'NN.AN.DS')[:2]
+        [Lemma(abbestellen.v.1.abbestellen), Lemma(abbringen.v.1.abbringen)]
+        '''
+        return sorted(self._make_lemma(lemma_dict, cache=False)
+                      for lemma_dict in self._find('lexunits',
+                                                   {'frames': frame}))
+
+    def ili_links(self, synsets):
+        '''
+        Looks up the interlingual index (ILI) links from the given
+        synsets to Princeton WordNet, with batched queries.  Returns a
+        dictionary mapping each Synset to a list of ILI records: one
+        dictionary per link, with the keys lexUnitId, ewnRelation
+        (such as 'synonym' or 'has_hypernym'), pwnWord, pwn20Id,
+        pwn30Id and pwn20Synonyms.
+
+        Arguments:
+        - `synsets`: a Synset or a list of Synsets
+
+        >>> gn.ili_links(gn.synset(u'Hund.n.2'))[gn.synset(u'Hund.n.2')][0]
+        {u'ewnRelation': u'synonym', u'lexUnitId': u'l47280',
+         u'pwn20Id': u'ENG20-02001223-n', u'pwn30Id': u'ENG30-02084071-n',
+         u'pwnWord': u'dog', ...}
+        '''
+        if isinstance(synsets, Synset):
+            synsets = [synsets]
+        by_id = dict((synset._id, synset) for synset in synsets)
+        links = dict((synset, []) for synset in by_id.values())
+        ids   = list(by_id)
+        for start in range(0, len(ids), ID_QUERY_BATCH_SIZE):
+            for ili_dict in self._find(
+                    'ili', {'synset': {'$in': ids[start:start +
+                                                  ID_QUERY_BATCH_SIZE]}},
+                    {'_id': 0, 'lexunit': 0}):
+                links[by_id[ili_dict.pop('synset')]].append(ili_dict)
+        return links
+
+    def from_wordnet(self, pwn_ids, relations = None):
+        '''
+        Maps Princeton WordNet synset ids (such as 'ENG30-02084071-n'
+        or 'ENG20-02001223-n') to GermaNet synsets through the
+        interlingual index, with batched queries.  Returns a
+        dictionary mapping each WordNet id to a sorted list of
+        Synsets.
+
+        Arguments:
+        - `pwn_ids`: a WordNet synset id or a list of them; ids
+          starting with 'ENG20-' are WordNet 2.0 ids, all others are
+          WordNet 3.0 ids
+        - `relations`: if given, a list of the ILI relations to follow
+          (such as ['synonym', 'near_synonym']); defaults to all
+
+        >>> gn.from_wordnet([u'ENG30-02084071-n'], ['synonym'])
+        {u'ENG30-02084071-n': [Synset(Hund.n.2)]}
+        '''
+        if not isinstance(pwn_ids, (list, tuple, set)):
+            pwn_ids = [pwn_ids]
+        pwn_ids = list(set(pwn_ids))
+        synsets = dict((pwn_id, set()) for pwn_id in pwn_ids)
+        for (field, wordnet20) in [('pwn20Id', True), ('pwn30Id', False)]:
+            field_ids = [pwn_id for pwn_id in pwn_ids
+                         if pwn_id.startswith('ENG20-') == wordnet20]
+            for start in range(0, len(field_ids), ID_QUERY_BATCH_SIZE):
+                query = {field: {'$in': field_ids[start:start +
+                                                  ID_QUERY_BATCH_SIZE]}}
+                if relations is not None:
+                    query['ewnRelation'] = {'$in': list(relations)}
+                for ili_dict in self._find('ili', query,
+                                           {field: 1, 'synset': 1}):
+                    synsets[ili_dict[field]].add(ili_dict['synset'])
+        objects = dict((synset._id, synset) for synset in self._synsets_by_ids(
+            list(set(mongo_id for mongo_ids in synsets.values()
+                     for mongo_id in mongo_ids))))
+        return dict((pwn_id, sorted(objects[mongo_id] for mongo_id in mongo_ids
+                                    if mongo_id in objects))
+                    for (pwn_id, mongo_ids) in synsets.items())
+
+    def search_glosses(self, query, pos = None, limit = 10):
+        '''
+        Full-text search over the glosses of the synsets (their
+        paraphrases, and the wiktionary paraphrases and examples of
+        their lemmas).  Returns a list of (Synset, score) tuples,
+        best match first, ranked with Okapi BM25 using the inverted
+        index built by the importer.
+
+        Arguments:
+        - `query`: the text to search for
+        - `pos`: if given, only return synsets with this part of speech
+        - `limit`: the maximum number of synsets to return
+
+        >>> gn.search_glosses(u'bellendes Haustier', limit=1)
+        [(Synset(Hund.n.1), 11.62...)]
+        '''
+        category = None
+        if pos is not None:
+            if pos not in SHORT_POS_TO_LONG:
+                return None
+            category = SHORT_POS_TO_LONG[pos]
+        if self.gloss_index is None:
+            raise ValueError('the GermaNet database has no gloss index; '
+                             're-import it to search glosses')
+        terms = tokenise(query)
+        if not terms:
+            return []
+        postings = dict((term_dict['term'], term_dict['postings'])
+                        for term_dict in self._find(
+                            'glossindex', {'term': {'$in': list(set(terms))}}))
+        scores   = rank(terms, postings, self.gloss_index['num_docs'],
+                        self.gloss_index['avg_length'], category)
+        best     = sorted(scores, key=lambda mongo_id: (-scores[mongo_id],
+                                                        str(mongo_id)))
+        return [(synset, scores[synset._id]) for synset in
+                self._synsets_by_ids(best[:limit])]
 
     def lemmatise(self, word):
         '''
@@ -201,7 +1322,7 @@ class GermaNet(object):
         >>> gn.lemmatise(u'XYZ123')
         [u'XYZ123']
         '''
-        lemmas = list(self._mongo_db.lemmatiser.find({'word': word}))
+        lemmas = list(self._find('lemmatiser', {'word': word}))
         if lemmas:
             return [lemma['lemma'] for lemma in lemmas]
         else:
@@ -210,6 +1331,7 @@ class GermaNet(object):
 # rename some of the fields in the MongoDB dictionary
 SYNSET_MEMBER_REWRITES = {
     'lexunits': '_lexunits',
+    'relids':   '_relids',
     'rels':     '_rels',
     }
 
@@ -234,6 +1356,7 @@ class Synset(object):
         self.id           = None
         self.infocont     = 0.
         self._lexunits    = None
+        self.paraphrase   = None
         self.__dict__.update((SYNSET_MEMBER_REWRITES.get(k, k), v)
                              for (k, v) in db_dict.items())
 
@@ -315,6 +1438,101 @@ class Synset(object):
         else:
             return [[self]]
 
+    def iter_hypernym_paths(self):
+        '''
+        A generator over the paths following hypernym links from the
+        GermaNet root node to this synset, in the same order as
+        ``hypernym_paths``, which builds one path at a time instead of
+        the whole list.
+
+        >>> next(gn.synset(u'Husky.n.1').iter_hypernym_paths())[-2:]
+        [Synset(Hunderasse.n.1), Synset(Husky.n.1)]
+        '''
+        hypernyms = {self: self.hypernyms}
+        if not hypernyms[self]:
+            yield [self]
+            return
+        # depth-first search up the hierarchy; path holds the synsets
+        # from this one upwards, and stack the hypernyms still to visit
+        path  = [self]
+        stack = [iter(hypernyms[self])]
+        while stack:
+            hypernym = next(stack[-1], None)
+            if hypernym is None:
+                stack.pop()
+                path.pop()
+                continue
+            if hypernym not in hypernyms:
+                hypernyms[hypernym] = hypernym.hypernyms
+            if hypernyms[hypernym]:
+                path.append(hypernym)
+                stack.append(iter(hypernyms[hypernym]))
+            else:
+                yield [hypernym] + path[::-1]
+
+    def _hypernym_dag(self):
+        '''
+        Returns this synset and its (transitive) hypernyms as a list
+        in topological order (every synset before its hypernyms),
+        together with a dictionary mapping each of them to its list of
+        hypernyms.
+        '''
+        hypernyms = dict()
+        frontier  = [self]
+        while frontier:
+            next_frontier = []
+            for synset in frontier:
+                if synset not in hypernyms:
+                    hypernyms[synset] = synset.hypernyms
+                    next_frontier.extend(hypernyms[synset])
+            frontier = next_frontier
+        num_hyponyms = dict((synset, 0) for synset in hypernyms)
+        for synset_hypernyms in hypernyms.values():
+            for hypernym in synset_hypernyms:
+                num_hyponyms[hypernym] += 1
+        order = [self]
+        for synset in order:
+            for hypernym in hypernyms[synset]:
+                num_hyponyms[hypernym] -= 1
+                if not num_hyponyms[hypernym]:
+                    order.append(hypernym)
+        return order, hypernyms
+
+    @property
+    def num_hypernym_paths(self):
+        '''
+        The number of hypernym paths from this synset to the root
+        (that is, ``len(self.hypernym_paths)``), counted by dynamic
+        programming over the hypernym hierarchy without building the
+        paths.
+        '''
+        return self.hypernym_path_counts[self]
+
+    @property
+    def hypernym_path_counts(self):
+        '''
+        Returns a dictionary mapping this synset and each of its
+        (transitive) hypernyms to the number of hypernym paths of this
+        synset which pass through it.  The counts are computed by
+        dynamic programming over the hypernym hierarchy, without
+        building the paths.
+        '''
+        order, hypernyms = self._hypernym_dag()
+        # paths from this synset up to each synset
+        paths_from = dict((synset, 0) for synset in order)
+        paths_from[self] = 1
+        for synset in order:
+            for hypernym in hypernyms[synset]:
+                paths_from[hypernym] += paths_from[synset]
+        # paths from each synset up to a root
+        paths_to = dict()
+        for synset in reversed(order):
+            paths_to[synset] = (sum(paths_to[hypernym] for hypernym in
+                                    hypernyms[synset])
+                                if hypernyms[synset] else 1)
+        return dict((synset, paths_from[synset] * paths_to[synset])
+                    for synset in order)
+
     @property
     def hypernym_distances(self):
         '''
@@ -355,6 +1573,45 @@ class Synset(object):
         '''
         return min([len(path) for path in self.hypernym_paths])
 
+    def is_a(self, other):
+        '''
+        Returns True if this synset is ``other`` or one of its
+        (transitive) hyponyms.  The test takes constant time, using an
+        in-memory index of the hypernym hierarchy which is built on
+        first use.
+
+        Arguments:
+        - `other`: a Synset object
+
+        >>> gn.synset('Hund.n.2').is_a(gn.synset('Tier.n.1'))
+        True
+        '''
+        if not isinstance(other, Synset):
+            return False
+        taxonomy = self._germanet._taxonomy()
+        if self._id not in taxonomy.node or other._id not in taxonomy.node:
+            return False
+        return taxonomy.is_a(taxonomy.node[self._id],
+                             taxonomy.node[other._id])
+
+    def descendants(self, max_depth = None):
+        '''
+        Returns a list of all the (transitive) hyponyms of this synset,
+        not including the synset itself.  The hyponyms are found using
+        an in-memory index of the hypernym hierarchy, and fetched from
+        the database in batches.
+
+        Arguments:
+        - `max_depth`: if given, only return hyponyms at most this many
+          hyponym links below this synset
+        '''
+        taxonomy = self._germanet._taxonomy()
+        if self._id not in taxonomy.node:
+            return []
+        return self._germanet._synsets_by_ids(
+            [taxonomy.ids[node] for node in
+             taxonomy.descendants(taxonomy.node[self._id], max_depth)])
+
     def __repr__(self):
         reprstr = u'Synset({0}.{1}.{2})'.format(
             self.lemmas[0].orthForm,
@@ -367,7 +1624,17 @@ class Synset(object):
     def __hash__(self):
         return hash(self._id)
 
+    def __reduce__(self):
+        '''
+        Pickles this Synset as its GermaNet id; it is rebound to the
+        default GermaNet object (see ``set_default_germanet``) when
+        unpickled.
+        '''
+        return (_unpickle_synset, (self.id,))
+
     def __eq__(self, other):
+        if self is other:
+            return True
         if isinstance(other, self.__class__):
             return self._id == other._id
         else:
@@ -470,6 +1737,26 @@ class Synset(object):
     #  Semantic similarity
     # --------------------------------------------------
 
+    def _memoised(self, metric, other, compute):
+        '''
+        Looks up a similarity score in the GermaNet object's
+        similarity memo, computing and storing it if it is missing.
+
+        Arguments:
+        - `metric`: the name of the metric
+        - `other`: the other synset
+        - `compute`: the method which computes the score
+        '''
+        memo = self._germanet.similarity_memo
+        if memo is None or not isinstance(other, Synset):
+            return compute(other)
+        version = self._germanet.data_version
+        score   = memo.get(self.id, other.id, metric, version)
+        if score is None:
+            score = compute(other)
+            memo.put(self.id, other.id, metric, version, score)
+        return score
+
     def sim_lch(self, other):
         '''
         Computes the Leacock-Chodorow similarity score between this synset
@@ -478,6 +1765,10 @@ class Synset(object):
         Arguments:
         - `other`:
         '''
+        return self._memoised('lch', other, self._sim_lch)
+
+    def _sim_lch(self, other):
+        '''Computes sim_lch without consulting the memo.'''
         if not isinstance(other, Synset):
             return 0.
         if self.category != other.category:
@@ -497,6 +1788,10 @@ class Synset(object):
         Arguments:
         - `other`:
         '''
+        return self._memoised('res', other, self._sim_res)
+
+    def _sim_res(self, other):
+        '''Computes sim_res without consulting the memo.'''
         if not isinstance(other, Synset):
             return 0.
         # find the lowest concept which subsumes both this synset and
@@ -527,6 +1822,10 @@ class Synset(object):
         Arguments:
         - `other`:
         '''
+        return self._memoised('jcn', other, self._dist_jcn)
+
+    def _dist_jcn(self, other):
+        '''Computes dist_jcn without consulting the memo.'''
         ic1 = self.infocont
         ic2 = other.infocont
         if ic1 == 0 or ic2 == 0:
@@ -544,6 +1843,10 @@ class Synset(object):
         Arguments:
         - `other`:
         '''
+        return self._memoised('lin', other, self._sim_lin)
+
+    def _sim_lin(self, other):
+        '''Computes sim_lin without consulting the memo.'''
         ic1 = self.infocont
         ic2 = other.infocont
         if ic1 == 0 or ic2 == 0:
@@ -555,8 +1858,9 @@ class Synset(object):
 
 # rename some of the fields in the MongoDB dictionary
 LEMMA_MEMBER_REWRITES = {
-    'synset': '_synset',
+    'relids': '_relids',
     'rels':   '_rels',
+    'synset': '_synset',
     }
 
 @functools.total_ordering
@@ -577,13 +1881,16 @@ class Lemma(object):
         self._rels        = []
         self.artificial   = None
         self.category     = None
+        self.compound     = None
         self.examples     = None
         self.frames       = None
         self.id           = None
         self.namedEntity  = None
+        self.normForms    = []
         self.oldOrthForm  = None
         self.oldOrthVar   = None
         self.orthForm     = None
+        self.orthForms    = []
         self.orthVar      = None
         self.paraphrases  = []
         self.sense        = None
@@ -645,7 +1952,17 @@ class Lemma(object):
     def __hash__(self):
         return hash(self._id)
 
+    def __reduce__(self):
+        '''
+        Pickles this Lemma as its GermaNet id; it is rebound to the
+        default GermaNet object (see ``set_default_germanet``) when
+        unpickled.
+        '''
+        return (_unpickle_lemma, (self.id,))
+
     def __eq__(self, other):
+        if self is other:
+            return True
         if isinstance(other, self.__class__):
             return self._id == other._id
         else:
@@ -661,16 +1978,65 @@ class Lemma(object):
         else:
             return False
 
-def load_germanet(host = None, port = None, database_name = 'germanet'):
+class LazyDatabase(object):
+    '''
+    Stands in for a pymongo.database.Database object, importing
+    pymongo and connecting to MongoDB the first time the database is
+    used.
+    '''
+
+    def __init__(self, host, port, database_name):
+        '''
+        Constructor.
+
+        Arguments:
+        - `host`: the hostname of the MongoDB instance
+        - `port`: the port number of the MongoDB instance
+        - `database_name`: the name of the database
+        '''
+        self._host          = host
+        self._port          = port
+        self._database_name = database_name
+        self._database      = None
+
+    def _connect(self):
+        '''Returns the pymongo Database, connecting if necessary.'''
+        if self._database is None:
+            from pymongo import MongoClient
+            self._database = MongoClient(self._host,
+                                         self._port)[self._database_name]
+        return self._database
+
+    def __getitem__(self, name):
+        return self._connect()[name]
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self._connect(), name)
+
+def load_germanet(host = None, port = None, database_name = 'germanet',
+                  lazy = False):
     '''
     Loads a GermaNet instance connected to the given MongoDB instance.
+    If no default GermaNet for unpickling Synset and Lemma objects has
+    been set yet, the new instance becomes the default; later calls
+    leave the default unchanged (see ``set_default_germanet``).
 
     Arguments:
     - `host`: the hostname of the MongoDB instance
     - `port`: the port number of the MongoDB instance
     - `database_name`: the name of the GermaNet database on the
       MongoDB instance
+    - `lazy`: if True, do not import pymongo or connect to MongoDB
+      until GermaNet is first used
     '''
-    client      = MongoClient(host, port)
-    germanet_db = client[database_name]
-    return GermaNet(germanet_db)
+    if lazy:
+        germanet_db = LazyDatabase(host, port, database_name)
+    else:
+        from pymongo import MongoClient
+        germanet_db = MongoClient(host, port)[database_name]
+    gnet = GermaNet(germanet_db)
+    if _DEFAULT_GERMANET is None:
+        set_default_germanet(gnet)
+    return gnet
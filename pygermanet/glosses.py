@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''
+glosses.py
+(c) agent  18 October, 2026
+
+Full-text search over synset glosses.
+
+The gloss of a synset is the text of its GermaNet paraphrase, the
+wiktionary paraphrases of its lexunits and the examples of its
+lexunits.  The importer builds an inverted index over these glosses,
+which is stored in the ``glossindex`` collection with one document per
+term, and queries are ranked with Okapi BM25.
+'''
+
+from __future__ import division
+from builtins import dict
+import math
+import re
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+# very frequent German function words, which are not indexed
+STOPWORDS = frozenset([
+    u'aber', u'als', u'am', u'an', u'auch', u'auf', u'aus', u'bei',
+    u'bzw', u'das', u'dass', u'dem', u'den', u'der', u'des', u'die',
+    u'durch', u'ein', u'eine', u'einem', u'einen', u'einer', u'eines',
+    u'es', u'für', u'im', u'in', u'ist', u'mit', u'nach', u'nicht',
+    u'oder', u'sich', u'so', u'um', u'und', u'von', u'vor', u'wie',
+    u'wird', u'zu', u'zum', u'zur',
+    ])
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B  = 0.75
+
+def tokenise(text):
+    '''
+    Splits a text into lower case index terms, dropping stopwords and
+    numbers.
+
+    >>> tokenise(u'Ein Hund ist ein Haustier.')
+    [u'hund', u'haustier']
+    '''
+    return [token for token in TOKEN_RE.findall(text.lower())
+            if token not in STOPWORDS and not token.isdigit()]
+
+def lexunit_gloss_texts(lemma_dict):
+    '''
+    Returns the gloss texts (wiktionary paraphrases and examples) of
+    a lexunit dictionary from MongoDB.
+
+    Arguments:
+    - `lemma_dict`: a lexunit dictionary
+    '''
+    texts = [paraphrase['wiktionarySense'] for paraphrase in
+             lemma_dict.get('paraphrases', []) if 'wiktionarySense' in
+             paraphrase]
+    texts.extend(example['text'] for example in
+                 lemma_dict.get('examples', []) if 'text' in example)
+    return texts
+
+def build_postings(documents):
+    '''
+    Builds an inverted index.  Returns a tuple (postings, num_docs,
+    avg_length), where postings is a dictionary mapping each term to a
+    list of [ObjectId, term frequency, document length, category]
+    lists.
+
+    Arguments:
+    - `documents`: an iterable of (ObjectId, category, list of texts)
+      tuples, one per synset
+    '''
+    postings     = dict()
+    num_docs     = 0
+    total_length = 0
+    for (mongo_id, category, texts) in documents:
+        terms = []
+        for text in texts:
+            terms.extend(tokenise(text))
+        if not terms:
+            continue
+        num_docs     += 1
+        total_length += len(terms)
+        counts        = dict()
+        for term in terms:
+            counts[term] = counts.get(term, 0) + 1
+        for (term, count) in counts.items():
+            postings.setdefault(term, []).append(
+                [mongo_id, count, len(terms), category])
+    return postings, num_docs, (total_length / num_docs if num_docs else 0.)
+
+def rank(query, postings, num_docs, avg_length, category=None):
+    '''
+    Scores the documents matching a query with Okapi BM25.  Returns a
+    dictionary mapping ObjectIds to scores.
+
+    Arguments:
+    - `query`: the list of query terms, as returned by ``tokenise``
+    - `postings`: a dictionary mapping terms to their postings lists
+    - `num_docs`: the number of documents in the index
+    - `avg_length`: the average document length
+    - `category`: if given, only score documents in this category
+    '''
+    query_counts = dict()
+    for term in query:
+        query_counts[term] = query_counts.get(term, 0) + 1
+    scores = dict()
+    for (term, query_count) in query_counts.items():
+        term_postings = postings.get(term)
+        if not term_postings:
+            continue
+        doc_freq = len(term_postings)
+        idf      = math.log(1. + (num_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+        for (mongo_id, count, length, doc_category) in term_postings:
+            if category is not None and doc_category != category:
+                continue
+            norm = BM25_K1 * (1. - BM25_B + BM25_B * length / avg_length)
+            scores[mongo_id] = (scores.get(mongo_id, 0.) + query_count * idf *
+                                count * (BM25_K1 + 1.) / (count + norm))
+    return scores
@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''
+graph.py
+(c) agent  18 October, 2026
+
+An in-memory adjacency structure over all GermaNet relations, for
+shortest path queries through arbitrary mixes of relation types.
+
+Lexical relations (such as antonymy) hold between lexical units; here
+they are lifted to relations between the synsets containing those
+lexical units.
+'''
+
+from builtins import dict, range, zip
+
+class RelationGraph(object):
+    '''
+    A directed graph of GermaNet synsets, with edges labelled by
+    relation names.
+    '''
+
+    def __init__(self, synset_records, lexunit_records):
+        '''
+        Builds the graph.
+
+        Arguments:
+        - `synset_records`: an iterable of (ObjectId, rels) tuples, one
+          per synset, where ``rels`` is a list of (relation name,
+          ObjectId) pairs
+        - `lexunit_records`: an iterable of (ObjectId, synset ObjectId,
+          rels) tuples, one per lexunit
+        '''
+        self.ids       = []
+        self.node      = dict()
+        self.relations = []
+        self._rel_num  = dict()
+        edges          = []
+        for (mongo_id, rels) in synset_records:
+            self.node[mongo_id] = len(self.ids)
+            self.ids.append(mongo_id)
+            edges.append(rels)
+        lexunit_synset = dict()
+        lexunit_rels   = []
+        for (mongo_id, synset_id, rels) in lexunit_records:
+            lexunit_synset[mongo_id] = synset_id
+            if rels:
+                lexunit_rels.append((synset_id, rels))
+        self.succ = [[] for _idx in range(len(self.ids))]
+        self.pred = [[] for _idx in range(len(self.ids))]
+        seen      = set()
+        for (node, rels) in enumerate(edges):
+            for (name, mongo_id) in rels:
+                self._add_edge(node, name, mongo_id, seen)
+        for (synset_id, rels) in lexunit_rels:
+            if synset_id in self.node:
+                for (name, mongo_id) in rels:
+                    self._add_edge(self.node[synset_id], name,
+                                   lexunit_synset.get(mongo_id), seen)
+
+    def _add_edge(self, node, name, mongo_id, seen):
+        '''Adds an edge to the graph, ignoring duplicates.'''
+        if mongo_id not in self.node:
+            return
+        if name not in self._rel_num:
+            self._rel_num[name] = len(self.relations)
+            self.relations.append(name)
+        target = self.node[mongo_id]
+        edge   = (node, self._rel_num[name], target)
+        if edge not in seen:
+            seen.add(edge)
+            self.succ[node].append((target, edge[1]))
+            self.pred[target].append((node, edge[1]))
+
+    def relation_numbers(self, relations):
+        '''
+        Returns the set of relation numbers for the given relation
+        names, or None if ``relations`` is None.
+
+        Arguments:
+        - `relations`: a list of relation names, or None
+        '''
+        if relations is None:
+            return None
+        return set(self._rel_num[name] for name in relations
+                   if name in self._rel_num)
+
+    def shortest_path(self, source, target, relations=None,
+                      max_length=None):
+        '''
+        Finds a shortest directed path from ``source`` to ``target``
+        using bidirectional breadth-first search.  Returns a list of
+        (relation number, node) tuples, starting with (None, source),
+        or None if there is no such path.
+
+        Arguments:
+        - `source`: a node number
+        - `target`: a node number
+        - `relations`: a set of relation numbers to follow, or None to
+          follow all relations
+        - `max_length`: if given, the maximum number of edges in the
+          path
+        '''
+        if source == target:
+            return [(None, source)]
+        # each side maps visited nodes to (parent, relation number)
+        forward    = {source: None}
+        backward   = {target: None}
+        fwd_front  = [source]
+        bwd_front  = [target]
+        fwd_depth  = bwd_depth = 0
+        while fwd_front and bwd_front:
+            if (max_length is not None and
+                    max_length <= fwd_depth + bwd_depth):
+                return None
+            # expand the smaller frontier by one whole level
+            if len(fwd_front) <= len(bwd_front):
+                fwd_front, meet = self._expand(fwd_front, self.succ,
+                                               relations, forward, backward)
+                fwd_depth += 1
+            else:
+                bwd_front, meet = self._expand(bwd_front, self.pred,
+                                               relations, backward, forward)
+                bwd_depth += 1
+            if meet is not None:
+                return self._join(meet, forward, backward)
+        return None
+
+    @staticmethod
+    def _expand(frontier, adjacency, relations, visited, other):
+        '''
+        Expands one level of a breadth-first search.  Returns the new
+        frontier and None, or, as soon as a node visited by the other
+        search is reached, None and that node.  Any such meeting node
+        lies on a shortest path, since the searches have not met at
+        a lower level.
+        '''
+        next_front = []
+        for node in frontier:
+            for (neighbour, rel_num) in adjacency[node]:
+                if relations is not None and rel_num not in relations:
+                    continue
+                if neighbour not in visited:
+                    visited[neighbour] = (node, rel_num)
+                    if neighbour in other:
+                        return None, neighbour
+                    next_front.append(neighbour)
+        return next_front, None
+
+    @staticmethod
+    def _join(meet, forward, backward):
+        '''
+        Builds the path through ``meet`` from the parent pointers of
+        the two searches.
+        '''
+        path = [meet]
+        rels = []
+        node = meet
+        while forward[node] is not None:
+            node, rel_num = forward[node]
+            path.insert(0, node)
+            rels.insert(0, rel_num)
+        node = meet
+        while backward[node] is not None:
+            node, rel_num = backward[node]
+            path.append(node)
+            rels.append(rel_num)
+        return list(zip([None] + rels, path))
@@ -0,0 +1,232 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''
+instrumentation.py
+(c) agent  18 October, 2026
+
+Counters and timing histograms for the database calls made by a
+GermaNet object.
+'''
+
+from __future__ import division
+from builtins import dict, int, range
+from collections import defaultdict
+import math
+
+# timing histograms use power-of-two buckets of microseconds, from
+# 1us up to about 35 minutes
+NUM_HISTOGRAM_BUCKETS = 32
+
+class Histogram(object):
+    '''A histogram of durations with logarithmically sized buckets.'''
+
+    def __init__(self):
+        '''Creates a new, empty Histogram.'''
+        self.count   = 0
+        self.total   = 0.
+        self.min     = None
+        self.max     = None
+        self.buckets = [0] * NUM_HISTOGRAM_BUCKETS
+
+    def add(self, seconds):
+        '''
+        Adds a duration to the histogram.
+
+        Arguments:
+        - `seconds`: the duration in seconds
+        '''
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or self.max < seconds:
+            self.max = seconds
+        micros = seconds * 1e6
+        bucket = 0
+        if 1. < micros:
+            bucket = min(NUM_HISTOGRAM_BUCKETS - 1,
+                         int(math.ceil(math.log(micros, 2))))
+        self.buckets[bucket] += 1
+
+    def percentile(self, point):
+        '''
+        Estimates the given percentile of the recorded durations in
+        seconds, as the upper bound of the bucket containing it.
+
+        Arguments:
+        - `point`: a number between 0 and 100
+        '''
+        if not self.count:
+            return None
+        rank = point / 100. * self.count
+        seen = 0
+        for bucket in range(NUM_HISTOGRAM_BUCKETS):
+            seen += self.buckets[bucket]
+            if rank <= seen:
+                return min(self.max, (2 ** bucket) / 1e6)
+        return self.max
+
+    def to_dict(self):
+        '''Returns a summary of the histogram as a dictionary.'''
+        return {'count':   self.count,
+                'seconds': self.total,
+                'min':     self.min,
+                'max':     self.max,
+                'p50':     self.percentile(50),
+                'p99':     self.percentile(99),
+                'buckets': dict(('<={0}us'.format(2 ** bucket), num)
+                                for (bucket, num) in enumerate(self.buckets)
+                                if num)}
+
+class Profile(object):
+    '''
+    Accumulates the database and cache events generated during a
+    block of code.  Returned by ``GermaNet.profile()``.
+    '''
+
+    def __init__(self):
+        '''Creates a new, empty Profile.'''
+        self.calls        = defaultdict(int)
+        self.seconds      = defaultdict(float)
+        self.documents    = defaultdict(int)
+        self.cache_hits   = defaultdict(int)
+        self.cache_misses = defaultdict(int)
+
+    def __call__(self, event):
+        '''
+        Records an event; a Profile can be registered as an
+        Instrumentation listener.
+
+        Arguments:
+        - `event`: an event dictionary, as passed to listeners
+        '''
+        if event['type'] == 'db':
+            key = (event['collection'], event['operation'])
+            self.calls[key]     += 1
+            self.seconds[key]   += event['seconds']
+            self.documents[key] += event['documents']
+        elif event['hit']:
+            self.cache_hits[event['cache']] += 1
+        else:
+            self.cache_misses[event['cache']] += 1
+
+    @property
+    def total_calls(self):
+        '''The number of database calls made.'''
+        return sum(self.calls.values())
+
+    @property
+    def total_seconds(self):
+        '''The time spent in database calls, in seconds.'''
+        return sum(self.seconds.values())
+
+    def report(self):
+        '''Returns a summary of the profile as a dictionary.'''
+        return {'total_calls':   self.total_calls,
+                'total_seconds': self.total_seconds,
+                'calls':         dict(('{0}.{1}'.format(*key), num)
+                                      for (key, num) in self.calls.items()),
+                'seconds':       dict(('{0}.{1}'.format(*key), num)
+                                      for (key, num) in self.seconds.items()),
+                'documents':     dict(('{0}.{1}'.format(*key), num)
+                                      for (key, num) in
+                                      self.documents.items()),
+                'cache_hits':    dict(self.cache_hits),
+                'cache_misses':  dict(self.cache_misses)}
+
+    def __repr__(self):
+        return 'Profile(calls={0}, seconds={1:.6f}, cache_hits={2}, ' \
+            'cache_misses={3})'.format(self.total_calls, self.total_seconds,
+                                       sum(self.cache_hits.values()),
+                                       sum(self.cache_misses.values()))
+
+class Instrumentation(object):
+    '''
+    Counts database calls and cache lookups per collection and
+    operation, and forwards them as events to any registered
+    listeners.
+
+    Listeners are callables taking a single event dictionary.  Database
+    events have the keys ``type`` ('db'), ``collection``,
+    ``operation``, ``seconds`` and ``documents``; cache events have
+    the keys ``type`` ('cache'), ``cache`` and ``hit``.
+    '''
+
+    def __init__(self):
+        '''Creates a new Instrumentation object with no listeners.'''
+        self.listeners = []
+        self.reset()
+
+    def reset(self):
+        '''Clears all the counters.'''
+        self.timings      = defaultdict(Histogram)
+        self.documents    = defaultdict(int)
+        self.cache_hits   = defaultdict(int)
+        self.cache_misses = defaultdict(int)
+
+    def add_listener(self, listener):
+        '''
+        Registers a callable to receive every event.
+
+        Arguments:
+        - `listener`: a callable taking an event dictionary
+        '''
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        '''
+        Unregisters a listener added with ``add_listener``.
+
+        Arguments:
+        - `listener`:
+        '''
+        self.listeners.remove(listener)
+
+    def record_call(self, collection, operation, seconds, documents):
+        '''
+        Records a database call.
+
+        Arguments:
+        - `collection`: the name of the MongoDB collection
+        - `operation`: the name of the operation ('find', 'find_one')
+        - `seconds`: the time spent in the database call
+        - `documents`: the number of documents returned
+        '''
+        key = (collection, operation)
+        self.timings[key].add(seconds)
+        self.documents[key] += documents
+        if self.listeners:
+            event = {'type':       'db',
+                     'collection': collection,
+                     'operation':  operation,
+                     'seconds':    seconds,
+                     'documents':  documents}
+            for listener in list(self.listeners):
+                listener(event)
+
+    def record_cache(self, cache, hit):
+        '''
+        Records a cache lookup.
+
+        Arguments:
+        - `cache`: the name of the cache
+        - `hit`: True if the lookup was answered from the cache
+        '''
+        if hit:
+            self.cache_hits[cache] += 1
+        else:
+            self.cache_misses[cache] += 1
+        if self.listeners:
+            event = {'type': 'cache', 'cache': cache, 'hit': hit}
+            for listener in list(self.listeners):
+                listener(event)
+
+    def snapshot(self):
+        '''Returns the current counters as a dictionary.'''
+        return {'calls':        dict(('{0}.{1}'.format(*key), hist.to_dict())
+                                     for (key, hist) in self.timings.items()),
+                'documents':    dict(('{0}.{1}'.format(*key), num)
+                                     for (key, num) in self.documents.items()),
+                'cache_hits':   dict(self.cache_hits),
+                'cache_misses': dict(self.cache_misses)}
@@ -10,6 +10,7 @@ A script to import the GermaNet lexicon into a MongoDB database.
 
 from __future__ import absolute_import, division, print_function
 from . import germanet
+from .glosses import build_postings, lexunit_gloss_texts
 from builtins import dict, int, str, zip
 from collections import defaultdict
 from io import open
@@ -20,6 +21,7 @@ import optparse
 import os
 import re
 import sys
+import uuid
 import xml.etree.ElementTree as etree
 
 
@@ -259,15 +261,18 @@ def read_lexical_file(filename):
                                       'unrecognised child of <compound>',
                                       child)
                                 continue
+                        lexunit_dict['compound'] = compound_dict
                     else:
                         print(lexloc, 'unrecognised child of <lexUnit>', child)
                         continue
             elif child.tag == 'paraphrase':
                 paraphrase = child
                 warn_attribs(synloc, paraphrase, set())
-                paraphrase_text = str(paraphrase.text)
+                paraphrase_text = (paraphrase.text or '').strip()
                 if not paraphrase_text:
                     print(synloc, 'WARNING: <paraphrase> tag with no text')
+                else:
+                    synset_dict['paraphrase'] = str(paraphrase_text)
             else:
                 print(synloc, 'unrecognised child of <synset>', child)
                 continue
@@ -376,6 +381,45 @@ def read_paraphrase_file(filename):
     return paraphrases
 
 
+# ------------------------------------------------------------
+#  Read interlingual index file
+# ------------------------------------------------------------
+
+ILI_ATTRIBS = set(['lexUnitId', 'ewnRelation', 'pwnWord', 'pwn20Id',
+                   'pwn30Id', 'pwn20paraphrase', 'source'])
+
+def read_ili_file(filename):
+    '''
+    Reads in a GermaNet interlingual index file and returns its
+    contents as a list of dictionary structures.
+
+    Arguments:
+    - `filename`:
+    '''
+    with open(filename, 'rb') as input_file:
+        doc = etree.parse(input_file)
+
+    assert doc.getroot().tag == 'interLingualIndex'
+    ili_records = []
+    for child in doc.getroot():
+        if child.tag == 'iliRecord':
+            ili_record = child
+            warn_attribs('', ili_record, ILI_ATTRIBS)
+            ili_dict = dict(ili_record.items())
+            for ili_child in ili_record:
+                if ili_child.tag == 'pwn20Synonyms':
+                    ili_dict['pwn20Synonyms'] = [
+                        str(synonym.text) for synonym in ili_child
+                        if synonym.tag == 'pwn20Synonym' and synonym.text]
+                else:
+                    print('unrecognised child of <iliRecord>', ili_child)
+            ili_records.append(ili_dict)
+        else:
+            print('unknown child of <interLingualIndex>', child)
+
+    return ili_records
+
+
 # ------------------------------------------------------------
 #  Mongo insertion
 # ------------------------------------------------------------
@@ -399,6 +443,13 @@ def insert_lexical_information(germanet_db, lex_files):
     # drop the database collections if they already exist
     germanet_db.lexunits.drop()
     germanet_db.synsets.drop()
+    # forget the data version until the import is complete (see
+    # record_data_version), so that an interrupted import does not
+    # leave the old version behind
+    metainfo = germanet_db.metainfo.find_one()
+    if metainfo is not None and 'data_version' in metainfo:
+        del metainfo['data_version']
+        germanet_db.metainfo.save(metainfo)
     # inject data from XML files into the database
     for lex_file in lex_files:
         synsets = read_lexical_file(lex_file)
@@ -406,6 +457,17 @@ def insert_lexical_information(germanet_db, lex_files):
             synset = dict((SYNSET_KEY_REWRITES.get(key, key), value)
                           for (key, value) in synset.items())
             lexunits = synset['lexunits']
+            for lexunit in lexunits:
+                # collect all orthographic forms in one indexed field
+                lexunit['orthForms'] = []
+                for key in germanet.ORTH_FORM_KEYS:
+                    if (key in lexunit and
+                        lexunit[key] not in lexunit['orthForms']):
+                        lexunit['orthForms'].append(lexunit[key])
+                # and their normalised keys for noisy input
+                lexunit['normForms'] = sorted(set(
+                    germanet.normalise_orth(form)
+                    for form in lexunit['orthForms']))
             synset['lexunits'] = germanet_db.lexunits.insert(lexunits)
             synset_id = germanet_db.synsets.insert(synset)
             for lexunit in lexunits:
@@ -422,10 +484,40 @@ def insert_lexical_information(germanet_db, lex_files):
     germanet_db.lexunits.create_index([('orthForm', DESCENDING),
                                        ('category', DESCENDING),
                                        ('sense', DESCENDING)])
+    # index lexunits by all their orthographic variants
+    germanet_db.lexunits.create_index([('orthForms', DESCENDING)])
+    germanet_db.lexunits.create_index([('orthForms', DESCENDING),
+                                       ('category', DESCENDING)])
+    # and by their normalised forms
+    germanet_db.lexunits.create_index([('normForms', DESCENDING)])
+    germanet_db.lexunits.create_index([('normForms', DESCENDING),
+                                       ('category', DESCENDING)])
+    # index compounds by their head and modifiers
+    germanet_db.lexunits.create_index('compound.head.text')
+    germanet_db.lexunits.create_index('compound.modifier.text')
+    # index synsets by semantic class, and verb lexunits by frame
+    germanet_db.synsets.create_index([('gn_class', DESCENDING),
+                                      ('category', DESCENDING)])
+    germanet_db.lexunits.create_index('frames')
     print('Inserted {0} synsets, {1} lexical units.'.format(
         germanet_db.synsets.count(),
         germanet_db.lexunits.count()))
 
+def relation_ids(rels):
+    '''
+    Groups a list of (relation name, ObjectId) tuples into a
+    dictionary mapping each relation name to the list of its target
+    ObjectIds.  This is stored alongside ``rels`` so that MongoDB's
+    ``$graphLookup`` can follow a single relation.
+
+    Arguments:
+    - `rels`:
+    '''
+    relids = {}
+    for (name, mongo_id) in rels:
+        relids.setdefault(name, []).append(mongo_id)
+    return relids
+
 def insert_relation_information(germanet_db, gn_rels_file):
     '''
     Reads in the given GermaNet relation file and inserts its contents
@@ -457,7 +549,8 @@ def insert_relation_information(germanet_db, gn_rels_file):
             to_lexunit['rels'].add((lex_rel['inv'], from_lexunit['_id']))
     for lexunit in lexunits.values():
         if 'rels' in lexunit:
-            lexunit['rels'] = sorted(lexunit['rels'])
+            lexunit['rels']   = sorted(lexunit['rels'])
+            lexunit['relids'] = relation_ids(lexunit['rels'])
             germanet_db.lexunits.save(lexunit)
 
     # cache the synsets while we work on them
@@ -480,9 +573,20 @@ def insert_relation_information(germanet_db, gn_rels_file):
             to_synset['rels'].add((con_rel['inv'], from_synset['_id']))
     for synset in synsets.values():
         if 'rels' in synset:
-            synset['rels'] = sorted(synset['rels'])
+            synset['rels']   = sorted(synset['rels'])
+            synset['relids'] = relation_ids(synset['rels'])
             germanet_db.synsets.save(synset)
 
+    # index the relations for traversals against their direction
+    germanet_db.lexunits.create_index('rels')
+    germanet_db.synsets.create_index('rels')
+    for name in set(name for lexunit in lexunits.values()
+                    for name in lexunit.get('relids', {})):
+        germanet_db.lexunits.create_index('relids.' + name)
+    for name in set(name for synset in synsets.values()
+                    for name in synset.get('relids', {})):
+        germanet_db.synsets.create_index('relids.' + name)
+
     print('Inserted {0} lexical relations, {1} synset relations.'.format(
         len(lex_rels), len(con_rels)))
 
@@ -515,6 +619,86 @@ def insert_paraphrase_information(germanet_db, wiktionary_files):
 
     print('Inserted {0} wiktionary paraphrases.'.format(num_paraphrases))
 
+def insert_ili_information(germanet_db, ili_files):
+    '''
+    Reads in the given GermaNet interlingual index files and inserts
+    their records into the ili collection of the given MongoDB
+    database.  Each record also stores the ObjectIds of its lexunit
+    and synset.
+
+    Arguments:
+    - `germanet_db`: a pymongo.database.Database object
+    - `ili_files`: a list of interlingual index file names
+    '''
+    # drop the database collection if it already exists
+    germanet_db.ili.drop()
+    lexunits = dict((lemma_dict['id'], lemma_dict) for lemma_dict in
+                    germanet_db.lexunits.find({}, {'id': 1, 'synset': 1}))
+    num_records = 0
+    num_unknown = 0
+    for filename in ili_files:
+        ili_records = []
+        for ili_dict in read_ili_file(filename):
+            lexunit = lexunits.get(ili_dict.get('lexUnitId'))
+            if lexunit is None:
+                num_unknown += 1
+                continue
+            ili_dict['lexunit'] = lexunit['_id']
+            ili_dict['synset']  = lexunit['synset']
+            ili_records.append(ili_dict)
+        if ili_records:
+            germanet_db.ili.insert(ili_records)
+        num_records += len(ili_records)
+    # index the records by synset, and by WordNet synset id
+    germanet_db.ili.create_index('synset')
+    germanet_db.ili.create_index('pwn20Id')
+    germanet_db.ili.create_index('pwn30Id')
+
+    if num_unknown:
+        print('WARNING: skipped {0} interlingual index records with unknown '
+              'lexunits'.format(num_unknown))
+    print('Inserted {0} interlingual index records.'.format(num_records))
+
+def insert_gloss_index(germanet_db):
+    '''
+    Builds the inverted index over synset glosses (paraphrases,
+    wiktionary paraphrases and examples) used by
+    ``GermaNet.search_glosses``, and stores it in the glossindex
+    collection.
+
+    Arguments:
+    - `germanet_db`: a pymongo.database.Database object
+    '''
+    # collect the gloss texts of every synset's lexunits
+    lexunit_texts = defaultdict(list)
+    for lemma_dict in germanet_db.lexunits.find(
+            {}, {'synset': 1, 'paraphrases.wiktionarySense': 1,
+                 'examples.text': 1}):
+        lexunit_texts[lemma_dict['synset']].extend(
+            lexunit_gloss_texts(lemma_dict))
+    documents = (
+        (synset_dict['_id'], synset_dict['category'],
+         ([synset_dict['paraphrase']] if 'paraphrase' in synset_dict else [])
+         + lexunit_texts[synset_dict['_id']])
+        for synset_dict in germanet_db.synsets.find(
+            {}, {'category': 1, 'paraphrase': 1}))
+    postings, num_docs, avg_length = build_postings(documents)
+    # drop the database collection if it already exists
+    germanet_db.glossindex.drop()
+    for (term, term_postings) in postings.items():
+        germanet_db.glossindex.insert({'term': term, 'postings': term_postings})
+    germanet_db.glossindex.create_index('term')
+
+    if germanet_db.metainfo.count() == 0:
+        germanet_db.metainfo.insert({})
+    metainfo = germanet_db.metainfo.find_one()
+    metainfo['gloss_index'] = {'num_docs': num_docs,
+                               'avg_length': avg_length}
+    germanet_db.metainfo.save(metainfo)
+
+    print('Indexed {0} terms in the glosses of {1} synsets.'.format(
+        len(postings), num_docs))
+
 LEMMATISATION_FILE = 'baseforms_by_projekt_deutscher_wortschatz.txt.gz'
 
 def insert_lemmatisation_data(germanet_db):
@@ -581,11 +765,12 @@ def insert_infocontent_data(germanet_db):
         count = float(count) / len(synsets)
         for synset in synsets:
             total_count += count
-            paths = synset.hypernym_paths
-            scount = float(count) / len(paths)
-            for path in paths:
-                for ss in path:
-                    gn_counts[ss._id] += scount
+            # each path gets an equal share of the count; a hypernym
+            # on several paths gets a share for each of them
+            path_counts = synset.hypernym_path_counts
+            scount      = float(count) / path_counts[synset]
+            for (ss, num_paths) in path_counts.items():
+                gn_counts[ss._id] += scount * num_paths
     print('Read {0} of {1} lines from count file.'.format(num_lines_read,
                                                           num_lines))
     print('Recorded counts for {0} synsets.'.format(len(gn_counts)))
@@ -624,6 +809,24 @@ def compute_max_min_depth(germanet_db):
     print(u', '.join(u'{0}: {1}'.format(k, v) for (k, v) in
                      sorted(max_min_depths.items())).encode('utf-8'))
 
+def record_data_version(germanet_db):
+    '''
+    Stores a new, random data version in the metainfo collection.
+    Anything derived from the database (such as memoised similarity
+    scores) is keyed by this version, so that it is never reused
+    after the database is imported again.
+
+    Arguments:
+    - `germanet_db`: a pymongo.database.Database object
+    '''
+    if germanet_db.metainfo.count() == 0:
+        germanet_db.metainfo.insert({})
+    metainfo = germanet_db.metainfo.find_one()
+    metainfo['data_version'] = uuid.uuid4().hex
+    germanet_db.metainfo.save(metainfo)
+
+    print('Recorded data version {0}.'.format(metainfo['data_version']))
+
 
 # ------------------------------------------------------------
 #  Main function
@@ -662,9 +865,12 @@ def main():
     insert_lexical_information(germanet_db, lex_files)
     insert_relation_information(germanet_db, gn_rels_file)
     insert_paraphrase_information(germanet_db, wiktionary_files)
+    insert_ili_information(germanet_db, ili_files)
+    insert_gloss_index(germanet_db)
     insert_lemmatisation_data(germanet_db)
     insert_infocontent_data(germanet_db)
     compute_max_min_depth(germanet_db)
+    record_data_version(germanet_db)
 
     client.close()
 
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''
+scan.py
+(c) agent  18 October, 2026
+
+Batched, resumable scans over the synsets and lexunits collections.
+
+A scan reads its collection in order of ObjectId, one batch per
+query, so no cursor is held open between batches and a scan can never
+time out.  The ``position`` of a scan is the ObjectId (as a hex
+string) of the last entry it produced; passing it to a new scan
+resumes from the next entry.
+'''
+
+from builtins import dict
+
+DEFAULT_BATCH_SIZE = 1000
+
+# what a scan produces: Synset or Lemma objects, the raw MongoDB
+# records, or one dictionary of columns per batch
+SCAN_OUTPUTS = ['objects', 'records', 'columns']
+
+class CollectionScan(object):
+    '''
+    An iterator over the entries of a GermaNet collection which match
+    a query.
+    '''
+
+    def __init__(self, gnet, collection, query=None, fields=None,
+                 batch_size=DEFAULT_BATCH_SIZE, position=None,
+                 output='objects'):
+        '''
+        Constructor.
+
+        Arguments:
+        - `gnet`: a GermaNet object
+        - `collection`: 'synsets' or 'lexunits'
+        - `query`: a MongoDB query selecting the entries to scan
+        - `fields`: a list of the fields to read; only allowed for the
+          'records' and 'columns' outputs
+        - `batch_size`: the number of entries read per query
+        - `position`: the position of an earlier scan to resume from
+        - `output`: one of SCAN_OUTPUTS
+        '''
+        if output not in SCAN_OUTPUTS:
+            raise ValueError('unknown output {0!r}'.format(output))
+        if fields is not None and output == 'objects':
+            raise ValueError('fields can only be selected for records '
+                             'or columns')
+        if batch_size < 1:
+            raise ValueError('batch_size must be positive')
+        self._germanet   = gnet
+        self._collection = collection
+        self._query      = dict(query or {})
+        self._fields     = None if fields is None else list(fields)
+        self._batch_size = batch_size
+        self._output     = output
+        self._buffer     = []
+        self._exhausted  = False
+        # the ObjectId of the last entry read from the database
+        self._last_read  = None
+        if position is not None:
+            from bson.objectid import ObjectId
+            self._last_read = ObjectId(position)
+        self.position    = position
+
+    def __iter__(self):
+        return self
+
+    def _read_batch(self):
+        '''Reads the next batch of entries from the database.'''
+        query = dict(self._query)
+        if self._last_read is not None:
+            query['_id'] = {'$gt': self._last_read}
+        projection = None
+        if self._fields is not None:
+            projection = dict((field, 1) for field in self._fields)
+        batch = list(self._germanet._find(self._collection, query, projection,
+                                          sort=[('_id', 1)],
+                                          limit=self._batch_size))
+        if len(batch) < self._batch_size:
+            self._exhausted = True
+        if batch:
+            self._last_read = batch[-1]['_id']
+        return batch
+
+    def _columns(self, batch):
+        '''Turns a batch of records into a dictionary of columns.'''
+        if self._fields is not None:
+            names = ['_id'] + [field for field in self._fields
+                               if field != '_id']
+        else:
+            names = sorted(set(name for record in batch for name in record))
+        return dict((name, [record.get(name) for record in batch])
+                    for name in names)
+
+    def __next__(self):
+        if self._output == 'columns':
+            if self._exhausted:
+                raise StopIteration
+            batch = self._read_batch()
+            if not batch:
+                raise StopIteration
+            self.position = str(batch[-1]['_id'])
+            return self._columns(batch)
+        if not self._buffer:
+            if self._exhausted:
+                raise StopIteration
+            # reverse the batch so that entries can be popped in order
+            self._buffer = self._read_batch()[::-1]
+            if not self._buffer:
+                raise StopIteration
+        record        = self._buffer.pop()
+        self.position = str(record['_id'])
+        if self._output == 'records':
+            return record
+        return self._germanet._make_object(self._collection, record,
+                                           cache=False)
+
+    # Python 2
+    next = __next__
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''
+simcache.py
+(c) agent  18 October, 2026
+
+A persistent, size-bounded memo of pairwise semantic similarity
+scores, stored in an SQLite database.
+
+Scores are keyed by the unordered pair of GermaNet synset ids, the
+metric, and the data version of the GermaNet database (which changes
+every time the database is imported), so a memo file can be shared
+between processes and runs without ever returning stale scores.
+'''
+
+from __future__ import division
+import sqlite3
+import time
+
+DEFAULT_MAX_ENTRIES = 1000000
+
+# the number of buffered writes (new scores and last use times) which
+# are written to the database in one transaction
+COMMIT_INTERVAL = 1000
+
+# the fraction of the memo evicted when it grows too large
+EVICTION_FRACTION = 0.1
+
+class SimilarityMemo(object):
+    '''
+    An on-disk memo of similarity scores with least recently used
+    eviction.
+
+    Several processes can share one memo file.  Reads never take the
+    write lock: new scores and the last use times of memoised scores
+    are buffered, and written every COMMIT_INTERVAL writes in a short
+    transaction.
+    '''
+
+    def __init__(self, path, max_entries=DEFAULT_MAX_ENTRIES, timeout=60):
+        '''
+        Opens (or creates) a memo file.
+
+        Arguments:
+        - `path`: the filename of the SQLite database
+        - `max_entries`: the maximum number of scores to keep
+        - `timeout`: the number of seconds to wait for another process
+          to release the database lock
+        '''
+        self.path        = path
+        self.max_entries = max_entries
+        self.hits        = 0
+        self.misses      = 0
+        # scores and last use times not yet written to the database
+        self._new_scores = {}
+        self._last_used  = {}
+        self._conn       = sqlite3.connect(path, timeout=timeout)
+        # with write-ahead logging, readers do not block the writer
+        # and the writer does not block readers
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        with self._conn:
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS memo ('
+                'synset1 TEXT, synset2 TEXT, metric TEXT, '
+                'version TEXT, score REAL, last_used REAL, '
+                'PRIMARY KEY (synset1, synset2, metric, version))')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS memo_last_used '
+                               'ON memo (last_used)')
+        self._size = self._count()
+
+    def __len__(self):
+        '''
+        Returns the number of scores in the memo, counting buffered
+        scores which have not been written yet.
+        '''
+        return self._size + len(self._new_scores)
+
+    def _count(self):
+        '''Counts the scores stored in the database.'''
+        return self._conn.execute('SELECT COUNT(*) FROM memo').fetchone()[0]
+
+    @staticmethod
+    def _key(synset1, synset2, metric, version):
+        '''Builds the primary key for an unordered pair of synset ids.'''
+        if synset2 < synset1:
+            synset1, synset2 = synset2, synset1
+        return (synset1, synset2, metric, version)
+
+    def get(self, synset1, synset2, metric, version):
+        '''
+        Returns the memoised score of a pair of synsets, or None.
+
+        Arguments:
+        - `synset1`: a GermaNet synset id, such as 's12345'
+        - `synset2`: a GermaNet synset id
+        - `metric`: the name of the metric
+        - `version`: the data version of the GermaNet database
+        '''
+        key   = self._key(synset1, synset2, metric, version)
+        score = self._new_scores.get(key)
+        if score is None:
+            row = self._conn.execute(
+                'SELECT score FROM memo WHERE synset1 = ? AND synset2 = ? '
+                'AND metric = ? AND version = ?', key).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            score = row[0]
+        self.hits += 1
+        self._last_used[key] = time.time()
+        self._wrote()
+        return score
+
+    def put(self, synset1, synset2, metric, version, score):
+        '''
+        Stores the score of a pair of synsets.
+
+        Arguments:
+        - `synset1`: a GermaNet synset id, such as 's12345'
+        - `synset2`: a GermaNet synset id
+        - `metric`: the name of the metric
+        - `version`: the data version of the GermaNet database
+        - `score`: the score
+        '''
+        key = self._key(synset1, synset2, metric, version)
+        self._new_scores[key] = score
+        self._last_used.pop(key, None)
+        self._wrote()
+
+    def _evict(self):
+        '''Deletes the least recently used part of the memo.'''
+        num_evicted = (self._size - self.max_entries +
+                       max(1, int(self.max_entries * EVICTION_FRACTION)))
+        with self._conn:
+            self._conn.execute(
+                'DELETE FROM memo WHERE rowid IN (SELECT rowid FROM memo '
+                'ORDER BY last_used LIMIT ?)', (num_evicted,))
+        self._size = self._count()
+
+    def _wrote(self):
+        '''Writes the buffers after every COMMIT_INTERVAL writes.'''
+        if COMMIT_INTERVAL <= len(self._new_scores) + len(self._last_used):
+            self.flush()
+
+    def flush(self):
+        '''Writes all buffered scores and last use times to disk.'''
+        if not self._new_scores and not self._last_used:
+            return
+        now = time.time()
+        with self._conn:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO memo VALUES (?, ?, ?, ?, ?, ?)',
+                [key + (score, now) for (key, score) in
+                 self._new_scores.items()])
+            self._conn.executemany(
+                'UPDATE memo SET last_used = ? WHERE synset1 = ? AND '
+                'synset2 = ? AND metric = ? AND version = ?',
+                [(last_used,) + key for (key, last_used) in
+                 self._last_used.items()])
+        self._new_scores = {}
+        self._last_used  = {}
+        # other processes may have added scores, too
+        self._size = self._count()
+        if self.max_entries < self._size:
+            self._evict()
+
+    def close(self):
+        '''Writes all buffered scores and closes the memo file.'''
+        self.flush()
+        self._conn.close()
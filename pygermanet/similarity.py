@@ -0,0 +1,321 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''
+similarity.py
+(c) agent  18 October, 2026
+
+Top-k and threshold similarity search over the GermaNet hypernym
+hierarchy.
+
+Scores are computed exactly as by the ``Synset.sim_lch``,
+``Synset.sim_res``, ``Synset.sim_lin`` and ``Synset.dist_jcn``
+methods, but on the in-memory TaxonomyIndex, and most candidates are
+never scored at all.  For the information content measures, the
+hypernyms of the query synset are visited best bound first: every
+synset not yet scored which lies below a hypernym ``A`` has a
+Resnik score of at most IC(A), and an information content of at
+least the smallest information content below ``A``.  The search stops
+as soon as no remaining hypernym can beat the current k-th score.
+For Leacock-Chodorow, candidates are visited in order of path length.
+'''
+
+from __future__ import division
+from builtins import dict, range
+import math
+
+METRICS = ['lch', 'res', 'jcn', 'lin']
+
+# the metrics which measure a distance (lower is more similar)
+DISTANCE_METRICS = set(['jcn'])
+
+def information_content(prob):
+    '''
+    Returns the information content of a synset from its probability,
+    or None if the probability is zero (unknown).
+
+    Arguments:
+    - `prob`: the ``infocont`` value of a synset
+    '''
+    if prob == 0:
+        return None
+    return -math.log(prob)
+
+class SimilaritySearch(object):
+    '''
+    Finds the synsets most similar to a given synset.
+    '''
+
+    def __init__(self, taxonomy, max_min_depths):
+        '''
+        Creates a new SimilaritySearch object.
+
+        Arguments:
+        - `taxonomy`: a TaxonomyIndex object
+        - `max_min_depths`: a dictionary mapping each category to the
+          maximum ``min_depth`` of its synsets (as used by
+          ``Synset.sim_lch``)
+        '''
+        self.taxonomy       = taxonomy
+        self.max_min_depths = max_min_depths
+        self._min_below     = None
+
+    def _min_ic_below(self):
+        '''
+        Returns a list giving, for every node, the smallest nonzero
+        information content of the node and its (transitive)
+        hyponyms, or None if they all have zero probability.
+        '''
+        if self._min_below is None:
+            taxonomy   = self.taxonomy
+            min_below  = [information_content(prob)
+                          for prob in taxonomy.infocont]
+            for node in taxonomy.bottom_up():
+                for child in taxonomy.children[node]:
+                    if min_below[child] is not None and (
+                            min_below[node] is None or
+                            min_below[child] < min_below[node]):
+                        min_below[node] = min_below[child]
+            self._min_below = min_below
+        return self._min_below
+
+    def _res(self, node_dists, other):
+        '''
+        Computes the Resnik score between the node whose hypernym
+        distances are given and the node ``other``, using the nearest
+        common hypernyms, as ``Synset.sim_res`` does.
+        '''
+        taxonomy = self.taxonomy
+        best     = None
+        probs    = []
+        for (hyper, dist) in taxonomy.hypernym_distances(other).items():
+            if hyper in node_dists:
+                total = dist + node_dists[hyper]
+                if best is None or total < best:
+                    best  = total
+                    probs = [taxonomy.infocont[hyper]]
+                elif total == best:
+                    probs.append(taxonomy.infocont[hyper])
+        probs = [prob for prob in probs if prob != 0]
+        if not probs:
+            return 0.
+        return -math.log(min(probs))
+
+    def score(self, metric, node, other, node_dists=None):
+        '''
+        Computes the similarity score (or, for 'jcn', the distance)
+        between two nodes, exactly as the Synset methods do.  Returns
+        None if the pair would never be reported by ``search``.
+
+        Arguments:
+        - `metric`: one of METRICS
+        - `node`: a node number
+        - `other`: a node number
+        - `node_dists`: the hypernym distances of ``node``, if already
+          computed
+        '''
+        taxonomy = self.taxonomy
+        if node_dists is None:
+            node_dists = taxonomy.hypernym_distances(node)
+        if metric == 'lch':
+            category = taxonomy.category[node]
+            if category != taxonomy.category[other]:
+                return None
+            other_dists = taxonomy.hypernym_distances(other)
+            lengths     = [dist + node_dists[hyper] for (hyper, dist) in
+                           other_dists.items() if hyper in node_dists]
+            if not lengths:
+                return None
+            return self._lch(category, min(lengths)) or None
+        res = self._res(node_dists, other)
+        if metric == 'res':
+            return res or None
+        ic1 = taxonomy.infocont[node]
+        ic2 = taxonomy.infocont[other]
+        if ic1 == 0 or ic2 == 0:
+            return None
+        ic1 = -math.log(ic1)
+        ic2 = -math.log(ic2)
+        if metric == 'jcn':
+            return ic1 + ic2 - 2. * res
+        return (2. * res / (ic1 + ic2)) or None
+
+    def _lch(self, category, path_length):
+        '''Computes the Leacock-Chodorow score for a path length.'''
+        return -math.log((path_length + 1) /
+                         (2. * self.max_min_depths[category]))
+
+    def search(self, metric, node, k=10, category=None, threshold=None):
+        '''
+        Finds the nodes most similar to the given node.  Returns a
+        list of (score, node) tuples, best first, with ties broken by
+        ObjectId.  Pairs for which the Synset method returns 0 (or,
+        for 'jcn', where either synset has no information content)
+        are not reported.
+
+        Arguments:
+        - `metric`: one of METRICS
+        - `node`: a node number
+        - `k`: the maximum number of results, or None for no limit
+        - `category`: if given, only report nodes in this category
+        - `threshold`: if given, only report scores at least this
+          large (for 'jcn', distances at most this large)
+        '''
+        if metric not in METRICS:
+            raise ValueError('unknown metric {0!r}'.format(metric))
+        if k is None and threshold is None:
+            raise ValueError('one of k and threshold must be given')
+        results = _Results(self.taxonomy, metric, k, threshold)
+        if metric == 'lch':
+            self._search_lch(node, category, results)
+        else:
+            self._search_ic(metric, node, category, results)
+        return results.best()
+
+    def _search_lch(self, node, category, results):
+        '''Helper method for search.'''
+        taxonomy = self.taxonomy
+        if category is not None and category != taxonomy.category[node]:
+            return
+        category   = taxonomy.category[node]
+        node_dists = taxonomy.hypernym_distances(node)
+        # a multi-source breadth-first search down the hierarchy from
+        # every hypernym, each starting at its own distance, finds the
+        # candidates in order of their shortest path length
+        seeds     = dict()
+        for (hyper, dist) in node_dists.items():
+            seeds.setdefault(dist, []).append(hyper)
+        visited   = set()
+        frontier  = []
+        length    = 0
+        while frontier or length <= max(seeds):
+            level = [hyper for hyper in seeds.get(length, [])
+                     if hyper not in visited]
+            visited.update(level)
+            for current in frontier:
+                for child in taxonomy.children[current]:
+                    if child not in visited:
+                        visited.add(child)
+                        level.append(child)
+            score = self._lch(category, length)
+            if not results.can_accept(score):
+                break
+            for other in level:
+                if (other != node and taxonomy.category[other] == category
+                        and score != 0):
+                    results.add(score, other)
+            if results.full():
+                break
+            frontier = level
+            length  += 1
+
+    def _search_ic(self, metric, node, category, results):
+        '''Helper method for search.'''
+        taxonomy   = self.taxonomy
+        node_ic    = information_content(taxonomy.infocont[node])
+        if metric != 'res' and node_ic is None:
+            return
+        node_dists = taxonomy.hypernym_distances(node)
+        min_below  = self._min_ic_below()
+        # an upper bound on the score of any candidate below each
+        # hypernym with a nonzero probability
+        bounds     = []
+        for hyper in node_dists:
+            hyper_ic = information_content(taxonomy.infocont[hyper])
+            if hyper_ic is None:
+                continue
+            if metric == 'res':
+                bound = hyper_ic
+            elif min_below[hyper] is None:
+                continue
+            elif metric == 'lin':
+                total = node_ic + min_below[hyper]
+                bound = 2. * hyper_ic / total if total else 0.
+            else:
+                bound = node_ic + min_below[hyper] - 2. * hyper_ic
+            bounds.append((bound, hyper))
+        bounds.sort(key=lambda pair: pair[0],
+                    reverse=metric not in DISTANCE_METRICS)
+        seen = set([node])
+        for (bound, hyper) in bounds:
+            if not results.can_accept(bound):
+                break
+            for other in [hyper] + taxonomy.descendants(hyper):
+                if other not in seen:
+                    seen.add(other)
+                    self._consider(metric, node, other, node_dists,
+                                   category, results)
+        else:
+            if metric != 'jcn':
+                return
+            # the remaining synsets share no hypernym with a nonzero
+            # probability, so their distance is the sum of the two
+            # information contents
+            lowest = min(ic for ic in min_below if ic is not None)
+            if not results.can_accept(node_ic + lowest):
+                return
+            for other in range(len(taxonomy.ids)):
+                if other not in seen:
+                    self._consider(metric, node, other, node_dists,
+                                   category, results)
+
+    def _consider(self, metric, node, other, node_dists, category, results):
+        '''Scores one candidate node and records it.'''
+        if category is not None and self.taxonomy.category[other] != category:
+            return
+        score = self.score(metric, node, other, node_dists)
+        if score is not None:
+            results.add(score, other)
+
+class _Results(object):
+    '''
+    The best (score, node) pairs found so far in a similarity search.
+    '''
+
+    def __init__(self, taxonomy, metric, k, threshold):
+        self.taxonomy  = taxonomy
+        self.distance  = metric in DISTANCE_METRICS
+        self.k         = k
+        self.threshold = threshold
+        self.pairs     = []
+        # the k-th best score, once k results have been found
+        self.kth       = None
+
+    def _better(self, score1, score2):
+        '''Returns True if ``score1`` is strictly better than ``score2``.'''
+        return score1 < score2 if self.distance else score2 < score1
+
+    def can_accept(self, bound):
+        '''
+        Returns True if a candidate with a score as good as ``bound``
+        could still be reported.
+        '''
+        if self.threshold is not None and \
+                self._better(self.threshold, bound):
+            return False
+        return self.kth is None or not self._better(self.kth, bound)
+
+    def full(self):
+        '''Returns True once k results have been found.'''
+        return self.kth is not None
+
+    def add(self, score, node):
+        '''Records a candidate.'''
+        if not self.can_accept(score):
+            return
+        self.pairs.append((score, node))
+        if self.k is not None and (len(self.pairs) == self.k or
+                                   2 * self.k <= len(self.pairs)):
+            self.pairs = self.best()
+
+    def best(self):
+        '''Returns the best results, best first.'''
+        ids  = self.taxonomy.ids
+        sign = 1 if self.distance else -1
+        best = sorted(self.pairs,
+                      key=lambda pair: (sign * pair[0], ids[pair[1]]))
+        if self.k is not None:
+            best = best[:self.k]
+            if len(best) == self.k:
+                self.kth = best[-1][0]
+        return best
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''
+sparse.py
+(c) agent  18 October, 2026
+
+Export of the GermaNet synset graph as SciPy sparse matrices and
+NumPy arrays, for vectorised graph algorithms.
+
+NumPy and SciPy are optional dependencies of pygermanet; they are only
+needed by this module.
+'''
+
+from array import array
+from builtins import dict, range
+try:
+    import numpy
+    import scipy.sparse
+    HAVE_SCIPY = True
+except ImportError:
+    HAVE_SCIPY = False
+
+class SparseGraph(object):
+    '''
+    The GermaNet synset graph as one sparse adjacency matrix per
+    relation, with arrays describing the synsets aligned to the rows
+    and columns of the matrices.
+
+    Attributes:
+    - `matrices`: a dictionary mapping relation names to
+      scipy.sparse.csr_matrix objects; entry (i, j) is 1 if synset i
+      has the relation to synset j
+    - `ids`: an array of GermaNet synset ids (such as 's12345')
+    - `object_ids`: a list of the MongoDB ObjectIds of the synsets
+    - `categories`: an array of synset categories (such as 'nomen')
+    - `infocont`: an array of synset probabilities, as in
+      ``Synset.infocont``
+    - `depths`: an array of the minimum depths of the synsets, as in
+      ``Synset.min_depth`` (-1 if a synset is not below a root)
+    - `index`: a dictionary mapping GermaNet synset ids to row numbers
+    '''
+
+    def __init__(self, records, relations=None):
+        '''
+        Builds the matrices and arrays.
+
+        Arguments:
+        - `records`: an iterable of synset dictionaries from MongoDB,
+          with at least the fields _id, id, category, infocont and
+          rels
+        - `relations`: a list of relation names to build matrices for;
+          defaults to all relations found in the records
+        '''
+        if not HAVE_SCIPY:
+            raise ImportError('SparseGraph requires numpy and scipy')
+        ids        = []
+        object_ids = []
+        categories = []
+        infocont   = array('d')
+        rels       = []
+        row_nums   = dict()
+        for synset_dict in records:
+            row_nums[synset_dict['_id']] = len(ids)
+            ids.append(synset_dict.get('id'))
+            object_ids.append(synset_dict['_id'])
+            categories.append(synset_dict.get('category'))
+            infocont.append(synset_dict.get('infocont', 0.))
+            rels.append(synset_dict.get('rels', []))
+        wanted = None if relations is None else set(relations)
+        # (row, column) arrays for each relation
+        coords = dict((name, (array('l'), array('l')))
+                      for name in (relations or []))
+        for (row, synset_rels) in enumerate(rels):
+            for (name, mongo_id) in synset_rels:
+                if wanted is not None and name not in wanted:
+                    continue
+                if mongo_id not in row_nums:
+                    continue
+                if name not in coords:
+                    coords[name] = (array('l'), array('l'))
+                coords[name][0].append(row)
+                coords[name][1].append(row_nums[mongo_id])
+        num_rows        = len(ids)
+        self.matrices   = dict(
+            (name, scipy.sparse.csr_matrix(
+                (numpy.ones(len(rows), dtype=numpy.int8),
+                 (numpy.frombuffer(rows, dtype=numpy.dtype(rows.typecode)),
+                  numpy.frombuffer(cols, dtype=numpy.dtype(cols.typecode)))),
+                shape=(num_rows, num_rows)))
+            for (name, (rows, cols)) in coords.items())
+        self.ids        = numpy.array(ids)
+        self.object_ids = object_ids
+        self.categories = numpy.array(categories)
+        self.infocont   = numpy.frombuffer(infocont, dtype=numpy.float64)
+        self.depths     = self._min_depths(rels, row_nums)
+        self.index      = dict((synset_id, row)
+                               for (row, synset_id) in enumerate(ids))
+
+    @staticmethod
+    def _min_depths(rels, row_nums):
+        '''
+        Computes the minimum depth of every synset, by breadth-first
+        search down the hierarchy from the root synsets.
+        '''
+        num_rows  = len(rels)
+        hyponyms  = [[] for _idx in range(num_rows)]
+        is_root   = [True] * num_rows
+        for (row, synset_rels) in enumerate(rels):
+            for (name, mongo_id) in synset_rels:
+                if name == 'has_hypernym' and mongo_id in row_nums:
+                    hyponyms[row_nums[mongo_id]].append(row)
+                    is_root[row] = False
+        depths   = [-1] * num_rows
+        frontier = [row for row in range(num_rows) if is_root[row]]
+        for row in frontier:
+            depths[row] = 1
+        while frontier:
+            next_frontier = []
+            for row in frontier:
+                for hyponym in hyponyms[row]:
+                    if depths[hyponym] < 0:
+                        depths[hyponym] = depths[row] + 1
+                        next_frontier.append(hyponym)
+            frontier = next_frontier
+        return numpy.array(depths, dtype=numpy.int32)
@@ -0,0 +1,548 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''
+synthetic.py
+(c) agent  18 October, 2026
+
+A script to generate synthetic GermaNet XML files.
+
+GermaNet is licensed, so it cannot be used in continuous integration
+or benchmarking environments.  This module writes a random lexicon
+in the same layout as the real GermaNet XML distribution, so that
+``mongo_import`` and the ``GermaNet`` query interface can be
+exercised at arbitrary scale.
+'''
+
+from __future__ import absolute_import, division, print_function
+from builtins import dict, int, range, str
+from io import open
+from xml.sax.saxutils import escape, quoteattr
+import optparse
+import os
+import random
+import sys
+
+# the number of synsets generated at scale 1; this is roughly the
+# size of recent GermaNet releases
+DEFAULT_NUM_SYNSETS = 110000
+
+# proportion of synsets generated for each part of speech
+CATEGORY_SHARES = [
+    ('nomen',  0.75),
+    ('verben', 0.15),
+    ('adj',    0.10),
+    ]
+
+# semantic fields (the synset ``class`` attribute); each field gets
+# its own lexical file, as in the GermaNet distribution
+SEMANTIC_CLASSES = {
+    'nomen':  ['Artefakt', 'Attribut', 'Besitz', 'Geschehen', 'Gruppe',
+               'Kognition', 'Koerper', 'Kommunikation', 'Menschen',
+               'Motiv', 'natGegenstand', 'natPhaenomen', 'Nahrung',
+               'Ort', 'Pflanze', 'Relation', 'Substanz', 'Tier', 'Zeit'],
+    'verben': ['Allgemein', 'Besitz', 'Gefuehl', 'Gesellschaft',
+               'Koerperfunktion', 'Kognition', 'Kommunikation',
+               'Konkurrenz', 'Kontakt', 'Lokation', 'Natur',
+               'Schoepfung', 'Veraenderung', 'Wahrnehmung'],
+    'adj':    ['Allgemein', 'Bewegung', 'Gefuehl', 'Geist', 'Gesellschaft',
+               'Koerper', 'Menge', 'natPhaenomen', 'Ort', 'Pertonym',
+               'Perzeption', 'Privativ', 'Relation', 'Substanz', 'Verhalten',
+               'Zeit'],
+    }
+
+ROOT_FORMS = {
+    'nomen':  u'GNROOT',
+    'verben': u'sein',
+    'adj':    u'beschaffen',
+    }
+
+# building blocks for pseudo-German words; the umlauts and sharp s
+# are there so that spelling normalisation has something to do
+SYLLABLES = [u'ab', u'an', u'ba', u'bär', u'be', u'bi', u'bö', u'da',
+             u'del', u'der', u'do', u'eis', u'fa', u'fe', u'fü', u'ga',
+             u'gel', u'go', u'hau', u'he', u'hü', u'ka', u'ken', u'kä',
+             u'la', u'le', u'lu', u'lö', u'ma', u'mel', u'mü', u'na',
+             u'ne', u'no', u'pa', u'pe', u'ra', u're', u'ro', u'rü',
+             u'sa', u'schu', u'se', u'spa', u'ss', u'sta', u'stra',
+             u'ta', u'te', u'to', u'tür', u'ul', u'va', u'wa', u'wei',
+             u'wi', u'zu', u'zel', u'zä', u'uße', u'ün']
+
+VERB_SUFFIX = u'en'
+ADJ_SUFFIX  = u'ig'
+
+# a multiplier coprime to len(SYLLABLES), used to scatter word
+# numbers over the space of syllable sequences
+WORD_SCATTER = 2654435761
+
+GLOSS_WORDS = [u'ein', u'eine', u'der', u'die', u'das', u'mit', u'von',
+               u'für', u'oder', u'und', u'zum', u'aus', u'besonders',
+               u'meist', u'kleiner', u'großer', u'alter', u'Art']
+
+VERB_FRAMES = [u'NN', u'NN.AN', u'NN.DN', u'NN.AN.DN', u'NN.BL', u'NN.PP',
+               u'NN.AR', u'NN.Az', u'NN.FSd']
+
+# (name, dir, inv) for the conceptual relations generated besides
+# hypernymy
+CON_RELATIONS = {
+    'nomen':  [('has_component_meronym', 'revert', 'has_component_holonym'),
+               ('has_member_meronym',    'revert', 'has_member_holonym'),
+               ('has_substance_meronym', 'revert', 'has_substance_holonym'),
+               ('has_portion_meronym',   'revert', 'has_portion_holonym'),
+               ('is_related_to',         'both',   'is_related_to')],
+    'verben': [('entails',               'revert', 'is_entailed_by'),
+               ('causes',                'one',    None),
+               ('is_related_to',         'both',   'is_related_to')],
+    'adj':    [('is_related_to',         'both',   'is_related_to')],
+    }
+
+# the share of lexical units with an interlingual index record, and
+# the cumulative probabilities of the ILI relations
+ILI_SHARE     = 0.3
+ILI_RELATIONS = [(0.7,  'synonym'),
+                 (0.85, 'near_synonym'),
+                 (0.95, 'has_hypernym'),
+                 (1.,   'has_hyponym')]
+
+# the WordNet part of speech letter for each category
+WORDNET_POS = {'nomen': u'n', 'verben': u'v', 'adj': u'a'}
+
+
+# ------------------------------------------------------------
+#  Words
+# ------------------------------------------------------------
+
+class WordGenerator(object):
+    '''
+    Generates unique pseudo-German word forms from integer word
+    numbers.
+    '''
+
+    def __init__(self, num_words):
+        '''
+        Creates a new WordGenerator.
+
+        Arguments:
+        - `num_words`: the number of distinct word forms which will be
+          requested
+        '''
+        self.num_syllables = 3
+        while len(SYLLABLES) ** self.num_syllables < num_words:
+            self.num_syllables += 1
+        self.space = len(SYLLABLES) ** self.num_syllables
+
+    def word(self, word_num):
+        '''
+        Returns the word form for the given word number.  Different
+        word numbers below the ``num_words`` given to the constructor
+        always produce different word forms.
+
+        Arguments:
+        - `word_num`: a non-negative integer
+        '''
+        code   = (word_num * WORD_SCATTER) % self.space
+        sylls  = []
+        for _idx in range(self.num_syllables):
+            code, digit = divmod(code, len(SYLLABLES))
+            sylls.append(SYLLABLES[digit])
+        return u''.join(sylls)
+
+    def form(self, word_num, category):
+        '''
+        Returns the orthographic form of the given word number as a
+        lemma of the given part of speech.
+
+        Arguments:
+        - `word_num`: a non-negative integer
+        - `category`: 'nomen', 'verben' or 'adj'
+        '''
+        word = self.word(word_num)
+        if category == 'nomen':
+            return word[0].upper() + word[1:]
+        elif category == 'verben':
+            return word + VERB_SUFFIX
+        return word + ADJ_SUFFIX
+
+
+# ------------------------------------------------------------
+#  Hierarchy
+# ------------------------------------------------------------
+
+def build_hierarchy(rng, num_synsets, branching_factor, max_depth,
+                    multiple_inheritance):
+    '''
+    Builds a random hypernym hierarchy.  Synset 0 is the root node.
+    Returns a tuple (parents, depths), where ``parents[i]`` is the list
+    of hypernyms of synset ``i`` and ``depths[i]`` is its depth in the
+    spanning tree made of each synset's first hypernym.
+
+    Every hypernym has a smaller spanning tree depth than its
+    hyponym, so the hierarchy is guaranteed to be acyclic.
+
+    Arguments:
+    - `rng`: a random.Random object
+    - `num_synsets`: the number of synsets in the hierarchy
+    - `branching_factor`: the mean number of hyponyms per synset
+    - `max_depth`: the maximum depth of the hierarchy
+    - `multiple_inheritance`: the probability that a synset has a
+      second hypernym
+    '''
+    parents  = [[]]
+    depths   = [0]
+    frontier = [0]
+    max_kids = max(1, int(round(2 * branching_factor)) - 1)
+    while len(parents) < num_synsets:
+        if not frontier:
+            # the depth limit has been reached; hang the remaining
+            # synsets off random inner nodes
+            frontier = [rng.randrange(len(parents))
+                        for _idx in range(num_synsets - len(parents))]
+            frontier = [idx for idx in frontier if depths[idx] < max_depth]
+            if not frontier:
+                frontier = [0]
+        next_frontier = []
+        for parent in frontier:
+            if depths[parent] >= max_depth:
+                continue
+            for _idx in range(rng.randint(1, max_kids)):
+                if len(parents) >= num_synsets:
+                    break
+                parents.append([parent])
+                depths.append(depths[parent] + 1)
+                next_frontier.append(len(parents) - 1)
+        frontier = next_frontier
+    for idx in range(2, num_synsets):
+        if rng.random() < multiple_inheritance:
+            # any synset with smaller depth is a safe second hypernym
+            other = rng.randrange(idx)
+            if depths[other] < depths[idx] and other not in parents[idx]:
+                parents[idx].append(other)
+    return parents, depths
+
+
+# ------------------------------------------------------------
+#  XML output
+# ------------------------------------------------------------
+
+def _attrs(items):
+    '''Formats a list of (name, value) pairs as XML attributes.'''
+    return u''.join(u' {0}={1}'.format(name, quoteattr(str(value)))
+                    for (name, value) in items)
+
+def _yesno(value):
+    '''Formats a boolean as GermaNet does.'''
+    return u'yes' if value else u'no'
+
+def _gloss(rng, words, category, length):
+    '''Produces a random text made of function words and lemmas.'''
+    tokens = []
+    for _idx in range(length):
+        if rng.random() < 0.5:
+            tokens.append(rng.choice(GLOSS_WORDS))
+        else:
+            tokens.append(words.form(rng.randrange(words.space // 16 or 1),
+                                     category))
+    return u' '.join(tokens)
+
+def generate_germanet_xml(output_path,
+                          num_synsets=DEFAULT_NUM_SYNSETS,
+                          branching_factor=4.,
+                          multiple_inheritance=0.02,
+                          max_depth=18,
+                          lexunits_per_synset=1.4,
+                          polysemy=0.15,
+                          seed=0):
+    '''
+    Writes a synthetic GermaNet lexicon as XML files into the given
+    directory: one ``nomen.*.xml``, ``verben.*.xml`` or ``adj.*.xml``
+    file per semantic class, ``gn_relations.xml``, one
+    ``wiktionaryParaphrases-*.xml`` file per part of speech, and
+    ``interLingualIndex_DE-EN.xml``.  Returns a dictionary with counts
+    of the generated entities.
+
+    Arguments:
+    - `output_path`: the directory to write the files into; it is
+      created if it does not exist
+    - `num_synsets`: the total number of synsets to generate
+    - `branching_factor`: the mean number of hyponyms per synset
+    - `multiple_inheritance`: the probability that a synset has a
+      second hypernym
+    - `max_depth`: the maximum depth of each hypernym hierarchy
+    - `lexunits_per_synset`: the mean number of lexical units per
+      synset
+    - `polysemy`: the probability that a lexical unit reuses the
+      orthographic form of an earlier lexical unit
+    - `seed`: the random seed; the same arguments and seed always
+      produce the same files
+    '''
+    if not os.path.isdir(output_path):
+        os.makedirs(output_path)
+    rng          = random.Random(seed)
+    words        = WordGenerator(int(num_synsets * lexunits_per_synset) + 1)
+    next_word    = [0]
+    stats        = dict(synsets=0, lexunits=0, con_rels=0, lex_rels=0,
+                        paraphrases=0, ili_records=0, files=0)
+    con_rels     = []
+    lex_rels     = []
+    synset_base  = 0
+    lexunit_num  = 0
+    # sense counts of reused and compound orthographic forms
+    senses       = {}
+    # (lexunit id, category, form) of every lexical unit, for the
+    # interlingual index
+    ili_lexunits = []
+
+    def new_form(category, recent_forms):
+        '''Picks an orthographic form, compound modifier and sense.'''
+        if recent_forms and rng.random() < polysemy:
+            form = rng.choice(recent_forms)
+            senses[form, category] = senses.get((form, category), 1) + 1
+            return form, None, senses[form, category]
+        elif category == 'nomen' and recent_forms and rng.random() < 0.3:
+            modifier = words.form(next_word[0], 'nomen')
+            next_word[0] += 1
+            form = modifier + rng.choice(recent_forms).lower()
+            senses[form, category] = senses.get((form, category), 0) + 1
+            return form, modifier, senses[form, category]
+        form = words.form(next_word[0], category)
+        next_word[0] += 1
+        return form, None, 1
+
+    for (category, share) in CATEGORY_SHARES:
+        cat_synsets = max(2, int(num_synsets * share))
+        parents, depths = build_hierarchy(rng, cat_synsets, branching_factor,
+                                          max_depth, multiple_inheritance)
+        classes     = SEMANTIC_CLASSES[category]
+        # each subtree near the root belongs to one semantic class
+        synset_cls  = [0] * cat_synsets
+        for idx in range(1, cat_synsets):
+            if depths[idx] <= 2:
+                synset_cls[idx] = rng.randrange(len(classes))
+            else:
+                synset_cls[idx] = synset_cls[parents[idx][0]]
+        lex_handles = []
+        for cls in classes:
+            filename = os.path.join(output_path,
+                                    u'{0}.{1}.xml'.format(category, cls))
+            handle   = open(filename, 'w', encoding='utf-8')
+            handle.write(u'<?xml version="1.0" encoding="UTF-8"?>\n'
+                         u'<synsets>\n')
+            lex_handles.append(handle)
+            stats['files'] += 1
+        wikt_handle = open(os.path.join(
+            output_path, u'wiktionaryParaphrases-{0}.xml'.format(category)),
+                           'w', encoding='utf-8')
+        wikt_handle.write(u'<?xml version="1.0" encoding="UTF-8"?>\n'
+                          u'<wiktionaryParaphrases>\n')
+        stats['files'] += 1
+
+        recent_forms = []
+        first_lexunit = lexunit_num
+        for idx in range(cat_synsets):
+            synset_id = u's{0}'.format(synset_base + idx + 1)
+            lines     = [u'  <synset{0}>'.format(_attrs([
+                ('id', synset_id), ('category', category),
+                ('class', classes[synset_cls[idx]])]))]
+            num_lex   = 1
+            while rng.random() < (lexunits_per_synset - 1.) / num_lex:
+                num_lex += 1
+            for lex_idx in range(num_lex):
+                lexunit_num += 1
+                lexunit_id   = u'l{0}'.format(lexunit_num)
+                if idx == 0 and lex_idx == 0:
+                    form, modifier, sense = ROOT_FORMS[category], None, 1
+                else:
+                    form, modifier, sense = new_form(category, recent_forms)
+                    if len(recent_forms) < 1000:
+                        recent_forms.append(form)
+                    else:
+                        recent_forms[rng.randrange(1000)] = form
+                lines.append(u'    <lexUnit{0}>'.format(_attrs([
+                    ('id', lexunit_id), ('sense', sense), ('source', 'core'),
+                    ('namedEntity', _yesno(rng.random() < 0.02)),
+                    ('artificial', _yesno(idx == 0)),
+                    ('styleMarking', _yesno(rng.random() < 0.05))])))
+                lines.append(u'      <orthForm>{0}</orthForm>'.format(
+                    escape(form)))
+                ili_lexunits.append((lexunit_id, category, form))
+                if rng.random() < 0.03:
+                    lines.append(u'      <orthVar>{0}</orthVar>'.format(
+                        escape(form + form[-1])))
+                if u'ss' in form and rng.random() < 0.5:
+                    lines.append(u'      <oldOrthForm>{0}</oldOrthForm>'.format(
+                        escape(form.replace(u'ss', u'ß'))))
+                if category == 'verben':
+                    frames = rng.sample(VERB_FRAMES, rng.randint(1, 3))
+                    for frame in frames:
+                        lines.append(u'      <frame>{0}</frame>'.format(frame))
+                if rng.random() < 0.3:
+                    lines.append(u'      <example>')
+                    lines.append(u'        <text>{0}</text>'.format(
+                        escape(form + u' ' +
+                               _gloss(rng, words, category, 6))))
+                    if category == 'verben':
+                        lines.append(u'        <exframe>{0}</exframe>'.format(
+                            frames[0]))
+                    lines.append(u'      </example>')
+                if modifier is not None:
+                    lines.append(u'      <compound>')
+                    lines.append(u'        <modifier{0}>{1}</modifier>'.format(
+                        _attrs([('category', 'Nomen')]), escape(modifier)))
+                    lines.append(u'        <head>{0}</head>'.format(
+                        escape(form[len(modifier):].capitalize())))
+                    lines.append(u'      </compound>')
+                lines.append(u'    </lexUnit>')
+                stats['lexunits'] += 1
+                if rng.random() < 0.2:
+                    stats['paraphrases'] += 1
+                    wikt_handle.write(
+                        u'  <wiktionaryParaphrase{0}/>\n'.format(_attrs([
+                            ('lexUnitId', lexunit_id),
+                            ('wiktionaryId', u'w{0}'.format(lexunit_num)),
+                            ('wiktionarySenseId', 1),
+                            ('wiktionarySense',
+                             _gloss(rng, words, category, 10)),
+                            ('edited', _yesno(rng.random() < 0.5))])))
+                if (category == 'adj' and lexunit_num - first_lexunit > 1 and
+                        rng.random() < 0.05):
+                    other = rng.randrange(first_lexunit + 1, lexunit_num)
+                    lex_rels.append(('has_antonym', lexunit_id,
+                                     u'l{0}'.format(other), 'both',
+                                     'has_antonym'))
+            if rng.random() < 0.2:
+                lines.append(u'    <paraphrase>{0}</paraphrase>'.format(
+                    escape(_gloss(rng, words, category, 8))))
+            lines.append(u'  </synset>\n')
+            lex_handles[synset_cls[idx]].write(u'\n'.join(lines))
+            stats['synsets'] += 1
+            for parent in parents[idx]:
+                con_rels.append(('has_hypernym', synset_id,
+                                 u's{0}'.format(synset_base + parent + 1),
+                                 'revert', 'has_hyponym'))
+            if idx > 1 and rng.random() < 0.05:
+                name, direction, inv = rng.choice(CON_RELATIONS[category])
+                other = rng.randrange(1, idx)
+                con_rels.append((name, synset_id,
+                                 u's{0}'.format(synset_base + other + 1),
+                                 direction, inv))
+
+        for handle in lex_handles:
+            handle.write(u'</synsets>\n')
+            handle.close()
+        wikt_handle.write(u'</wiktionaryParaphrases>\n')
+        wikt_handle.close()
+        synset_base += cat_synsets
+
+    with open(os.path.join(output_path, u'gn_relations.xml'), 'w',
+              encoding='utf-8') as output_file:
+        output_file.write(u'<?xml version="1.0" encoding="UTF-8"?>\n'
+                          u'<relations>\n')
+        for (name, from_id, to_id, direction, inv) in lex_rels:
+            attrs = [('name', name), ('from', from_id), ('to', to_id),
+                     ('dir', direction)]
+            if inv is not None:
+                attrs.append(('inv', inv))
+            output_file.write(u'  <lex_rel{0}/>\n'.format(_attrs(attrs)))
+        for (name, from_id, to_id, direction, inv) in con_rels:
+            attrs = [('name', name), ('from', from_id), ('to', to_id),
+                     ('dir', direction)]
+            if inv is not None:
+                attrs.append(('inv', inv))
+            output_file.write(u'  <con_rel{0}/>\n'.format(_attrs(attrs)))
+        output_file.write(u'</relations>\n')
+    stats['files']   += 1
+
+    # the interlingual index is generated last, so that it does not
+    # change the rest of the lexicon generated for a given seed
+    with open(os.path.join(output_path, u'interLingualIndex_DE-EN.xml'), 'w',
+              encoding='utf-8') as output_file:
+        output_file.write(u'<?xml version="1.0" encoding="UTF-8"?>\n'
+                          u'<interLingualIndex>\n')
+        for (lexunit_id, category, form) in ili_lexunits:
+            if ILI_SHARE <= rng.random():
+                continue
+            draw     = rng.random()
+            relation = [name for (cum_prob, name) in ILI_RELATIONS
+                        if draw < cum_prob][0]
+            offset   = rng.randrange(1, 10 * num_synsets)
+            pwn_word = form.lower()
+            output_file.write(u'  <iliRecord{0}>\n'.format(_attrs([
+                ('lexUnitId', lexunit_id), ('ewnRelation', relation),
+                ('pwnWord', pwn_word),
+                ('pwn20Id', u'ENG20-{0:08d}-{1}'.format(
+                    offset + 7, WORDNET_POS[category])),
+                ('pwn30Id', u'ENG30-{0:08d}-{1}'.format(
+                    offset, WORDNET_POS[category])),
+                ('pwn20paraphrase',
+                 _gloss(rng, words, category, 6)),
+                ('source', u'initial')])))
+            output_file.write(u'    <pwn20Synonyms>\n      <pwn20Synonym>'
+                              u'{0}</pwn20Synonym>\n    </pwn20Synonyms>\n'
+                              u'  </iliRecord>\n'.format(escape(pwn_word)))
+            stats['ili_records'] += 1
+        output_file.write(u'</interLingualIndex>\n')
+    stats['files']   += 1
+    stats['con_rels'] = len(con_rels)
+    stats['lex_rels'] = len(lex_rels)
+    return stats
+
+
+# ------------------------------------------------------------
+#  Main function
+# ------------------------------------------------------------
+
+def main():
+    '''Main function.'''
+    usage = ('\n\n  %prog [options] OUTPUT_PATH\n\nArguments:\n\n  '
+             'OUTPUT_PATH           the directory to write the synthetic '
+             'GermaNet .xml files to')
+
+    parser = optparse.OptionParser(usage=usage)
+    parser.add_option('--scale', type='float', default=1.,
+                      help='size of the lexicon as a multiple of GermaNet '
+                      '(default: %default)')
+    parser.add_option('--synsets', type='int', default=None,
+                      help='number of synsets to generate; overrides '
+                      '--scale')
+    parser.add_option('--branching', type='float', default=4.,
+                      help='mean number of hyponyms per synset '
+                      '(default: %default)')
+    parser.add_option('--multiple-inheritance', type='float', default=0.02,
+                      dest='multiple_inheritance',
+                      help='probability that a synset has a second '
+                      'hypernym (default: %default)')
+    parser.add_option('--depth', type='int', default=18,
+                      help='maximum depth of the hypernym hierarchy '
+                      '(default: %default)')
+    parser.add_option('--lexunits', type='float', default=1.4,
+                      help='mean number of lexical units per synset '
+                      '(default: %default)')
+    parser.add_option('--seed', type='int', default=0,
+                      help='random seed (default: %default)')
+    (options, args) = parser.parse_args()
+
+    if len(args) != 1:
+        parser.error("incorrect number of arguments")
+        sys.exit(1)
+    output_path = args[0]
+
+    num_synsets = options.synsets
+    if num_synsets is None:
+        num_synsets = int(DEFAULT_NUM_SYNSETS * options.scale)
+
+    stats = generate_germanet_xml(output_path,
+                                  num_synsets=num_synsets,
+                                  branching_factor=options.branching,
+                                  multiple_inheritance=
+                                  options.multiple_inheritance,
+                                  max_depth=options.depth,
+                                  lexunits_per_synset=options.lexunits,
+                                  seed=options.seed)
+    print(('Wrote {files} files: {synsets} synsets, {lexunits} lexical '
+           'units, {con_rels} synset relations, {lex_rels} lexical '
+           'relations, {paraphrases} wiktionary paraphrases, '
+           '{ili_records} interlingual index records.').format(
+               **stats))
+
+if __name__ == '__main__' and sys.argv != ['']:
+    main()
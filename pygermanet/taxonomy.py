@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''
+taxonomy.py
+(c) agent  18 October, 2026
+
+An in-memory index of the GermaNet hypernym hierarchy supporting
+constant-time subsumption tests and fast descendant enumeration.
+
+Every synset is numbered in the post-order of a spanning tree of the
+hierarchy.  A synset is labelled with a set of intervals of these
+numbers which covers exactly its descendants: the interval of its
+spanning subtree, merged with the intervals of all its hyponyms
+(Agrawal, Borgida and Jagadish, 1989).  In a tree, every label is a
+single interval; multiple inheritance adds a few more.
+'''
+
+from builtins import dict, range
+from collections import deque
+import bisect
+
+HYPERNYM_REL = 'has_hypernym'
+
+def _merge_intervals(intervals):
+    '''
+    Merges a list of (low, high) integer intervals into a sorted list
+    of disjoint, non-adjacent intervals.
+    '''
+    intervals.sort()
+    merged = []
+    for (low, high) in intervals:
+        if merged and low <= merged[-1][1] + 1:
+            if merged[-1][1] < high:
+                merged[-1] = (merged[-1][0], high)
+        else:
+            merged.append((low, high))
+    return merged
+
+class TaxonomyIndex(object):
+    '''
+    The hypernym hierarchy of GermaNet, with interval labels for
+    subsumption tests.
+    '''
+
+    def __init__(self, records):
+        '''
+        Builds the index.
+
+        Arguments:
+        - `records`: an iterable of (ObjectId, category, infocont,
+          hypernym ObjectIds) tuples, one per synset
+        '''
+        self.ids       = []
+        self.node      = dict()
+        self.category  = []
+        self.infocont  = []
+        hypernym_ids   = []
+        for (mongo_id, category, infocont, hypernyms) in records:
+            self.node[mongo_id] = len(self.ids)
+            self.ids.append(mongo_id)
+            self.category.append(category)
+            self.infocont.append(infocont)
+            hypernym_ids.append(hypernyms)
+        num_nodes     = len(self.ids)
+        self.parents  = [[self.node[mongo_id] for mongo_id in hypernyms
+                          if mongo_id in self.node]
+                         for hypernyms in hypernym_ids]
+        self.children = [[] for _idx in range(num_nodes)]
+        for (node, parents) in enumerate(self.parents):
+            for parent in parents:
+                self.children[parent].append(node)
+        self._label()
+
+    def _label(self):
+        '''Computes the post-order numbers and interval labels.'''
+        num_nodes = len(self.ids)
+        # spanning tree: each synset hangs off its first hypernym
+        tree_kids = [[] for _idx in range(num_nodes)]
+        roots     = []
+        for (node, parents) in enumerate(self.parents):
+            if parents:
+                tree_kids[parents[0]].append(node)
+            else:
+                roots.append(node)
+        self.post     = [-1] * num_nodes
+        self.by_post  = []
+        tree_low      = [0] * num_nodes
+        # iterative depth-first traversal, so that deep hierarchies do
+        # not hit the recursion limit
+        for root in roots:
+            stack = [(root, 0)]
+            while stack:
+                node, kid_idx = stack.pop()
+                if kid_idx == 0:
+                    tree_low[node] = len(self.by_post)
+                if kid_idx < len(tree_kids[node]):
+                    stack.append((node, kid_idx + 1))
+                    stack.append((tree_kids[node][kid_idx], 0))
+                else:
+                    self.post[node] = len(self.by_post)
+                    self.by_post.append(node)
+        # synsets on a hypernym cycle are not reachable from a root;
+        # give them their own numbers so that lookups do not fail
+        for node in range(num_nodes):
+            if self.post[node] < 0:
+                tree_low[node]  = len(self.by_post)
+                self.post[node] = len(self.by_post)
+                self.by_post.append(node)
+        # merge the labels of hyponyms into their hypernyms
+        labels = [[(tree_low[node], self.post[node])]
+                  for node in range(num_nodes)]
+        for node in self.bottom_up():
+            labels[node] = _merge_intervals(labels[node])
+            for parent in self.parents[node]:
+                labels[parent].extend(labels[node])
+        # flatten each label into a sorted list of bounds
+        self.labels = [[bound for interval in _merge_intervals(label)
+                        for bound in interval] for label in labels]
+
+    def bottom_up(self):
+        '''
+        A generator over all node numbers, yielding every node after
+        all of its hyponyms.  Nodes on a hypernym cycle are not
+        yielded.
+        '''
+        remaining = [len(kids) for kids in self.children]
+        queue     = deque(node for node in range(len(self.ids))
+                          if not remaining[node])
+        while queue:
+            node = queue.popleft()
+            yield node
+            for parent in self.parents[node]:
+                remaining[parent] -= 1
+                if not remaining[parent]:
+                    queue.append(parent)
+
+    def hypernym_distances(self, node):
+        '''
+        Returns a dictionary mapping the node and each of its
+        (transitive) hypernyms to the length of the shortest hypernym
+        path leading to it from the node.
+
+        Arguments:
+        - `node`: a node number
+        '''
+        distances = {node: 0}
+        frontier  = [node]
+        while frontier:
+            next_frontier = []
+            for current in frontier:
+                for parent in self.parents[current]:
+                    if parent not in distances:
+                        distances[parent] = distances[current] + 1
+                        next_frontier.append(parent)
+            frontier = next_frontier
+        return distances
+
+    def is_a(self, node, ancestor):
+        '''
+        Returns True if ``ancestor`` is ``node`` or one of its
+        (transitive) hypernyms.
+
+        Arguments:
+        - `node`: a node number
+        - `ancestor`: a node number
+        '''
+        bounds = self.labels[ancestor]
+        # post[node] lies inside an interval iff bisection lands just
+        # after a low bound, or exactly on a high bound
+        idx = bisect.bisect_right(bounds, self.post[node])
+        return idx % 2 == 1 or (0 < idx and bounds[idx - 1] == self.post[node])
+
+    def descendants(self, node, max_depth=None):
+        '''
+        Returns a list of the node numbers of the (transitive)
+        hyponyms of the given node, not including the node itself.
+
+        Arguments:
+        - `node`: a node number
+        - `max_depth`: if given, only return hyponyms at most this many
+          hyponym links away
+        '''
+        if max_depth is not None:
+            seen     = set([node])
+            results  = []
+            frontier = [node]
+            for _depth in range(max_depth):
+                next_frontier = []
+                for current in frontier:
+                    for child in self.children[current]:
+                        if child not in seen:
+                            seen.add(child)
+                            next_frontier.append(child)
+                results.extend(next_frontier)
+                frontier = next_frontier
+                if not frontier:
+                    break
+            return results
+        bounds = self.labels[node]
+        return [self.by_post[post]
+                for idx in range(0, len(bounds), 2)
+                for post in range(bounds[idx], bounds[idx + 1] + 1)
+                if self.by_post[post] != node]
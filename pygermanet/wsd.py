@@ -0,0 +1,239 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''
+wsd.py
+(c) agent  18 October, 2026
+
+Simplified Lesk word sense disambiguation over whole documents.
+
+Every synset gets a bag-of-words signature built from its paraphrase,
+the wiktionary paraphrases, examples and orthographic forms of its
+lemmas, and (optionally) the same material of the synsets it is
+directly related to.  The signatures are precomputed once as a sparse
+synset-by-term matrix; a document is then disambiguated by scoring
+all of its (token, candidate sense) pairs against their contexts with
+a single sparse matrix product.
+
+Documents need not be lemmatised: the tokens are looked up both as
+they are and through their base forms from the lemmatiser collection,
+so that inflected forms such as 'bellt' find their senses.
+
+NumPy and SciPy are optional dependencies of pygermanet; they are
+needed by this module.
+'''
+
+from __future__ import absolute_import
+from .germanet import ID_QUERY_BATCH_SIZE, SHORT_POS_TO_LONG
+from .glosses import lexunit_gloss_texts, tokenise
+from array import array
+from builtins import dict, range, zip
+try:
+    import numpy
+    import scipy.sparse
+except ImportError:
+    pass
+
+class LeskDisambiguator(object):
+    '''
+    Chooses the sense of each word in a document whose signature
+    overlaps most with the words around it.
+
+    >>> lesk = LeskDisambiguator(gn)
+    >>> lesk.disambiguate([u'Der', u'Hund', u'bellt', u'den', u'Briefträger',
+    ...                    u'an'])
+    [None, Synset(Hund.n.1), Synset(bellen.v.1), None,
+     Synset(Briefträger.n.1), None]
+    '''
+
+    def __init__(self, gnet, related=True):
+        '''
+        Reads the synsets and lexunits collections once and builds
+        the signature matrix and the word index.
+
+        Arguments:
+        - `gnet`: a GermaNet object
+        - `related`: if True, add the words of directly related
+          synsets to each signature
+        '''
+        self._germanet = gnet
+        rows           = dict()
+        object_ids     = []
+        categories     = []
+        infocont       = array('d')
+        terms          = []
+        rels           = []
+        for synset_dict in gnet._find('synsets', {},
+                                      {'category': 1, 'infocont': 1,
+                                       'paraphrase': 1, 'rels': 1}):
+            rows[synset_dict['_id']] = len(object_ids)
+            object_ids.append(synset_dict['_id'])
+            categories.append(synset_dict.get('category'))
+            infocont.append(synset_dict.get('infocont', 0.))
+            terms.append(set(tokenise(synset_dict.get('paraphrase', u''))))
+            rels.append([mongo_id for (_name, mongo_id) in
+                         synset_dict.get('rels', [])])
+        # words map lower case orthographic forms to synset rows
+        words = dict()
+        for lemma_dict in gnet._find('lexunits', {},
+                                     {'synset': 1, 'orthForms': 1,
+                                      'paraphrases.wiktionarySense': 1,
+                                      'examples.text': 1}):
+            row = rows.get(lemma_dict.get('synset'))
+            if row is None:
+                continue
+            for form in lemma_dict.get('orthForms', []):
+                terms[row].update(tokenise(form))
+                form_rows = words.setdefault(form.lower(), [])
+                if row not in form_rows:
+                    form_rows.append(row)
+            for text in lexunit_gloss_texts(lemma_dict):
+                terms[row].update(tokenise(text))
+        self.vocabulary  = dict()
+        sig_rows         = array('l')
+        sig_cols         = array('l')
+        for row in range(len(object_ids)):
+            signature = set(terms[row])
+            if related:
+                for mongo_id in rels[row]:
+                    if mongo_id in rows:
+                        signature.update(terms[rows[mongo_id]])
+            for term in signature:
+                col = self.vocabulary.setdefault(term, len(self.vocabulary))
+                sig_rows.append(row)
+                sig_cols.append(col)
+        try:
+            self.signatures = scipy.sparse.csr_matrix(
+                (numpy.ones(len(sig_rows), dtype=numpy.float64),
+                 (numpy.frombuffer(sig_rows,
+                                   dtype=numpy.dtype(sig_rows.typecode)),
+                  numpy.frombuffer(sig_cols,
+                                   dtype=numpy.dtype(sig_cols.typecode)))),
+                shape=(len(object_ids), len(self.vocabulary)))
+        except NameError:
+            raise ImportError('LeskDisambiguator requires numpy and scipy')
+        self.words       = words
+        self.object_ids  = object_ids
+        self.categories  = categories
+        self.infocont    = numpy.frombuffer(infocont, dtype=numpy.float64)
+
+    def _forms(self, tokens):
+        '''
+        Looks up the base forms of the distinct tokens of a document,
+        with batched queries on the lemmatiser collection.  Returns a
+        dictionary mapping each token to a list of lower case forms:
+        the token itself, followed by its base forms.
+        '''
+        distinct = sorted(set(tokens))
+        forms    = dict((token, [token.lower()]) for token in distinct)
+        for start in range(0, len(distinct), ID_QUERY_BATCH_SIZE):
+            query = {'word': {'$in': distinct[start:start +
+                                              ID_QUERY_BATCH_SIZE]}}
+            for lemma_dict in self._germanet._find('lemmatiser', query,
+                                                   {'word': 1, 'lemma': 1}):
+                token_forms = forms[lemma_dict['word']]
+                base_form   = lemma_dict['lemma'].lower()
+                if base_form not in token_forms:
+                    token_forms.append(base_form)
+        return forms
+
+    def _context_matrix(self, tokens, forms):
+        '''
+        Returns a binary sparse matrix with one row per token, marking
+        the vocabulary terms of that token and its base forms.
+        '''
+        rows = []
+        cols = []
+        for (idx, token) in enumerate(tokens):
+            for form in forms[token]:
+                for term in tokenise(form):
+                    if term in self.vocabulary:
+                        rows.append(idx)
+                        cols.append(self.vocabulary[term])
+        matrix = scipy.sparse.csr_matrix(
+            (numpy.ones(len(rows)), (rows, cols)),
+            shape=(len(tokens), len(self.vocabulary)))
+        matrix.data[:] = 1.
+        return matrix
+
+    def scores(self, tokens, pos=None, window=None):
+        '''
+        Scores every candidate sense of every token.  Returns a list
+        with one entry per token, each a list of (Synset, score)
+        tuples ordered best first; the score is the number of
+        distinct context words found in the sense's signature.
+
+        Arguments:
+        - `tokens`: a list of words, in document order; inflected
+          forms are looked up through their base forms
+        - `pos`: None, or a list aligned with ``tokens`` giving the
+          part of speech ('n', 'v' or 'j') of each token, or None
+          where it is unknown
+        - `window`: the number of tokens on each side of a token
+          which make up its context; defaults to the whole document
+        '''
+        forms       = self._forms(tokens)
+        pair_tokens = []
+        pair_rows   = []
+        for (idx, token) in enumerate(tokens):
+            category = None
+            if pos is not None and pos[idx] is not None:
+                category = SHORT_POS_TO_LONG.get(pos[idx], pos[idx])
+            token_rows = []
+            for form in forms[token]:
+                for row in self.words.get(form, []):
+                    if row not in token_rows and (
+                            category is None or
+                            self.categories[row] == category):
+                        token_rows.append(row)
+            pair_tokens.extend([idx] * len(token_rows))
+            pair_rows.extend(token_rows)
+        results = [[] for _token in tokens]
+        if not pair_rows:
+            return results
+        context     = self._context_matrix(tokens, forms)
+        candidates  = self.signatures[pair_rows]
+        if window is None:
+            document     = context.max(axis=0)
+            pair_scores  = numpy.asarray(candidates.dot(document.T).todense())
+        else:
+            num_tokens   = len(tokens)
+            band         = scipy.sparse.diags(
+                [numpy.ones(num_tokens - abs(offset)) for offset in
+                 range(-window, window + 1) if abs(offset) < num_tokens],
+                [offset for offset in range(-window, window + 1)
+                 if abs(offset) < num_tokens],
+                shape=(num_tokens, num_tokens), format='csr')
+            windows      = band.dot(context).tocsr()
+            windows.data[:] = 1.
+            pair_scores  = numpy.asarray(
+                candidates.multiply(windows[pair_tokens]).sum(axis=1))
+        pair_scores = pair_scores.ravel()
+        synsets     = dict(
+            (synset._id, synset) for synset in self._germanet._synsets_by_ids(
+                [self.object_ids[row] for row in sorted(set(pair_rows))]))
+        for (idx, row, score) in zip(pair_tokens, pair_rows, pair_scores):
+            results[idx].append((row, float(score)))
+        # ties go to the more frequent (more probable) sense
+        return [[(synsets[self.object_ids[row]], score) for (row, score) in
+                 sorted(candidates_scores, key=lambda pair: (
+                     -pair[1], -self.infocont[pair[0]],
+                     str(self.object_ids[pair[0]])))]
+                for candidates_scores in results]
+
+    def disambiguate(self, tokens, pos=None, window=None):
+        '''
+        Returns a list with the best sense of each token, or None for
+        tokens which are not in GermaNet.
+
+        Arguments:
+        - `tokens`: a list of words, in document order; inflected
+          forms are looked up through their base forms
+        - `pos`: None, or a list aligned with ``tokens`` giving the
+          part of speech ('n', 'v' or 'j') of each token, or None
+          where it is unknown
+        - `window`: the number of tokens on each side of a token
+          which make up its context; defaults to the whole document
+        '''
+        return [token_scores[0][0] if token_scores else None
+                for token_scores in self.scores(tokens, pos, window)]
@@ -89,10 +89,12 @@ STTS_GERMANET_MAPPING = {'$('      : ' ',
 
 client = pymongo.MongoClient()
 germanet = client.germanet
-gn_words = set(x['orthForm'] for x in germanet.lexunits.find())
-
+gn_words = set()
 gn_rewrites = {}
-for x in germanet.lexunits.find():
+# a single pass over the orthographic fields of all lexunits
+for x in germanet.lexunits.find({}, {'orthForm': 1, 'orthVar': 1,
+                                     'oldOrthForm': 1, 'oldOrthVar': 1}):
+    gn_words.add(x['orthForm'])
     if 'orthVar' in x:
         gn_rewrites[x['orthVar']] = x['orthForm']
     if 'oldOrthForm' in x:
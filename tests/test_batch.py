@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+'''
+test_batch.py
+
+Tests for the batch tool and the similarity memo shared by its
+worker processes.
+
+The run_batch tests need a MongoDB instance on localhost holding an
+imported GermaNet database, and are skipped otherwise.
+'''
+
+from __future__ import absolute_import
+from pygermanet import germanet
+from pygermanet.batch import format_result, parse_record, run_batch
+from pygermanet.simcache import SimilarityMemo
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+def fill_memo(args):
+    '''
+    Reads and writes a shared memo file from a separate process.
+    Returns the number of scores found in the memo.
+    '''
+    path, worker, num_pairs = args
+    # a short lock timeout: no process may hold the write lock for long
+    memo = SimilarityMemo(path, timeout=1)
+    hits = 0
+    for idx in range(num_pairs):
+        # half of the pairs are shared with the other workers
+        synset1 = 's{0}'.format(idx)
+        synset2 = 's{0}'.format(idx + 1 if idx % 2 else worker * num_pairs +
+                                idx + 100000)
+        if memo.get(synset1, synset2, 'lin', 'v1') is None:
+            # stands in for computing the score
+            time.sleep(0.001)
+            memo.put(synset1, synset2, 'lin', 'v1', float(idx))
+        else:
+            hits += 1
+    memo.close()
+    return hits
+
+def germanet_available():
+    '''Returns True if a GermaNet database can be reached.'''
+    try:
+        from pymongo import MongoClient
+        client = MongoClient(serverSelectionTimeoutMS=1000)
+        return client['germanet']['metainfo'].find_one() is not None
+    except Exception:
+        return False
+
+class SimilarityMemoTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path   = os.path.join(self.tmpdir, 'memo.sqlite')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_get_put(self):
+        memo = SimilarityMemo(self.path)
+        self.assertEqual(memo.get('s1', 's2', 'lin', 'v1'), None)
+        memo.put('s2', 's1', 'lin', 'v1', 0.5)
+        self.assertEqual(memo.get('s1', 's2', 'lin', 'v1'), 0.5)
+        self.assertEqual(memo.get('s1', 's2', 'lin', 'v2'), None)
+        memo.close()
+        memo = SimilarityMemo(self.path)
+        self.assertEqual(memo.get('s2', 's1', 'lin', 'v1'), 0.5)
+        self.assertEqual(len(memo), 1)
+        memo.close()
+
+    def test_eviction(self):
+        memo = SimilarityMemo(self.path, max_entries=10)
+        for idx in range(25):
+            memo.put('s0', 's{0}'.format(idx + 1), 'lin', 'v1', float(idx))
+        memo.flush()
+        self.assertTrue(len(memo) <= 10)
+        # scores which have just been used are evicted last
+        memo.get('s0', 's25', 'lin', 'v1')
+        memo.put('s0', 's26', 'lin', 'v1', 25.)
+        memo.flush()
+        self.assertEqual(memo.get('s0', 's25', 'lin', 'v1'), 24.)
+        memo.close()
+
+    def test_concurrent_workers(self):
+        SimilarityMemo(self.path).close()
+        pool = multiprocessing.Pool(3)
+        try:
+            pool.map(fill_memo, [(self.path, worker, 2000)
+                                 for worker in range(3)])
+            pool.close()
+        finally:
+            pool.terminate()
+        memo = SimilarityMemo(self.path)
+        self.assertEqual(len(memo), 3 * 1000 + 1000)
+        self.assertEqual(memo.get('s1', 's2', 'lin', 'v1'), 1.)
+        memo.close()
+
+class ParseRecordTest(unittest.TestCase):
+
+    def test_valid(self):
+        self.assertEqual(parse_record(u'Hund\tKatze\n', 'tsv'),
+                         {'word': u'Hund', 'word2': u'Katze'})
+        self.assertEqual(parse_record(u'{"word": "Hund", "pos": "n"}',
+                                      'jsonl'),
+                         {'word': u'Hund', 'pos': u'n'})
+        self.assertEqual(parse_record(u'  \n', 'tsv'), None)
+
+    def test_invalid(self):
+        for line in [u'{"word": "Hund", "pos": "x"}', u'{"pos": "n"}',
+                     u'{"word": 5}', u'["Hund"]', u'{"word": ']:
+            record = parse_record(line, 'jsonl')
+            self.assertTrue('error' in record)
+            for output_format in ['tsv', 'jsonl']:
+                format_result(record, None, output_format)
+
+class RunBatchTest(unittest.TestCase):
+
+    def setUp(self):
+        if not germanet_available():
+            self.skipTest('no GermaNet database on localhost')
+        self.tmpdir = tempfile.mkdtemp()
+        self.path   = os.path.join(self.tmpdir, 'memo.sqlite')
+        gnet        = germanet.load_germanet()
+        words       = sorted(set(
+            lemma_dict['orthForm'] for lemma_dict in
+            gnet._find('lexunits', {'category': 'nomen'}, {'orthForm': 1},
+                       limit=40)))
+        self.records = [{'word': word1, 'word2': word2}
+                        for word1 in words for word2 in words]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def results(self, **kwargs):
+        return [result for (_record, result) in
+                run_batch('lin', self.records, chunk_size=20, **kwargs)]
+
+    def test_memo_with_several_processes(self):
+        expected = self.results(processes=1)
+        # the first run fills the memo, the second one reads from it
+        for _run in range(2):
+            self.assertEqual(self.results(processes=3, memo_path=self.path),
+                             expected)
+        memo = SimilarityMemo(self.path)
+        self.assertTrue(0 < len(memo))
+        memo.close()
+
+    def test_invalid_records(self):
+        records = [parse_record(line, 'jsonl') for line in
+                   [u'{"word": "Hund", "pos": "x"}', u'{"pos": "n"}',
+                    u'["Hund"]']] + self.records[:5]
+        for operation in ['synsets', 'lin']:
+            results = [result for (_record, result) in
+                       run_batch(operation, records, processes=2)]
+            self.assertEqual(results[:3], [None, None, None])
+            self.assertEqual(len(results), len(records))
+
+if __name__ == '__main__':
+    unittest.main()